@@ -76,6 +76,7 @@ MODERNRPC_METHODS_MODULES = [
     'mathesar.rpc.databases.privileges',
     'mathesar.rpc.databases.setup',
     'mathesar.rpc.explorations',
+    'mathesar.rpc.jobs',
     'mathesar.rpc.records',
     'mathesar.rpc.roles',
     'mathesar.rpc.roles.configured',
@@ -85,6 +86,8 @@ MODERNRPC_METHODS_MODULES = [
     'mathesar.rpc.tables',
     'mathesar.rpc.tables.metadata',
     'mathesar.rpc.tables.privileges',
+    'mathesar.rpc.tables.search_indexes',
+    'mathesar.rpc.tables.summary_cache',
     'mathesar.rpc.types',
 ]
 
@@ -264,6 +267,32 @@ MATHESAR_UI_SOURCE_LOCATION = os.path.join(BASE_DIR, 'mathesar_ui/')
 MATHESAR_CAPTURE_UNHANDLED_EXCEPTION = decouple_config('CAPTURE_UNHANDLED_EXCEPTION', default=False)
 MATHESAR_STATIC_NON_CODE_FILES_LOCATION = os.path.join(BASE_DIR, 'mathesar/static/non-code/')
 
+# Bounds for the per-(database, role) pools of connections to user databases.
+# MAX_IDLE and TIMEOUT are in seconds.
+MATHESAR_CONNECTION_POOL = {
+    'MIN_SIZE': decouple_config('CONNECTION_POOL_MIN_SIZE', default=1, cast=int),
+    'MAX_SIZE': decouple_config('CONNECTION_POOL_MAX_SIZE', default=5, cast=int),
+    'MAX_IDLE': decouple_config('CONNECTION_POOL_MAX_IDLE', default=300, cast=float),
+    'TIMEOUT': decouple_config('CONNECTION_POOL_TIMEOUT', default=30, cast=float),
+}
+# Seconds for which resolved user database credentials are cached in-process.
+# Changes made by the same process clear its cache, but other processes may
+# keep using the old credentials (e.g., of a revoked role mapping) until then.
+MATHESAR_CREDENTIAL_CACHE_TTL = decouple_config('CREDENTIAL_CACHE_TTL', default=60, cast=float)
+# Seconds for which schema and table listings are cached in-process (they're
+# only used while the user database's catalog is unchanged).
+MATHESAR_CATALOG_CACHE_TTL = decouple_config('CATALOG_CACHE_TTL', default=30, cast=float)
+# Number of threads (per process) running background jobs, e.g. imports.
+MATHESAR_JOB_WORKERS = decouple_config('JOB_WORKERS', default=2, cast=int)
+# Milliseconds after which the queries of `records.list` and `records.search`
+# are cancelled, and for which they may leave a transaction idle (0 disables).
+MATHESAR_RECORDS_STATEMENT_TIMEOUT = decouple_config(
+    'RECORDS_STATEMENT_TIMEOUT', default=30000, cast=int
+)
+MATHESAR_RECORDS_IDLE_IN_TRANSACTION_TIMEOUT = decouple_config(
+    'RECORDS_IDLE_IN_TRANSACTION_TIMEOUT', default=60000, cast=int
+)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 # UI source files have to be served by Django in order for static assets to be included during dev mode
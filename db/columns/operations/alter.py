@@ -1,4 +1,7 @@
 import json
+import logging
+import time
+
 from psycopg.errors import (
     InvalidTextRepresentation, InvalidParameterValue, RaiseException,
     SyntaxError
@@ -7,6 +10,8 @@ from db import connection as db_conn
 from db.columns.defaults import NAME, NULLABLE, DESCRIPTION
 from db.columns.exceptions import InvalidDefaultError, InvalidTypeError, InvalidTypeOptionError
 
+logger = logging.getLogger(__name__)
+
 
 def alter_column(engine, table_oid, column_attnum, column_data, connection=None):
     """
@@ -186,6 +191,10 @@ def alter_columns_in_table(table_oid, column_data_list, conn):
 
     For a description of column_data_list, see _transform_column_alter_dict
 
+    All type changes are made by a single `ALTER TABLE`, so the table is
+    rewritten at most once. The time taken is logged whenever some column
+    changes type.
+
     Args:
         table_oid: The OID of the table whose columns we'll alter.
         column_data_list: a list of dicts describing the alterations to make.
@@ -193,9 +202,16 @@ def alter_columns_in_table(table_oid, column_data_list, conn):
     transformed_column_data = [
         _transform_column_alter_dict(column) for column in column_data_list
     ]
+    retyped_count = sum(1 for column in transformed_column_data if 'type' in column)
+    start = time.perf_counter()
     db_conn.exec_msar_func(
         conn, 'alter_columns', table_oid, json.dumps(transformed_column_data)
     )
+    if retyped_count:
+        logger.info(
+            f"Altered the type of {retyped_count} column(s) of table {table_oid}"
+            f" with one table rewrite in {time.perf_counter() - start:.3f}s"
+        )
     return len(column_data_list)
 
 
@@ -1,10 +1,18 @@
+from collections import OrderedDict
 import copy
+from threading import Lock
 
 from sqlalchemy import create_engine as sa_create_engine
 from sqlalchemy.engine import URL
 
 from db.types.custom.base import CUSTOM_DB_TYPE_TO_SA_CLASS
 
+# The max number of engines kept by get_cached_engine_with_custom_types.
+ENGINE_REGISTRY_MAX_SIZE = 32
+
+_engine_registry = OrderedDict()
+_engine_registry_lock = Lock()
+
 
 def create_future_engine_with_custom_types(
         username, password, hostname, database, port, *args, **kwargs
@@ -18,6 +26,44 @@ def create_future_engine_with_custom_types(
     return engine
 
 
+def get_cached_engine_with_custom_types(
+        username, password, hostname, database, port
+):
+    """
+    Get an engine with custom types from the registry, creating it if needed.
+
+    Engines are keyed on their connection parameters, so repeated calls
+    reuse the same engine (and its connection pool). When the registry
+    is full, the least recently used engine is evicted and disposed.
+    """
+    key = (username, password, hostname, database, port)
+    evicted_engines = []
+    with _engine_registry_lock:
+        engine = _engine_registry.get(key)
+        if engine is not None:
+            _engine_registry.move_to_end(key)
+            return engine
+        engine = create_future_engine_with_custom_types(
+            username, password, hostname, database, port
+        )
+        _engine_registry[key] = engine
+        while len(_engine_registry) > ENGINE_REGISTRY_MAX_SIZE:
+            _, evicted_engine = _engine_registry.popitem(last=False)
+            evicted_engines.append(evicted_engine)
+    for evicted_engine in evicted_engines:
+        evicted_engine.dispose()
+    return engine
+
+
+def dispose_cached_engines():
+    """Dispose of all engines in the registry, and empty it."""
+    with _engine_registry_lock:
+        engines = list(_engine_registry.values())
+        _engine_registry.clear()
+    for engine in engines:
+        engine.dispose()
+
+
 # TODO would an engine without ischema names updated ever be used? make it private if not
 def create_future_engine(
         username, password, hostname, database, port, *args, **kwargs
@@ -0,0 +1,141 @@
+"""
+Helpers for reading big JSON files without loading them into memory.
+"""
+import codecs
+import json
+
+JSON_READ_SIZE = 2 ** 16
+# A syntax error this close to the end of the text read so far may just
+# mean that a token (e.g., `true`) is cut in two, so we read more text
+# before giving up.
+_MAX_CUT_TOKEN_LENGTH = 32
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+def iter_json_items(json_file, read_size=JSON_READ_SIZE):
+    """
+    Iterate over the items of the JSON array in a file, one at a time.
+
+    Only one item (plus one chunk of the file) is held in memory at once.
+    If the file holds some other JSON value (e.g., a single object), that
+    value is the only item.
+
+    Args:
+        json_file: A file object, opened in text or binary mode. Binary
+            files are decoded as UTF-8.
+        read_size: The number of bytes (or characters) to read at once.
+
+    Raises:
+        json.JSONDecodeError: If the file isn't valid JSON.
+    """
+    stream = _JSONTextStream(json_file, read_size)
+    if stream.peek() != '[':
+        yield stream.decode_value()
+    else:
+        stream.pos += 1
+        if stream.peek() == ']':
+            stream.pos += 1
+        else:
+            while True:
+                yield stream.decode_value()
+                char = stream.peek()
+                if char not in (',', ']'):
+                    raise json.JSONDecodeError(
+                        "Expecting ',' delimiter", stream.text, stream.pos
+                    )
+                stream.pos += 1
+                if char == ']':
+                    break
+    if stream.peek() != '':
+        raise json.JSONDecodeError('Extra data', stream.text, stream.pos)
+
+
+def flatten_json_object(json_object, max_level, prefix=''):
+    """
+    Flatten nested objects into a single object with dotted keys.
+
+    This works like `pandas.json_normalize`: `{"a": {"b": 1}}` becomes
+    `{"a.b": 1}`. Objects nested more than `max_level` levels deep are
+    kept as they are.
+    """
+    flattened = {}
+    for key, value in json_object.items():
+        flattened_key = f"{prefix}{key}"
+        if isinstance(value, dict) and max_level > 0:
+            flattened |= flatten_json_object(
+                value, max_level - 1, f"{flattened_key}."
+            )
+        else:
+            flattened[flattened_key] = value
+    return flattened
+
+
+def _iter_text_chunks(json_file, read_size):
+    decoder = None
+    while True:
+        chunk = json_file.read(read_size)
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            text = decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        if text:
+            yield text
+        if not chunk:
+            return
+
+
+class _JSONTextStream:
+    """
+    The text of a JSON file, read chunk by chunk as it's consumed.
+    """
+
+    def __init__(self, json_file, read_size):
+        self._chunks = _iter_text_chunks(json_file, read_size)
+        self.text = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def read_more(self):
+        """Read another chunk, dropping the text consumed so far."""
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            return False
+        self.text += chunk
+        return True
+
+    def peek(self):
+        """Skip whitespace, and return the next character ('' at the end)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.read_more():
+                return ''
+
+    def decode_value(self):
+        """Decode the JSON value starting at the next non-whitespace character."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                is_cut = (
+                    len(self.text) - e.pos <= _MAX_CUT_TOKEN_LENGTH
+                    or e.msg.startswith('Unterminated string')
+                )
+                if not is_cut or not self.read_more():
+                    raise
+                continue
+            # A number at the very end of the text may continue in the
+            # next chunk.
+            if end < len(self.text) or self.exhausted:
+                self.pos = end
+                return value
+            self.read_more()
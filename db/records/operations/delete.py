@@ -23,6 +23,27 @@ def delete_records_from_table(conn, record_ids, table_oid):
     ).fetchone()[0]
 
 
+def delete_records_where(conn, filter, table_oid, dry_run=False):
+    """
+    Delete all records of a table matching a filter.
+
+    Args:
+        filter: A filter definition object, as for listing records.
+        table_oid: The OID of the table whose records we'll delete.
+        dry_run: If True, only count the records which would be deleted.
+
+    Returns:
+        The number of records deleted (or which would be deleted).
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'delete_records_where',
+        table_oid,
+        json.dumps(filter),
+        dry_run,
+    ).fetchone()[0]
+
+
 def delete_record(table, engine, id_value):
     primary_key_column = get_primary_key_column(table)
     query = delete(table).where(primary_key_column == id_value)
@@ -0,0 +1,52 @@
+import json
+
+from db import connection as db_conn
+
+EXPORT_CHUNK_SIZE = 2 ** 16
+
+
+def stream_records_from_table(
+        conn,
+        table_oid,
+        format='csv',
+        order=None,
+        filter=None,
+        chunk_size=EXPORT_CHUNK_SIZE,
+):
+    """
+    Stream all records of a table, using `COPY ... TO STDOUT`.
+
+    Rows are sent along as the database produces them, so memory usage
+    doesn't depend on the size of the table. The connection must stay
+    open until the returned generator is exhausted (or closed).
+
+    Only data from which the user is granted `SELECT` is exported.
+
+    Args:
+        table_oid: The OID of the table whose records we'll export.
+        format: Either 'csv' or 'jsonl'.
+        order: An array of ordering definition objects.
+        filter: An array of filter definition objects.
+        chunk_size: The (approximate) number of bytes to yield at once.
+
+    Yields:
+        Chunks of the exported data, as bytes.
+    """
+    copy_expr = db_conn.exec_msar_func(
+        conn,
+        'build_export_copy_expr',
+        table_oid,
+        json.dumps(order) if order is not None else None,
+        json.dumps(filter) if filter is not None else None,
+        format,
+    ).fetchone()[0]
+    buffer = bytearray()
+    with conn.cursor() as cursor:
+        with cursor.copy(copy_expr) as copy:
+            for data in copy:
+                buffer += data
+                if len(buffer) >= chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+    if buffer:
+        yield bytes(buffer)
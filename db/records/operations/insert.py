@@ -1,5 +1,6 @@
+import io
+import itertools
 import json
-import pandas
 import tempfile
 
 from psycopg2 import sql
@@ -10,10 +11,15 @@ from db.columns.exceptions import NotNullError, ForeignKeyError, TypeMismatchErr
 from db.columns.base import MathesarColumn
 from db.constants import ID, ID_ORIGINAL
 from db.encoding_utils import get_sql_compatible_encoding
+from db.json_utils import flatten_json_object, iter_json_items
 from db.records.operations.select import get_record
 from sqlalchemy import select
 
 READ_SIZE = 20000
+JSON_IMPORT_BATCH_SIZE = 10000
+_COPY_TEXT_ESCAPES = str.maketrans({
+    '\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t'
+})
 
 
 def add_record_to_table(conn, record_def, table_oid, return_record_summaries=False):
@@ -28,6 +34,37 @@ def add_record_to_table(conn, record_def, table_oid, return_record_summaries=Fal
     return result
 
 
+def add_records_to_table(
+        conn,
+        record_defs,
+        table_oid,
+        on_conflict='error',
+        return_record_summaries=False
+):
+    """
+    Add a number of records to a table, with one statement per batch.
+
+    Args:
+        record_defs: A list of record definitions, as for
+                     `add_record_to_table`.
+        table_oid: The OID of the table where we'll add the records.
+        on_conflict: What to do with records whose primary key is
+                     already in the table. One of 'error', 'ignore', or
+                     'update'.
+        return_record_summaries: Whether to return summaries of the
+                                 added records.
+    """
+    result = db_conn.exec_msar_func(
+        conn,
+        'add_records_to_table',
+        table_oid,
+        json.dumps(record_defs),
+        on_conflict,
+        return_record_summaries
+    ).fetchone()[0]
+    return result
+
+
 def insert_record_or_records(table, engine, record_data):
     """
     record_data can be a dictionary, tuple, or list of dictionaries or tuples.
@@ -59,59 +96,84 @@ def get_records_from_dataframe(df):
     return json.loads(df.to_json(orient='records'))
 
 
-def insert_records_from_json(table, engine, json_filepath, column_names, max_level):
+def insert_records_from_json(
+        table,
+        engine,
+        json_filepath,
+        column_names,
+        max_level,
+        batch_size=JSON_IMPORT_BATCH_SIZE,
+):
     """
-    Normalizes JSON data and inserts it into a table.
+    Stream the objects of a JSON file into a table, using `COPY`.
+
+    The file is read one object at a time (see `iter_json_items`), so
+    memory usage doesn't depend on the size of the file. Each object is
+    flattened up to `max_level` levels deep, and the rows are sent to the
+    database in batches of `batch_size`, each with its own `COPY`, all in
+    a single transaction.
 
     Args:
         table: Table. The table to insert JSON data into.
         engine: MockConnection. The SQLAlchemy engine.
         json_filepath: str. The path to the stored JSON data file.
-        column_names: List[str]. List of column names.
+        column_names: List[str]. List of column names. Keys missing from
+            an object get a NULL value.
         max_level: int. The depth upto which JSON dict should be flattened.
+        batch_size: int. The max number of rows sent with each `COPY`.
 
-    Algorithm:
-        1.  We convert JSON data into Python object using json.load().
-        2.  We normalize data into a pandas dataframe using pandas.json_normalize() method.
-            The method takes column names as meta. We provide all possible keys as column
-            names, hence it adds missing keys to JSON objects and marks their values as NaN.
-        3.  We get records from the dataframe using the method get_records_from_dataframe().
-        4.  The processed data is now a list of dict objects. Each dict has same keys, that are
-            the column names of the table. We loop through each dict object, and if any value is
-            a dict or a list, we stringify them before inserting them into the table. This way,
-            our type inference logic kicks in later on converting them into
-            'MathesarCustomType.MATHESAR_JSON_OBJECT' and 'MathesarCustomType.MATHESAR_JSON_ARRAY'
-            respectively.
-        5.  We pass data (a list of dicts) to 'insert_record_or_records()' method which inserts
-            them into the table.
+    Values which are objects or arrays are stringified, so that our type
+    inference logic later on converts them to
+    'MathesarCustomType.MATHESAR_JSON_OBJECT' and
+    'MathesarCustomType.MATHESAR_JSON_ARRAY' respectively.
     """
+    if not column_names:
+        return
+    relation = sql.SQL(".").join(
+        sql.Identifier(part) for part in (table.schema, table.name)
+    )
+    formatted_columns = sql.SQL(",").join(
+        sql.Identifier(column_name) for column_name in column_names
+    )
+    copy_sql = sql.SQL("COPY {relation} ({formatted_columns}) FROM STDIN").format(
+        relation=relation, formatted_columns=formatted_columns,
+    )
+    with open(json_filepath, 'rb') as json_file:
+        rows = (
+            _get_json_copy_row(obj, column_names, max_level)
+            for obj in iter_json_items(json_file)
+        )
+        with engine.begin() as conn:
+            cursor = conn.connection.cursor()
+            while True:
+                batch = io.StringIO()
+                batch.writelines(itertools.islice(rows, batch_size))
+                if batch.tell() == 0:
+                    break
+                batch.seek(0)
+                cursor.copy_expert(copy_sql, batch)
 
-    with open(json_filepath, 'r') as json_file:
-        data = json.load(json_file)
 
-    """
-    data: JSON object. The data we want to normalize.
-    max_level: int. Max number of levels(depth of dict) to normalize.
-        Normalizing a dict involes flattening it and if max_level is None,
-        pandas normalizes all levels. Default max_level is kept 0.
-    meta: Fields to use as metadata for each record in resulting table. Without meta,
-        the method chooses keys from the first JSON object it encounters as column names.
-        We provide column names as meta, because we want all possible keys as columns in
-        our table and not just the keys from the first JSON object.
-    """
-    df = pandas.json_normalize(data, max_level=max_level, meta=column_names)
-    records = get_records_from_dataframe(df)
-
-    for i, row in enumerate(records):
-        if ID in row and ID_ORIGINAL in column_names:
-            row[ID_ORIGINAL] = row.pop("id")
-        records[i] = {
-            k: json.dumps(v)
-            if (isinstance(v, dict) or isinstance(v, list))
-            else v
-            for k, v in row.items()
-        }
-    insert_record_or_records(table, engine, records)
+def _get_json_copy_row(json_object, column_names, max_level):
+    """Get a line of `COPY` text format input for a JSON object."""
+    row = flatten_json_object(json_object, max_level)
+    if ID in row and ID_ORIGINAL in column_names:
+        row[ID_ORIGINAL] = row.pop(ID)
+    return '\t'.join(
+        _get_copy_text_value(row.get(column_name)) for column_name in column_names
+    ) + '\n'
+
+
+def _get_copy_text_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        value = 'true' if value else 'false'
+    else:
+        value = str(value)
+    return value.translate(_COPY_TEXT_ESCAPES)
 
 
 def insert_records_from_excel(table, engine, dataframe):
@@ -0,0 +1,202 @@
+"""
+Cache of the generated SQL used for listing the records of a table.
+
+Building the query for a page of records involves many catalog lookups
+(selectable columns, ordering, summaries of linked records, and so on),
+and the resulting query text embeds the values of filter literals, so
+Postgres has to plan it afresh every time.
+
+Here, the literals of the filter are replaced by parameters, and the
+query text built by `msar.build_list_records_query` is cached under the
+table, the connecting role, the shape of the request, and the version of
+the catalog rows the query depends on (see
+`msar.get_relation_catalog_version`). Any DDL touching those rows
+changes the version, so stale queries are never used. The cached query is
+then executed as a prepared statement, which the connection keeps, so
+later pages or filter values can reuse its plan. The `query` of the
+result is rendered with the parameter values in place, so that it's the
+same as for the uncached path.
+
+Checking the catalog version costs a round trip per call. That's what
+makes it safe to reuse a cached query after DDL, so it isn't skipped.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import re
+from threading import Lock
+import weakref
+
+from psycopg import ClientCursor
+
+from db import connection as db_conn
+
+# The max number of generated queries kept in the cache.
+QUERY_CACHE_MAX_SIZE = 256
+# The max number of statements kept prepared on a single connection.
+PREPARED_STATEMENTS_MAX_SIZE = 32
+
+_query_cache = OrderedDict()
+_query_cache_lock = Lock()
+_prepared_statements = weakref.WeakKeyDictionary()
+_prepared_statements_lock = Lock()
+# Matches a quoted identifier, a string literal, or a parameter placeholder.
+_QUERY_TOKEN_RE = re.compile(r'"(?:[^"]|"")*"|\'(?:[^\']|\'\')*\'|\$(\d+)')
+
+
+def list_records_with_cached_query(
+        conn,
+        table_oid,
+        limit=None,
+        offset=None,
+        order=None,
+        filter=None,
+        group=None,
+        return_record_summaries=False,
+        count_mode='exact',
+        count_limit=None,
+):
+    """
+    Get records from a table, using a cached, prepared query if possible.
+
+    The arguments and result are as for `list_records_from_table`, except
+    that cursors and the 'estimated' count mode aren't supported, since
+    the queries for those depend on more than the shape of the request.
+    """
+    params = [limit, offset]
+    param_filter = parameterize_filter(filter, params)
+    catalog_version = db_conn.exec_msar_func(
+        conn, 'get_relation_catalog_version', table_oid
+    ).fetchone()[0]
+    key = (
+        conn.info.host,
+        conn.info.port,
+        conn.info.dbname,
+        conn.info.user,
+        table_oid,
+        catalog_version,
+        json.dumps(
+            [order, param_filter, group, return_record_summaries, count_mode, count_limit],
+            sort_keys=True,
+        ),
+    )
+    with _query_cache_lock:
+        query = _query_cache.get(key)
+        if query is not None:
+            _query_cache.move_to_end(key)
+    if query is None:
+        query = db_conn.exec_msar_func(
+            conn,
+            'build_list_records_query',
+            table_oid,
+            '$1',
+            '$2',
+            json.dumps(order) if order is not None else None,
+            json.dumps(param_filter) if param_filter is not None else None,
+            json.dumps(group) if group is not None else None,
+            return_record_summaries,
+            count_mode,
+            count_limit,
+        ).fetchone()[0]
+        with _query_cache_lock:
+            _query_cache[key] = query
+            while len(_query_cache) > QUERY_CACHE_MAX_SIZE:
+                _query_cache.popitem(last=False)
+    statement_name = _get_prepared_statement(conn, query)
+    placeholders = ', '.join(['%s'] * len(params))
+    result = ClientCursor(conn).execute(
+        f'EXECUTE {statement_name}({placeholders})', params
+    ).fetchone()[0]
+    if result.get('query') is not None:
+        result['query'] = render_query(result['query'], params)
+    return result
+
+
+def parameterize_filter(filter, params):
+    """
+    Replace the literals of a filter with parameter placeholders.
+
+    The value of each literal is appended to `params` (as text, in the
+    same form that `msar.build_expr` would use for it), and the literal
+    is replaced by a `param` node giving the 1-based position of the
+    value in `params`.
+
+    Args:
+        filter: A filter definition object, or None.
+        params: The list of parameter values to be appended to.
+
+    Returns:
+        A copy of the filter, with `param` nodes in place of literals.
+    """
+    if not isinstance(filter, dict):
+        return filter
+    if filter.get('type') == 'literal':
+        value = filter.get('value')
+        params.append(
+            value if value is None or isinstance(value, str) else json.dumps(value)
+        )
+        return {'type': 'param', 'value': len(params)}
+    if 'args' in filter:
+        return filter | {
+            'args': [parameterize_filter(arg, params) for arg in filter['args']]
+        }
+    return filter
+
+
+def render_query(query, params):
+    """
+    Replace the parameter placeholders of a query with their values.
+
+    Each `$n` placeholder outside of quoted identifiers and literals is
+    replaced by the `n`th value of `params`, quoted as by Postgres'
+    `quote_nullable`. This gives the query `msar.list_records_from_table`
+    would build with the values as literals.
+
+    Args:
+        query: The query text, with `$1`, `$2`, ... placeholders.
+        params: The list of parameter values.
+    """
+    def _replace(match):
+        if match.group(1) is None:
+            return match.group(0)
+        return _quote_nullable(params[int(match.group(1)) - 1])
+    return _QUERY_TOKEN_RE.sub(_replace, query)
+
+
+def _quote_nullable(value):
+    """Quote a value as an SQL literal, like Postgres' `quote_nullable`."""
+    if value is None:
+        return 'NULL'
+    text = str(value)
+    quoted = "'" + text.replace("'", "''") + "'"
+    if '\\' in text:
+        return 'E' + quoted.replace('\\', '\\\\')
+    return quoted
+
+
+def clear_query_cache():
+    """Forget all cached queries."""
+    with _query_cache_lock:
+        _query_cache.clear()
+
+
+def _get_prepared_statement(conn, query):
+    """
+    Get the name of a statement prepared on the connection for the query.
+
+    The statement is prepared if needed. When more than
+    `PREPARED_STATEMENTS_MAX_SIZE` statements are prepared on the
+    connection, the least recently used one is deallocated.
+    """
+    name = '__mathesar_list_' + hashlib.md5(query.encode()).hexdigest()
+    with _prepared_statements_lock:
+        statements = _prepared_statements.setdefault(conn, OrderedDict())
+    if name in statements:
+        statements.move_to_end(name)
+        return name
+    conn.execute(f'PREPARE {name} AS {query}')
+    statements[name] = True
+    while len(statements) > PREPARED_STATEMENTS_MAX_SIZE:
+        evicted_name, _ = statements.popitem(last=False)
+        conn.execute(f'DEALLOCATE {evicted_name}')
+    return name
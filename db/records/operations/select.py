@@ -4,6 +4,7 @@ from sqlalchemy.sql.functions import count
 
 from db import connection as db_conn
 from db.columns.base import MathesarColumn
+from db.records.operations.query_cache import list_records_with_cached_query
 from db.tables.utils import get_primary_key_column
 from db.types.operations.cast import get_column_cast_expression
 from db.types.operations.convert import get_db_type_enum_from_id
@@ -19,7 +20,10 @@ def list_records_from_table(
         order=None,
         filter=None,
         group=None,
-        return_record_summaries=False
+        return_record_summaries=False,
+        count_mode='exact',
+        count_limit=None,
+        cursor=None,
 ):
     """
     Get records from a table.
@@ -37,7 +41,29 @@ def list_records_from_table(
         order: An array of ordering definition objects.
         filter: An array of filter definition objects.
         group: An array of group definition objects.
+        count_mode: How to count the rows matching the filter. One of
+                    'exact', 'estimated', 'capped', or 'none'.
+        count_limit: The maximum number of rows to count in 'capped' mode.
+        cursor: The `next_cursor` from a previous call. If given, only
+                rows after the one it points to are returned.
+
+    Unless a cursor is given or the count is estimated, the generated
+    query is cached and run as a prepared statement. See
+    `db.records.operations.query_cache`.
     """
+    if cursor is None and count_mode != 'estimated':
+        return list_records_with_cached_query(
+            conn,
+            table_oid,
+            limit=limit,
+            offset=offset,
+            order=order,
+            filter=filter,
+            group=group,
+            return_record_summaries=return_record_summaries,
+            count_mode=count_mode,
+            count_limit=count_limit,
+        )
     result = db_conn.exec_msar_func(
         conn,
         'list_records_from_table',
@@ -47,7 +73,10 @@ def list_records_from_table(
         json.dumps(order) if order is not None else None,
         json.dumps(filter) if filter is not None else None,
         json.dumps(group) if group is not None else None,
-        return_record_summaries
+        return_record_summaries,
+        count_mode,
+        count_limit,
+        cursor,
     ).fetchone()[0]
     return result
 
@@ -83,6 +112,9 @@ def search_records_from_table(
         search=[],
         limit=10,
         return_record_summaries=False,
+        cursor=None,
+        count_mode='exact',
+        use_search_indexes=False,
 ):
     """
     Get records from a table, according to a search specification
@@ -93,6 +125,12 @@ def search_records_from_table(
         tab_id: The OID of the table whose records we'll get.
         search: A list of dictionaries defining a search.
         limit: The maximum number of rows we'll return.
+        cursor: The `next_cursor` from a previous call. If given, only
+                rows ranked after the one it points to are returned.
+        count_mode: 'exact' to count the matching rows, or 'none' to skip
+                    counting them.
+        use_search_indexes: Whether to filter rows with a condition which
+                            can use search indexes, rather than by score.
 
     The search definition objects should have the form
     {"attnum": <int>, "literal": <text>}
@@ -100,7 +138,8 @@ def search_records_from_table(
     search = search or []
     result = db_conn.exec_msar_func(
         conn, 'search_records_from_table',
-        table_oid, json.dumps(search), limit, return_record_summaries
+        table_oid, json.dumps(search), limit, return_record_summaries, cursor,
+        count_mode, use_search_indexes
     ).fetchone()[0]
     return result
 
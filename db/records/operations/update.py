@@ -20,6 +20,41 @@ def patch_record_in_table(conn, record_def, record_id, table_oid, return_record_
     return result
 
 
+def patch_records_in_table(conn, record_patches, table_oid, return_record_summaries=False):
+    """Update a number of records in a table."""
+    result = db_conn.exec_msar_func(
+        conn,
+        'patch_records_in_table',
+        table_oid,
+        json.dumps(record_patches),
+        return_record_summaries
+    ).fetchone()[0]
+    return result
+
+
+def update_records_where(conn, record_def, filter, table_oid, dry_run=False):
+    """
+    Set the same values for all records of a table matching a filter.
+
+    Args:
+        record_def: An object mapping attnums to the values to set.
+        filter: A filter definition object, as for listing records.
+        table_oid: The OID of the table whose records we'll update.
+        dry_run: If True, only count the records which would be updated.
+
+    Returns:
+        The number of records updated (or which would be updated).
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'update_records_where',
+        table_oid,
+        json.dumps(filter),
+        json.dumps(record_def),
+        dry_run,
+    ).fetchone()[0]
+
+
 def update_record(table, engine, id_value, record_data):
     primary_key_column = get_primary_key_column(table)
     with engine.begin() as connection:
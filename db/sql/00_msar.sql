@@ -665,6 +665,21 @@ AND attrelid = msar.get_relation_oid(sch_name, rel_name);
 $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_column_full_type(rel_id oid, col_id smallint) RETURNS text AS $$/*
+Return the type of a given column in a relation, including its type modifier (e.g., numeric(5,2)).
+
+Args:
+  rel_id: The OID of the relation.
+  col_id: The attnum of the column in the relation.
+*/
+SELECT format_type(atttypid, atttypmod)
+FROM pg_catalog.pg_attribute
+WHERE attnum = col_id
+AND attrelid = rel_id;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
 CREATE OR REPLACE FUNCTION
 msar.get_interval_fields(typ_mod integer) RETURNS text AS $$/*
 Return the string giving the fields for an interval typmod integer.
@@ -1032,6 +1047,32 @@ AND schema_data.name NOT LIKE 'pg_%';
 $$ LANGUAGE SQL STABLE;
 
 
+CREATE OR REPLACE FUNCTION msar.get_listing_catalog_version() RETURNS text AS $$/*
+Return a fingerprint of the catalog state which the listings of schemas and tables depend on.
+
+The fingerprint changes whenever a DDL statement, comment, privilege change, or role membership
+change could change the result of msar.list_schemas or msar.get_table_info (for any schema), so
+those listings can be cached until it does. As in msar.get_relation_catalog_version, the `xmin` and
+`ctid` of the catalog rows are enough to notice changes.
+*/
+SELECT md5(string_agg(v, ',' ORDER BY v))
+FROM (
+  SELECT format('n%s:%s:%s', oid, xmin, ctid) FROM pg_catalog.pg_namespace
+  UNION ALL
+  SELECT format('c%s:%s:%s', oid, xmin, ctid) FROM pg_catalog.pg_class WHERE relkind = 'r'
+  UNION ALL
+  SELECT format('d%s:%s:%s:%s', classoid, objoid, xmin, ctid)
+  FROM pg_catalog.pg_description
+  WHERE
+    classoid IN ('pg_catalog.pg_namespace'::regclass, 'pg_catalog.pg_class'::regclass)
+    AND objsubid = 0
+  UNION ALL
+  SELECT format('m%s:%s', count(1), max(xmin::text::bigint))
+  FROM pg_catalog.pg_auth_members
+) AS versions_cte(v);
+$$ LANGUAGE SQL STABLE;
+
+
 CREATE OR REPLACE FUNCTION msar.get_schema(sch_id regnamespace) RETURNS jsonb AS $$/*
 Return a json object describing the user-defined schema in the database.
 
@@ -3124,6 +3165,54 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION
+msar.prepare_temp_table_for_import_preview(col_defs jsonb) RETURNS jsonb AS $$/*
+Add a temporary table for previewing an import, returning a JSON object containing a properly
+formatted SQL statement to carry out `COPY FROM`, and the OID and columns of the created table.
+
+The table is like the one msar.prepare_table_for_import would create given the same col_defs, so
+its columns have the same attnums. But, being temporary, it isn't WAL-logged, and it's dropped at
+the end of the current transaction.
+
+The returned JSON object will have the form:
+  {
+    "copy_sql": <str>,
+    "table_oid": <int>,
+    "columns": [{"id": <int>, "name": <str>}, ...]
+  }
+
+Args:
+  col_defs: The columns for the table, in order.
+
+The COPY statement expects the default CSV format, without a header line.
+*/
+DECLARE
+  rel_id oid;
+  col_names_sql text;
+BEGIN
+  DROP TABLE IF EXISTS pg_temp.msar_import_preview;
+  EXECUTE format(
+    'CREATE TEMP TABLE msar_import_preview (%s) ON COMMIT DROP',
+    (
+      SELECT string_agg(__msar.build_col_def_text(col), ', ')
+      FROM unnest(__msar.process_col_def_jsonb(0, col_defs, false, true)) AS col
+    )
+  );
+  rel_id := 'pg_temp.msar_import_preview'::regclass::oid;
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO col_names_sql
+  FROM pg_catalog.pg_attribute
+  WHERE attrelid = rel_id AND atttypid = 'TEXT'::regtype::oid;
+  RETURN jsonb_build_object(
+    'copy_sql', format('COPY pg_temp.msar_import_preview (%s) FROM STDIN CSV', col_names_sql),
+    'table_oid', rel_id::bigint,
+    'columns', jsonb_agg(jsonb_build_object('id', attnum, 'name', attname) ORDER BY attnum)
+  )
+  FROM pg_catalog.pg_attribute
+  WHERE attrelid = rel_id AND atttypid = 'TEXT'::regtype::oid;
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION
 msar.get_preview(
   tab_id oid,
@@ -3290,19 +3379,14 @@ $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
 CREATE OR REPLACE FUNCTION
-msar.infer_column_data_type(tab_id regclass, col_id smallint) RETURNS regtype AS $$/*
-Infer the best type for a given column.
-
-Note that we currently only try for `text` columns, since we only do this at import. I.e.,
-if the column is some other type we just return that original type.
+msar.get_type_inference_sequence() RETURNS regtype[] AS $$/*
+Return the types we try when inferring the type of a text column, in order of preference.
 
-Args:
-  tab_id: The OID of the table of the column whose type we're inferring.
-  col_id: The attnum of the column whose type we're inferring.
+Types which don't exist (e.g., the custom Mathesar types, if they aren't installed) are skipped.
 */
-DECLARE
-  inferred_type regtype;
-  infer_sequence_raw text[] := ARRAY[
+SELECT array_agg(pg_catalog.to_regtype(t) ORDER BY ord)
+FROM unnest(
+  ARRAY[
     'boolean',
     'date',
     'numeric',
@@ -3315,14 +3399,72 @@ DECLARE
     'mathesar_types.mathesar_json_array',
     'mathesar_types.mathesar_json_object',
     'mathesar_types.uri'
-  ];
-  infer_sequence regtype[];
+  ]
+) WITH ORDINALITY AS x(t, ord)
+WHERE pg_catalog.to_regtype(t) IS NOT NULL;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.is_castable(val text, typ_id regtype) RETURNS boolean AS $$/*
+Return true if the given text can be cast to the given type, and false otherwise.
+
+The cast used is the same one we use when altering the type of a column (see
+`__msar.build_cast_expr`).
+
+Args:
+  val: The text to be cast.
+  typ_id: The type to which we'll try to cast.
+*/
+BEGIN
+  EXECUTE format('SELECT %s', __msar.build_cast_expr('$1', typ_id::text)) USING val;
+  RETURN true;
+EXCEPTION WHEN OTHERS THEN
+  RETURN false;
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.all_castable(vals text[], typ_id regtype) RETURNS boolean AS $$/*
+Return true if all of the given texts can be cast to the given type, and false otherwise.
+
+Unlike calling `msar.is_castable` for each value, this casts the values in a single statement, which
+stops at the first value that can't be cast. So, it costs a single subtransaction, however many
+values there are.
+
+Args:
+  vals: The texts to be cast.
+  typ_id: The type to which we'll try to cast.
+*/
+BEGIN
+  EXECUTE format(
+    'SELECT count(%s) FROM unnest($1) AS x(val)', __msar.build_cast_expr('val', typ_id::text)
+  ) USING vals;
+  RETURN true;
+EXCEPTION WHEN OTHERS THEN
+  RETURN false;
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.infer_column_data_type(tab_id regclass, col_id smallint) RETURNS regtype AS $$/*
+Infer the best type for a given column.
+
+Note that we currently only try for `text` columns, since we only do this at import. I.e.,
+if the column is some other type we just return that original type.
+
+Args:
+  tab_id: The OID of the table of the column whose type we're inferring.
+  col_id: The attnum of the column whose type we're inferring.
+*/
+DECLARE
+  inferred_type regtype;
+  infer_sequence regtype[] := msar.get_type_inference_sequence();
   column_nonempty boolean;
   test_type regtype;
 BEGIN
-  infer_sequence := array_agg(pg_catalog.to_regtype(t))
-    FILTER (WHERE pg_catalog.to_regtype(t) IS NOT NULL)
-    FROM unnest(infer_sequence_raw) AS x(t);
   EXECUTE format(
     'SELECT EXISTS (SELECT 1 FROM %1$I.%2$I WHERE %3$I IS NOT NULL)',
     msar.get_relation_schema_name(tab_id),
@@ -3382,6 +3524,175 @@ WHERE
 $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
+DROP FUNCTION IF EXISTS msar.suggest_table_column_data_types(regclass, real, integer);
+CREATE OR REPLACE FUNCTION
+msar.suggest_table_column_data_types(
+  tab_id regclass,
+  sample_percent real DEFAULT null,
+  sample_size integer DEFAULT null,
+  batch_rows integer DEFAULT 10000
+) RETURNS jsonb AS $$/*
+Suggest the best type for each column in the table, reading the table (or a sample of it) once.
+
+Rather than trying each candidate type against each column with a scan of its own (as
+`msar.infer_table_column_data_types` does), this reads the rows in a single scan, and gathers the
+distinct values of each text column in batches of `batch_rows` rows. The candidate types of a column
+(see `msar.get_type_inference_sequence`) are tried against each batch with `msar.all_castable`, and
+a candidate is dropped at the first value which can't be cast to it, so it's never tried again. The
+column is given the first candidate left once all rows are read. So, however many rows there are,
+only one batch of values is held at a time, and a column costs at most one cast statement per
+candidate type and batch.
+
+Args:
+  tab_id: The OID of the table whose columns we're inferring types for.
+  sample_percent: If given, only look at (roughly) this percentage of the table's rows, chosen at
+    random with `TABLESAMPLE SYSTEM`.
+  sample_size: If given, look at no more than this many rows. For tables with more rows than this
+    (according to the planner's statistics), the rows are chosen at random with `TABLESAMPLE SYSTEM`.
+  batch_rows: The number of rows whose values are tried against the candidate types at once.
+
+The response JSON has the form:
+{
+  "types": <object>,
+  "sampled_rows": <int>,
+  "total_rows": <int>,
+  "confidence": <number>
+}
+The "types" object is as returned by `msar.infer_table_column_data_types`. The "confidence" is the
+fraction of the table's rows which were looked at; it's 1 when the whole table was read, in which
+case the suggestions are exact. When sampling a table which was never analyzed, it's analyzed
+first, so that the sample can be chosen at random. If it still has no statistics (e.g., since the
+role can't analyze it), and it has more than `sample_size` rows, the "total_rows" and "confidence"
+are null.
+*/
+DECLARE
+  estimated_rows real;
+  tablesample_expr text;
+  batch_values_expr text;
+  batch record;
+  col record;
+  typ_id regtype;
+  infer_sequence regtype[] := msar.get_type_inference_sequence();
+  -- The candidate types left for each text column having values, keyed by attnum.
+  candidates jsonb := '{}'::jsonb;
+  remaining regtype[];
+  inferred_types jsonb;
+  sampled_rows bigint := 0;
+  total_rows bigint;
+BEGIN
+  estimated_rows := reltuples FROM pg_catalog.pg_class WHERE oid = tab_id;
+  IF estimated_rows < 0 AND (sample_percent IS NOT NULL OR sample_size IS NOT NULL) THEN
+    -- The table was never analyzed (e.g., it was just imported), so we couldn't tell how much of it
+    -- we're sampling. Analyzing it only reads a bounded sample of its rows.
+    EXECUTE format(
+      'ANALYZE %I.%I', msar.get_relation_schema_name(tab_id), msar.get_relation_name(tab_id)
+    );
+    estimated_rows := reltuples FROM pg_catalog.pg_class WHERE oid = tab_id;
+  END IF;
+  IF sample_percent IS NOT NULL THEN
+    tablesample_expr := format('TABLESAMPLE SYSTEM (%s)', sample_percent);
+  ELSIF sample_size IS NOT NULL AND estimated_rows > sample_size THEN
+    -- SYSTEM sampling picks whole pages, so we aim for about twice as many rows as we need.
+    tablesample_expr := format(
+      'TABLESAMPLE SYSTEM (%s)', least(100, 200.0 * sample_size / estimated_rows)
+    );
+  END IF;
+  SELECT string_agg(
+    format('%1$s, array_agg(DISTINCT %2$I) FILTER (WHERE %2$I IS NOT NULL)', attnum, attname),
+    ', ' ORDER BY attnum
+  )
+  FROM pg_catalog.pg_attribute
+  WHERE
+    attrelid = tab_id
+    AND attnum > 0
+    AND NOT attisdropped
+    AND atttypid = 'text'::regtype
+    AND has_column_privilege(attrelid, attnum, 'SELECT')
+  INTO batch_values_expr;
+  FOR batch IN EXECUTE format(
+    $q$
+    SELECT count(1) AS num_rows, jsonb_build_object(%3$s) AS vals
+    FROM (
+      SELECT (row_number() OVER () - 1) / %6$s AS __mathesar_batch, * FROM %1$I.%2$I %4$s %5$s
+    ) AS sample_cte
+    GROUP BY __mathesar_batch
+    $q$,
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    COALESCE(batch_values_expr, ''),
+    tablesample_expr,
+    'LIMIT ' || sample_size,
+    batch_rows
+  ) LOOP
+    sampled_rows := sampled_rows + batch.num_rows;
+    FOR col IN
+      SELECT key AS attnum, ARRAY(SELECT jsonb_array_elements_text(value)) AS vals
+      FROM jsonb_each(batch.vals)
+      WHERE jsonb_typeof(value) = 'array'
+    LOOP
+      remaining := '{}';
+      FOREACH typ_id IN ARRAY CASE
+        WHEN candidates ? col.attnum
+          THEN ARRAY(SELECT jsonb_array_elements_text(candidates -> col.attnum))::regtype[]
+        ELSE infer_sequence
+      END LOOP
+        IF msar.all_castable(col.vals, typ_id) THEN
+          remaining := remaining || typ_id;
+        END IF;
+      END LOOP;
+      candidates := candidates || jsonb_build_object(col.attnum, remaining::text[]);
+    END LOOP;
+  END LOOP;
+  -- A column is left as text if none of its candidates are left.
+  SELECT jsonb_object_agg(
+    key, pg_catalog.format_type(COALESCE(value ->> 0, 'text')::regtype, null)
+  )
+  FROM jsonb_each(candidates)
+  INTO inferred_types;
+  IF tablesample_expr IS NULL AND (sample_size IS NULL OR sampled_rows < sample_size) THEN
+    total_rows := sampled_rows;
+  ELSIF estimated_rows > 0 THEN
+    total_rows := greatest(estimated_rows::bigint, sampled_rows);
+  END IF;
+  RETURN jsonb_build_object(
+    'types', (
+      SELECT jsonb_object_agg(attnum, pg_catalog.format_type(atttypid, null))
+      FROM pg_catalog.pg_attribute
+      WHERE
+        attrelid = tab_id
+        AND attnum > 0
+        AND NOT attisdropped
+        AND has_column_privilege(attrelid, attnum, 'SELECT')
+    ) || COALESCE(inferred_types, '{}'::jsonb),
+    'sampled_rows', sampled_rows,
+    'total_rows', total_rows,
+    'confidence', CASE
+      WHEN total_rows = sampled_rows THEN 1
+      WHEN total_rows > 0 THEN round(sampled_rows::numeric / total_rows, 4)
+    END
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+DROP FUNCTION IF EXISTS msar.infer_table_column_data_types_single_pass(regclass, real);
+CREATE OR REPLACE FUNCTION
+msar.infer_table_column_data_types_single_pass(
+  tab_id regclass,
+  sample_percent real DEFAULT null,
+  sample_size integer DEFAULT null
+) RETURNS jsonb AS $$/*
+Infer the best type for each column in the table, reading the table only once.
+
+Without sampling, this gives the same result as `msar.infer_table_column_data_types`. See
+`msar.suggest_table_column_data_types` for details and the meaning of the arguments.
+
+The response JSON is as for `msar.infer_table_column_data_types`.
+*/
+SELECT msar.suggest_table_column_data_types(tab_id, sample_percent, sample_size) -> 'types';
+$$ LANGUAGE SQL;
+
+
 CREATE OR REPLACE FUNCTION
 __msar.build_col_drop_default_expr(tab_id oid, col_id integer, new_type text, new_default jsonb)
   RETURNS TEXT AS $$/*
@@ -3584,6 +3895,64 @@ FROM prepped_alters;
 $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.find_uncastable_value(tab_id oid, col_alters jsonb) RETURNS jsonb AS $$/*
+Find a value which keeps one of the given column alterations from changing the type of its column.
+
+Returns an object of the form {"attnum": <int>, "value": <text>, "type": <text>} describing the
+first such value found, or null if the values of all columns can be cast to their new types.
+
+Columns whose values can all be cast are skipped after a single (set-based) check, but the values of
+a column which can't be cast are tested one at a time. So, this is only meant for explaining a type
+change which has already failed.
+
+Args:
+  tab_id: The OID of the table whose columns we're checking.
+  col_alters: A JSONB array of column alterations, as for `msar.alter_columns`.
+*/
+DECLARE
+  col record;
+  rec record;
+BEGIN
+  FOR col IN
+    SELECT
+      attnum,
+      attname,
+      msar.build_type_text_complete(col_alter -> 'type', format_type(atttypid, null)) AS new_type
+    FROM jsonb_array_elements(col_alters) AS col_alter
+      INNER JOIN pg_catalog.pg_attribute
+      ON attrelid = tab_id AND attnum = (col_alter ->> 'attnum')::smallint
+    WHERE jsonb_typeof(col_alter -> 'type') = 'object'
+  LOOP
+    BEGIN
+      EXECUTE format(
+        'SELECT count(%s) FROM %I.%I',
+        __msar.build_cast_expr(quote_ident(col.attname), col.new_type),
+        msar.get_relation_schema_name(tab_id),
+        msar.get_relation_name(tab_id)
+      );
+      CONTINUE;
+    EXCEPTION WHEN OTHERS THEN
+      -- Some value of this column can't be cast; we find it below.
+    END;
+    FOR rec IN EXECUTE format(
+      'SELECT %1$I AS val FROM %2$I.%3$I WHERE %1$I IS NOT NULL',
+      col.attname,
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id)
+    ) LOOP
+      BEGIN
+        EXECUTE format('SELECT %s', __msar.build_cast_expr('$1', col.new_type)) USING rec.val;
+      EXCEPTION WHEN OTHERS THEN
+        RETURN jsonb_build_object('attnum', col.attnum, 'value', rec.val::text, 'type', col.new_type);
+      END;
+    END LOOP;
+  END LOOP;
+  RETURN null;
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION
 msar.alter_columns(tab_id oid, col_alters jsonb) RETURNS integer[] AS $$/*
 Alter columns of the given table in bulk, returning the IDs of the columns so altered.
@@ -3596,23 +3965,43 @@ For the specification of the col_alters JSONB, see the msar.process_col_alter_js
 
 Note that all alterations except renaming are done in bulk, and then all name changes are done one
 at a time afterwards. This is because the SQL design specifies at most one name-changing clause per
-query.
+query. In particular, all type changes are done by a single ALTER TABLE statement, so the table is
+rewritten at most once, however many columns change type.
 */
 DECLARE
   r RECORD;
   col_alter_str TEXT;
   description_alter RECORD;
+  uncastable jsonb;
+  err_state text;
+  err_message text;
 BEGIN
   -- Get the string specifying all non-name-change alterations to perform.
   col_alter_str := msar.process_col_alter_jsonb(tab_id, col_alters);
 
-  -- Perform the non-name-change alterations
+  -- Perform the non-name-change alterations. Type changes are checked against every value of
+  -- their columns here, so if one fails, we find (and report) a value which couldn't be cast.
   IF col_alter_str IS NOT NULL THEN
-    PERFORM __msar.exec_ddl(
-      'ALTER TABLE %s %s',
-      __msar.get_qualified_relation_name(tab_id),
-      msar.process_col_alter_jsonb(tab_id, col_alters)
-    );
+    BEGIN
+      PERFORM __msar.exec_ddl(
+        'ALTER TABLE %s %s', __msar.get_qualified_relation_name(tab_id), col_alter_str
+      );
+    EXCEPTION WHEN data_exception OR raise_exception THEN
+      GET STACKED DIAGNOSTICS err_state = RETURNED_SQLSTATE, err_message = MESSAGE_TEXT;
+      uncastable := msar.find_uncastable_value(tab_id, col_alters);
+      IF uncastable IS NULL THEN
+        RAISE;
+      END IF;
+      RAISE EXCEPTION USING
+        ERRCODE = err_state,
+        MESSAGE = err_message,
+        DETAIL = format(
+          'Column %s contains the value %s, which can''t be cast to %s.',
+          quote_ident(msar.get_column_name(tab_id, (uncastable ->> 'attnum')::integer)),
+          quote_literal(uncastable ->> 'value'),
+          uncastable ->> 'type'
+        );
+    END;
   END IF;
 
   -- Here, we perform all description-changing alterations.
@@ -4099,79 +4488,489 @@ $$ LANGUAGE plpgsql;
 
 ----------------------------------------------------------------------------------------------------
 ----------------------------------------------------------------------------------------------------
--- DQL FUNCTIONS
+-- SEARCH INDEX FUNCTIONS
 --
--- This set of functions is for getting records from python.
+-- Functions to manage the pg_trgm indexes used when searching records.
 ----------------------------------------------------------------------------------------------------
 ----------------------------------------------------------------------------------------------------
 
--- Data type formatting functions
 
+CREATE OR REPLACE FUNCTION
+msar.list_search_indexes(tab_id oid) RETURNS jsonb AS $$/*
+List the indexes usable for searching the string columns of a table, returning a JSON array.
 
-CREATE OR REPLACE FUNCTION msar.format_data(val date) RETURNS text AS $$
-SELECT to_char(val, 'YYYY-MM-DD AD');
-$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+Only indexes on a single column, using the GIN access method with the gin_trgm_ops operator class of
+the pg_trgm extension, are listed. Each returned object has the form
+  {"attnum": <int>, "name": <str>}
 
+Args:
+  tab_id: The OID of the table whose search indexes we'll list.
+*/
+SELECT COALESCE(
+  jsonb_agg(
+    jsonb_build_object('attnum', pgi.indkey[0], 'name', pgc.relname)
+    ORDER BY pgi.indkey[0], pgc.relname
+  ),
+  '[]'::jsonb
+)
+FROM pg_catalog.pg_index AS pgi
+  INNER JOIN pg_catalog.pg_class AS pgc ON pgc.oid = pgi.indexrelid
+  INNER JOIN pg_catalog.pg_am AS pgam ON pgam.oid = pgc.relam
+  INNER JOIN pg_catalog.pg_opclass AS pgo ON pgo.oid = pgi.indclass[0]
+WHERE
+  pgi.indrelid = tab_id
+  AND pgi.indnatts = 1
+  AND pgi.indexprs IS NULL
+  AND pgi.indpred IS NULL
+  AND pgam.amname = 'gin'
+  AND pgo.opcname = 'gin_trgm_ops';
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
-CREATE OR REPLACE FUNCTION msar.format_data(val time without time zone) RETURNS text AS $$
-SELECT concat(to_char(val, 'HH24:MI'), ':', to_char(date_part('seconds', val), 'FM00.0999999999'));
-$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
 
+CREATE OR REPLACE FUNCTION
+msar.add_search_index(tab_id oid, col_id integer) RETURNS jsonb AS $$/*
+Add an index for searching a string column of a table, returning the search indexes of the table.
 
-CREATE OR REPLACE FUNCTION msar.format_data(val time with time zone) RETURNS text AS $$
-SELECT CASE
-  WHEN date_part('timezone_hour', val) = 0 AND date_part('timezone_minute', val) = 0
-    THEN concat(
-      to_char(date_part('hour', val), 'FM00'), ':', to_char(date_part('minute', val), 'FM00'),
-      ':', to_char(date_part('seconds', val), 'FM00.0999999999'), 'Z'
-    )
-  ELSE
-    concat(
-      to_char(date_part('hour', val), 'FM00'), ':', to_char(date_part('minute', val), 'FM00'),
-      ':', to_char(date_part('seconds', val), 'FM00.0999999999'),
-      to_char(date_part('timezone_hour', val), 'S00'), ':',
-      ltrim(to_char(date_part('timezone_minute', val), '00'), '+- ')
-    )
-END;
-$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+The index is a pg_trgm GIN index, which can be used for the `ILIKE '%...%'` conditions built by
+msar.get_search_condition_expr. Nothing is done if the column already has such an index. The pg_trgm
+extension is created if needed (it's a trusted extension, so this only needs the CREATE privilege on
+the database).
 
+Note that, like any CREATE INDEX, this blocks writes to the table while the index is built.
 
-CREATE OR REPLACE FUNCTION msar.format_data(val timestamp without time zone) RETURNS text AS $$
-SELECT
-  concat(
-    to_char(val, 'YYYY-MM-DD"T"HH24:MI'),
-    ':', to_char(date_part('seconds', val), 'FM00.0999999999'),
-    to_char(val, ' BC')
+Args:
+  tab_id: The OID of the table containing the column to index.
+  col_id: The attnum of the column to index.
+*/
+DECLARE
+  trgm_schema text;
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM jsonb_array_elements(msar.list_search_indexes(tab_id)) AS search_index
+    WHERE (search_index ->> 'attnum')::integer = col_id
+  ) THEN
+    RETURN msar.list_search_indexes(tab_id);
+  END IF;
+  IF NOT EXISTS (
+    SELECT 1
+    FROM pg_catalog.pg_attribute AS pga
+      INNER JOIN pg_catalog.pg_type AS pgt ON pga.atttypid = pgt.oid
+    WHERE pga.attrelid = tab_id AND pga.attnum = col_id AND pgt.typcategory = 'S'
+  ) THEN
+    RAISE EXCEPTION 'Search indexes can only be added to string columns';
+  END IF;
+  CREATE EXTENSION IF NOT EXISTS pg_trgm;
+  SELECT extnamespace::regnamespace::text INTO trgm_schema
+  FROM pg_catalog.pg_extension WHERE extname = 'pg_trgm';
+  EXECUTE format(
+    'CREATE INDEX ON %s USING gin (%I %s.gin_trgm_ops)',
+    __msar.get_qualified_relation_name(tab_id),
+    msar.get_column_name(tab_id, col_id),
+    trgm_schema
   );
-$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+  RETURN msar.list_search_indexes(tab_id);
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
 
 
-CREATE OR REPLACE FUNCTION msar.format_data(val timestamp with time zone) RETURNS text AS $$
-SELECT CASE
-  WHEN date_part('timezone_hour', val) = 0 AND date_part('timezone_minute', val) = 0
-    THEN concat(
-      to_char(val, 'YYYY-MM-DD"T"HH24:MI'),
-      ':', to_char(date_part('seconds', val), 'FM00.0999999999'), 'Z', to_char(val, ' BC')
-    )
-  ELSE
-    concat(
-      to_char(val, 'YYYY-MM-DD"T"HH24:MI'),
-      ':', to_char(date_part('seconds', val), 'FM00.0999999999'),
-      to_char(date_part('timezone_hour', val), 'S00'),
-      ':', ltrim(to_char(date_part('timezone_minute', val), '00'), '+- '), to_char(val, ' BC')
-    )
+CREATE OR REPLACE FUNCTION
+msar.drop_search_index(tab_id oid, col_id integer) RETURNS jsonb AS $$/*
+Drop the search indexes of a column of a table, returning the search indexes left on the table.
+
+Args:
+  tab_id: The OID of the table containing the column.
+  col_id: The attnum of the column whose search indexes we'll drop.
+*/
+DECLARE
+  index_name text;
+BEGIN
+  FOR index_name IN
+    SELECT search_index ->> 'name'
+    FROM jsonb_array_elements(msar.list_search_indexes(tab_id)) AS search_index
+    WHERE (search_index ->> 'attnum')::integer = col_id
+  LOOP
+    EXECUTE format('DROP INDEX %I.%I', msar.get_relation_schema_name(tab_id), index_name);
+  END LOOP;
+  RETURN msar.list_search_indexes(tab_id);
 END;
-$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
 
 
-CREATE OR REPLACE FUNCTION msar.format_data(val interval) returns text AS $$
-SELECT concat(
-  to_char(val, 'PFMYYYY"Y"FMMM"M"FMDD"D""T"FMHH24"H"FMMI"M"'), date_part('seconds', val), 'S'
-);
-$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+----------------------------------------------------------------------------------------------------
+----------------------------------------------------------------------------------------------------
+-- SUMMARY CACHE FUNCTIONS
+--
+-- Functions to manage the optional cache of record summaries, used when summarizing linked records.
+--
+-- The cache is enabled per table. It holds the summary of each row of the table, keyed by the
+-- (formatted) value of its single-column primary key, and it's kept up to date by statement-level
+-- triggers on the table. It's only used in place of computing summaries live when it still matches
+-- the summary the current user would get (see msar.is_summary_cache_usable).
+----------------------------------------------------------------------------------------------------
+----------------------------------------------------------------------------------------------------
 
 
-CREATE OR REPLACE FUNCTION msar.format_data(val anyelement) returns anyelement AS $$
+CREATE TABLE IF NOT EXISTS msar.summary_cache_tables (
+  tab_id oid PRIMARY KEY,
+  key_col_id smallint NOT NULL,
+  key_col_type text NOT NULL,
+  summary_col_id smallint NOT NULL,
+  summary_col_type text NOT NULL
+);
+CREATE TABLE IF NOT EXISTS msar.summary_cache (
+  tab_id oid NOT NULL,
+  key text NOT NULL,
+  summary text,
+  PRIMARY KEY (tab_id, key)
+);
+
+
+CREATE OR REPLACE FUNCTION
+msar.has_summary_cache_privilege(tab_id oid, privilege_ text) RETURNS boolean AS $$/*
+Return true if the current role has a privilege on the cached columns of a table.
+
+This is used by the row level security policies of msar.summary_cache, so that roles can only see
+the cached summaries of columns they could read anyway.
+
+Args:
+  tab_id: The OID of the table whose summaries are cached.
+  privilege_: The privilege (e.g., 'SELECT'), as given to has_column_privilege.
+*/
+SELECT EXISTS (
+  SELECT 1 FROM msar.summary_cache_tables AS sct
+  WHERE
+    sct.tab_id = has_summary_cache_privilege.tab_id
+    AND has_column_privilege(sct.tab_id, sct.key_col_id, privilege_)
+    AND has_column_privilege(sct.tab_id, sct.summary_col_id, privilege_)
+);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.is_summary_cache_type_supported(tab_id oid, col_id smallint) RETURNS boolean AS $$/*
+Return true if a column exists, and its type is one whose values can be cached as summaries or keys.
+
+Only the built-in types (and the Mathesar types) are supported. The cache is kept up to date by the
+msar.update_summary_cache trigger function, which runs with the privileges of its owner, so it must
+not run any function (e.g., a cast to text) which other roles could have defined for their own types.
+
+Args:
+  tab_id: The OID of the table whose summaries are cached.
+  col_id: The attnum of the key or summary column.
+*/
+SELECT EXISTS (
+  SELECT 1
+  FROM pg_catalog.pg_attribute AS pga
+    INNER JOIN pg_catalog.pg_type AS pgt ON pgt.oid = pga.atttypid
+  WHERE
+    pga.attrelid = tab_id
+    AND pga.attnum = col_id
+    AND NOT pga.attisdropped
+    AND pgt.typnamespace IN ('pg_catalog'::regnamespace, pg_catalog.to_regnamespace('mathesar_types'))
+);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+-- The cache is filled and emptied by roles which can set it up for a table (see below), and it's kept
+-- up to date by the (security definer) msar.update_summary_cache trigger function.
+ALTER TABLE msar.summary_cache ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS summary_cache_select ON msar.summary_cache;
+CREATE POLICY summary_cache_select ON msar.summary_cache FOR SELECT
+  USING (msar.has_summary_cache_privilege(tab_id, 'SELECT'));
+DROP POLICY IF EXISTS summary_cache_insert ON msar.summary_cache;
+CREATE POLICY summary_cache_insert ON msar.summary_cache FOR INSERT
+  WITH CHECK (has_table_privilege(tab_id, 'TRIGGER'));
+DROP POLICY IF EXISTS summary_cache_delete ON msar.summary_cache;
+CREATE POLICY summary_cache_delete ON msar.summary_cache FOR DELETE
+  USING (has_table_privilege(tab_id, 'TRIGGER'));
+GRANT SELECT, INSERT, DELETE ON msar.summary_cache TO PUBLIC;
+
+ALTER TABLE msar.summary_cache_tables ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS summary_cache_tables_select ON msar.summary_cache_tables;
+CREATE POLICY summary_cache_tables_select ON msar.summary_cache_tables FOR SELECT
+  USING (true);
+-- Setting up the cache means creating triggers on the table, so the same privilege is required.
+DROP POLICY IF EXISTS summary_cache_tables_write ON msar.summary_cache_tables;
+CREATE POLICY summary_cache_tables_write ON msar.summary_cache_tables FOR ALL
+  USING (has_table_privilege(tab_id, 'TRIGGER'))
+  WITH CHECK (has_table_privilege(tab_id, 'TRIGGER'));
+GRANT SELECT, INSERT, UPDATE, DELETE ON msar.summary_cache_tables TO PUBLIC;
+
+
+CREATE OR REPLACE FUNCTION msar.update_summary_cache() RETURNS trigger AS $$/*
+Update the cached summaries of the rows changed by the statement firing the trigger.
+
+This is run by statement-level AFTER triggers added by msar.enable_summary_cache, which reference the
+old and new rows of the statement as the old_rows and new_rows transition tables.
+
+It's a security definer function, so that the cache is updated whatever the privileges of the role
+changing the table. It only reads the transition tables, never the table itself, and only formats
+values of the types supported by msar.is_summary_cache_type_supported. If a cached column has been
+dropped, or changed to an unsupported type, the cache is disabled. If its type has changed otherwise,
+the cache is left alone: it isn't used until it's refreshed (see msar.is_summary_cache_usable), which
+recomputes all of its summaries anyway.
+*/
+DECLARE
+  cache_def msar.summary_cache_tables;
+  key_expr text;
+BEGIN
+  SELECT * INTO cache_def FROM msar.summary_cache_tables WHERE tab_id = TG_RELID;
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+  IF TG_OP = 'TRUNCATE' THEN
+    DELETE FROM msar.summary_cache WHERE tab_id = TG_RELID;
+    RETURN NULL;
+  END IF;
+  IF NOT (
+    msar.is_summary_cache_type_supported(TG_RELID, cache_def.key_col_id)
+    AND msar.is_summary_cache_type_supported(TG_RELID, cache_def.summary_col_id)
+  ) THEN
+    DELETE FROM msar.summary_cache WHERE tab_id = TG_RELID;
+    DELETE FROM msar.summary_cache_tables WHERE tab_id = TG_RELID;
+    RETURN NULL;
+  END IF;
+  IF (
+    cache_def.key_col_type <> msar.get_column_full_type(TG_RELID, cache_def.key_col_id)
+    OR cache_def.summary_col_type <> msar.get_column_full_type(TG_RELID, cache_def.summary_col_id)
+  ) THEN
+    RETURN NULL;
+  END IF;
+  key_expr := format('msar.format_data(%I)::text', msar.get_column_name(TG_RELID, cache_def.key_col_id));
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    EXECUTE format(
+      'DELETE FROM msar.summary_cache WHERE tab_id = %1$L AND key IN (SELECT %2$s FROM old_rows)',
+      TG_RELID,
+      key_expr
+    );
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    EXECUTE format(
+      $q$INSERT INTO msar.summary_cache (tab_id, key, summary)
+      SELECT %1$L, %2$s, msar.format_data(%3$I)::text FROM new_rows
+      ON CONFLICT (tab_id, key) DO UPDATE SET summary = EXCLUDED.summary$q$,
+      TG_RELID,
+      key_expr,
+      msar.get_column_name(TG_RELID, cache_def.summary_col_id)
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path TO pg_catalog, pg_temp;
+
+
+CREATE OR REPLACE FUNCTION
+msar.refresh_summary_cache(tab_id oid) RETURNS void AS $$/*
+Recompute all cached summaries of a table for which the summary cache is enabled.
+
+This is only needed when the cache can't have been kept up to date by its triggers, e.g., after the
+type of the summarized column has changed.
+
+Args:
+  tab_id: The OID of the table whose cached summaries we'll recompute.
+*/
+DECLARE
+  cache_def msar.summary_cache_tables;
+BEGIN
+  SELECT * INTO cache_def FROM msar.summary_cache_tables AS sct WHERE sct.tab_id = refresh_summary_cache.tab_id;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'The summary cache is not enabled for this table';
+  END IF;
+  IF EXISTS (
+    SELECT 1 FROM pg_catalog.pg_attribute
+    WHERE
+      attrelid = tab_id
+      AND attnum IN (cache_def.key_col_id, cache_def.summary_col_id)
+      AND attisdropped
+  ) THEN
+    RAISE EXCEPTION 'A cached column was dropped, so the summary cache must be enabled again';
+  END IF;
+  IF NOT (
+    msar.is_summary_cache_type_supported(tab_id, cache_def.key_col_id)
+    AND msar.is_summary_cache_type_supported(tab_id, cache_def.summary_col_id)
+  ) THEN
+    RAISE EXCEPTION 'The summary cache only supports columns of built-in types';
+  END IF;
+  UPDATE msar.summary_cache_tables AS sct SET
+    key_col_type = msar.get_column_full_type(sct.tab_id, sct.key_col_id),
+    summary_col_type = msar.get_column_full_type(sct.tab_id, sct.summary_col_id)
+  WHERE sct.tab_id = refresh_summary_cache.tab_id;
+  DELETE FROM msar.summary_cache AS sc WHERE sc.tab_id = refresh_summary_cache.tab_id;
+  EXECUTE format(
+    $q$INSERT INTO msar.summary_cache (tab_id, key, summary)
+    SELECT %1$L, msar.format_data(%2$I)::text, msar.format_data(%3$I)::text FROM %4$s$q$,
+    tab_id,
+    msar.get_column_name(tab_id, cache_def.key_col_id),
+    msar.get_column_name(tab_id, cache_def.summary_col_id),
+    __msar.get_qualified_relation_name(tab_id)
+  );
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.enable_summary_cache(tab_id oid) RETURNS void AS $$/*
+Start caching the summaries of the rows of a table, to be used when summarizing linked records.
+
+The table must have a single-column primary key. The summarized column is the table's default
+summary column (see msar.get_default_summary_column), as chosen for the current role. Both columns
+must be of built-in types (see msar.is_summary_cache_type_supported). The cache is
+filled right away, and kept up to date by triggers on the table from then on. If the cache is
+already enabled for the table, it's set up again.
+
+Args:
+  tab_id: The OID of the table whose summaries we'll cache.
+*/
+DECLARE
+  key_col_id smallint := msar.get_pk_column(tab_id);
+  summary_col_id smallint := msar.get_default_summary_column(tab_id);
+  qualified_tab_name text := __msar.get_qualified_relation_name(tab_id);
+BEGIN
+  IF key_col_id IS NULL THEN
+    RAISE EXCEPTION 'The summary cache needs a table with a single-column primary key';
+  END IF;
+  IF NOT (
+    msar.is_summary_cache_type_supported(tab_id, key_col_id)
+    AND msar.is_summary_cache_type_supported(tab_id, summary_col_id)
+  ) THEN
+    RAISE EXCEPTION 'The summary cache only supports columns of built-in types';
+  END IF;
+  PERFORM msar.disable_summary_cache(tab_id);
+  INSERT INTO msar.summary_cache_tables VALUES (
+    tab_id,
+    key_col_id,
+    msar.get_column_full_type(tab_id, key_col_id),
+    summary_col_id,
+    msar.get_column_full_type(tab_id, summary_col_id)
+  );
+  EXECUTE format(
+    $t$CREATE TRIGGER msar_summary_cache_insert
+    AFTER INSERT ON %1$s REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION msar.update_summary_cache()$t$,
+    qualified_tab_name
+  );
+  EXECUTE format(
+    $t$CREATE TRIGGER msar_summary_cache_update
+    AFTER UPDATE ON %1$s REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION msar.update_summary_cache()$t$,
+    qualified_tab_name
+  );
+  EXECUTE format(
+    $t$CREATE TRIGGER msar_summary_cache_delete
+    AFTER DELETE ON %1$s REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION msar.update_summary_cache()$t$,
+    qualified_tab_name
+  );
+  EXECUTE format(
+    $t$CREATE TRIGGER msar_summary_cache_truncate
+    AFTER TRUNCATE ON %1$s
+    FOR EACH STATEMENT EXECUTE FUNCTION msar.update_summary_cache()$t$,
+    qualified_tab_name
+  );
+  PERFORM msar.refresh_summary_cache(tab_id);
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.disable_summary_cache(tab_id oid) RETURNS void AS $$/*
+Stop caching the summaries of the rows of a table, dropping its cached summaries and triggers.
+
+Nothing is done if the cache isn't enabled for the table.
+
+Args:
+  tab_id: The OID of the table whose summaries are cached.
+*/
+DECLARE
+  trigger_name text;
+BEGIN
+  FOR trigger_name IN
+    SELECT tgname FROM pg_catalog.pg_trigger
+    WHERE tgrelid = tab_id AND tgfoid = 'msar.update_summary_cache()'::regprocedure
+  LOOP
+    EXECUTE format('DROP TRIGGER %I ON %s', trigger_name, __msar.get_qualified_relation_name(tab_id));
+  END LOOP;
+  DELETE FROM msar.summary_cache AS sc WHERE sc.tab_id = disable_summary_cache.tab_id;
+  DELETE FROM msar.summary_cache_tables AS sct WHERE sct.tab_id = disable_summary_cache.tab_id;
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+----------------------------------------------------------------------------------------------------
+----------------------------------------------------------------------------------------------------
+-- DQL FUNCTIONS
+--
+-- This set of functions is for getting records from python.
+----------------------------------------------------------------------------------------------------
+----------------------------------------------------------------------------------------------------
+
+-- Data type formatting functions
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val date) RETURNS text AS $$
+SELECT to_char(val, 'YYYY-MM-DD AD');
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val time without time zone) RETURNS text AS $$
+SELECT concat(to_char(val, 'HH24:MI'), ':', to_char(date_part('seconds', val), 'FM00.0999999999'));
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val time with time zone) RETURNS text AS $$
+SELECT CASE
+  WHEN date_part('timezone_hour', val) = 0 AND date_part('timezone_minute', val) = 0
+    THEN concat(
+      to_char(date_part('hour', val), 'FM00'), ':', to_char(date_part('minute', val), 'FM00'),
+      ':', to_char(date_part('seconds', val), 'FM00.0999999999'), 'Z'
+    )
+  ELSE
+    concat(
+      to_char(date_part('hour', val), 'FM00'), ':', to_char(date_part('minute', val), 'FM00'),
+      ':', to_char(date_part('seconds', val), 'FM00.0999999999'),
+      to_char(date_part('timezone_hour', val), 'S00'), ':',
+      ltrim(to_char(date_part('timezone_minute', val), '00'), '+- ')
+    )
+END;
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val timestamp without time zone) RETURNS text AS $$
+SELECT
+  concat(
+    to_char(val, 'YYYY-MM-DD"T"HH24:MI'),
+    ':', to_char(date_part('seconds', val), 'FM00.0999999999'),
+    to_char(val, ' BC')
+  );
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val timestamp with time zone) RETURNS text AS $$
+SELECT CASE
+  WHEN date_part('timezone_hour', val) = 0 AND date_part('timezone_minute', val) = 0
+    THEN concat(
+      to_char(val, 'YYYY-MM-DD"T"HH24:MI'),
+      ':', to_char(date_part('seconds', val), 'FM00.0999999999'), 'Z', to_char(val, ' BC')
+    )
+  ELSE
+    concat(
+      to_char(val, 'YYYY-MM-DD"T"HH24:MI'),
+      ':', to_char(date_part('seconds', val), 'FM00.0999999999'),
+      to_char(date_part('timezone_hour', val), 'S00'),
+      ':', ltrim(to_char(date_part('timezone_minute', val), '00'), '+- '), to_char(val, ' BC')
+    )
+END;
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val interval) returns text AS $$
+SELECT concat(
+  to_char(val, 'PFMYYYY"Y"FMMM"M"FMDD"D""T"FMHH24"H"FMMI"M"'), date_part('seconds', val), 'S'
+);
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.format_data(val anyelement) returns anyelement AS $$
 SELECT val;
 $$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
 
@@ -4199,6 +4998,7 @@ INSERT INTO msar.expr_templates VALUES
   ('json_array_length', 'jsonb_array_length((%s)::jsonb)'),
   ('json_array_contains', '(%s)::jsonb @> (%s)::jsonb'),
   ('element_in_json_array_untyped', '(%s)::text IN (SELECT jsonb_array_elements_text(%s))'),
+  ('element_in_array', '(%s) = ANY(%s)'),
   ('convert_to_json', 'to_jsonb(%s)'),
   -- date part extractors
   ('truncate_to_year', 'to_char((%s)::date, ''YYYY AD'')'),
@@ -4216,6 +5016,8 @@ INSERT INTO msar.expr_templates VALUES
 CREATE OR REPLACE FUNCTION msar.build_expr(rel_id oid, tree jsonb) RETURNS text AS $$
 SELECT CASE tree ->> 'type'
   WHEN 'literal' THEN format('%L', tree ->> 'value')
+  WHEN 'param' THEN format('$%s', (tree ->> 'value')::integer)
+  WHEN 'literal_array' THEN format('%L', ARRAY(SELECT jsonb_array_elements_text(tree -> 'value')))
   WHEN 'attnum' THEN format('%I', msar.get_column_name(rel_id, (tree ->> 'value')::smallint))
   ELSE
     format(max(expr_template), VARIADIC array_agg(msar.build_expr(rel_id, inner_tree)))
@@ -4313,6 +5115,183 @@ SELECT 'ORDER BY ' || msar.build_total_order_expr(tab_id, order_)
 $$ LANGUAGE SQL STABLE;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_total_order_keys(tab_id oid, order_ jsonb) RETURNS jsonb AS $$/*
+Get the keys of the deterministic ordering for the given table and order JSON.
+
+The keys are the same ones used by `msar.build_total_order_expr`, in the same order. Each is
+described by an object of the form
+  {"attnum": <int>, "attname": <text>, "direction": <text>, "not_null": <bool>}
+
+Args:
+  tab_id: The OID of the table whose columns we'll order by.
+  order_: A JSONB array defining any desired ordering of columns.
+*/
+SELECT COALESCE(
+  jsonb_agg(
+    jsonb_build_object(
+      'attnum', x.attnum,
+      'attname', pga.attname,
+      'direction', msar.sanitize_direction(x.direction),
+      'not_null', pga.attnotnull
+    ) ORDER BY x.ordinality
+  ),
+  '[]'::jsonb
+)
+FROM ROWS FROM (
+  jsonb_to_recordset(
+    COALESCE(
+      COALESCE(order_, '[]'::jsonb) || msar.get_pkey_order(tab_id),
+      COALESCE(order_, '[]'::jsonb) || msar.get_total_order(tab_id)
+    )
+  ) AS (attnum smallint, direction text)
+) WITH ORDINALITY AS x(attnum, direction, ordinality)
+  INNER JOIN pg_catalog.pg_attribute AS pga ON pga.attrelid = tab_id AND pga.attnum = x.attnum
+WHERE has_column_privilege(tab_id, x.attnum, 'SELECT');
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION msar.encode_cursor(cursor_values jsonb) RETURNS text AS $$/*
+Encode the order key values of a row as an opaque pagination cursor.
+
+Args:
+  cursor_values: A JSONB object mapping order keys to the values they take for some row.
+*/
+SELECT translate(encode(convert_to(cursor_values::text, 'UTF8'), 'base64'), E'\n', '');
+$$ LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION msar.decode_cursor(cursor_ text) RETURNS jsonb AS $$/*
+Decode a pagination cursor produced by `msar.encode_cursor`.
+
+Args:
+  cursor_: The opaque cursor string.
+*/
+DECLARE
+  cursor_values jsonb;
+BEGIN
+  cursor_values := convert_from(decode(cursor_, 'base64'), 'UTF8')::jsonb;
+  IF jsonb_typeof(cursor_values) <> 'object' THEN
+    RAISE EXCEPTION 'Invalid cursor: %', cursor_;
+  END IF;
+  RETURN cursor_values;
+EXCEPTION
+  WHEN invalid_parameter_value OR invalid_text_representation OR character_not_in_repertoire THEN
+    RAISE EXCEPTION 'Invalid cursor: %', cursor_;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE RETURNS NULL ON NULL INPUT PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_cursor_values(tab_id oid, order_ jsonb, row_ jsonb) RETURNS jsonb AS $$/*
+Get the values of the order keys for a row, suitable for encoding in a pagination cursor.
+
+Args:
+  tab_id: The OID of the table whose records we're paging through.
+  order_: A JSONB array defining any desired ordering of columns.
+  row_: A record, in the form returned by `msar.list_records_from_table`.
+*/
+SELECT jsonb_object_agg(key_ ->> 'attnum', row_ -> (key_ ->> 'attnum'))
+FROM jsonb_array_elements(msar.get_total_order_keys(tab_id, order_)) AS key_;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_keyset_keys(tab_id oid, order_ jsonb, cursor_values jsonb) RETURNS jsonb AS $$/*
+Describe the order keys of a table along with the values they take for the row a cursor points to.
+
+The result is suitable for passing to `msar.build_keyset_expr`. If the cursor doesn't contain a
+value for some key (e.g., because it was made using a different ordering), the `value` is omitted
+from the description of that key.
+
+Args:
+  tab_id: The OID of the table whose records we're paging through.
+  order_: A JSONB array defining any desired ordering of columns.
+  cursor_values: A JSONB object mapping attnums to values, as returned by `msar.decode_cursor`.
+*/
+SELECT jsonb_agg(
+  jsonb_build_object(
+    'expr', format('msar.format_data(%I)', key_ ->> 'attname'),
+    'direction', key_ -> 'direction',
+    'not_null', key_ -> 'not_null'
+  ) || CASE WHEN cursor_values ? (key_ ->> 'attnum') THEN
+    jsonb_build_object('value', cursor_values -> (key_ ->> 'attnum'))
+  ELSE
+    '{}'::jsonb
+  END
+)
+FROM jsonb_array_elements(msar.get_total_order_keys(tab_id, order_)) AS key_;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION msar.build_keyset_expr(keys_ jsonb) RETURNS text AS $$/*
+Build a condition selecting the rows that come strictly after a given row in a total ordering.
+
+This lets us page through records by remembering the last row of the previous page, rather than
+by skipping some number of rows with OFFSET. When all keys are sorted in the same direction and
+can't be null, a row-value comparison (which can use a multicolumn btree index) is produced.
+Otherwise, the comparison is expanded to respect the per-key directions, and the fact that NULLs
+sort last in ascending order (and first in descending order).
+
+Args:
+  keys_: An array of objects, each of the form
+    {"expr": <text>, "direction": <text>, "not_null": <bool>, "value": <any>}
+    where `expr` is the SQL expression of an order key, and `value` is the value it takes for the
+    row after which we want to list records.
+*/
+DECLARE
+  key_ jsonb;
+  expr_ text;
+  value_ text;
+  is_desc boolean;
+  eq_exprs text[] := ARRAY[]::text[];
+  or_exprs text[] := ARRAY[]::text[];
+BEGIN
+  IF jsonb_array_length(keys_) = 0 THEN
+    RETURN NULL;
+  END IF;
+  IF EXISTS (SELECT 1 FROM jsonb_array_elements(keys_) AS k WHERE NOT k ? 'value') THEN
+    RAISE EXCEPTION 'The cursor does not match the requested ordering';
+  END IF;
+  IF (
+    SELECT count(DISTINCT COALESCE(k ->> 'direction', 'ASC')) = 1
+      AND bool_and((k ->> 'not_null')::boolean AND jsonb_typeof(k -> 'value') <> 'null')
+    FROM jsonb_array_elements(keys_) AS k
+  ) THEN
+    RETURN (
+      SELECT format(
+        '(%s) %s (%s)',
+        string_agg(k ->> 'expr', ', '),
+        CASE WHEN max(k ->> 'direction') = 'DESC' THEN '<' ELSE '>' END,
+        string_agg(format('%L', k #>> '{value}'), ', ')
+      )
+      FROM jsonb_array_elements(keys_) AS k
+    );
+  END IF;
+  FOR key_ IN SELECT * FROM jsonb_array_elements(keys_) LOOP
+    expr_ := key_ ->> 'expr';
+    value_ := key_ #>> '{value}';
+    is_desc := COALESCE(key_ ->> 'direction' = 'DESC', false);
+    or_exprs := or_exprs || array_to_string(
+      eq_exprs || CASE
+        WHEN value_ IS NULL AND is_desc THEN format('%s IS NOT NULL', expr_)
+        WHEN value_ IS NULL THEN 'false'
+        WHEN is_desc THEN format('%s < %L', expr_, value_)
+        WHEN (key_ ->> 'not_null')::boolean THEN format('%s > %L', expr_, value_)
+        ELSE format('(%1$s > %2$L OR %1$s IS NULL)', expr_, value_)
+      END,
+      ' AND '
+    );
+    eq_exprs := eq_exprs || CASE
+      WHEN value_ IS NULL THEN format('%s IS NULL', expr_)
+      ELSE format('%s = %L', expr_, value_)
+    END;
+  END LOOP;
+  RETURN '(' || array_to_string(or_exprs, ' OR ') || ')';
+END;
+$$ LANGUAGE plpgsql IMMUTABLE RETURNS NULL ON NULL INPUT;
+
+
 CREATE OR REPLACE FUNCTION
 msar.build_grouping_columns_expr(tab_id oid, group_ jsonb) RETURNS TEXT AS $$/*
 Build a column expression for use in grouping window functions.
@@ -4512,40 +5491,121 @@ SELECT format(
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
-CREATE OR REPLACE FUNCTION msar.build_summary_cte_expr_for_table(tab_id oid) RETURNS TEXT AS $$/*
-Build an SQL text expression defining a sequence of CTEs that give summaries for linked records.
+CREATE OR REPLACE FUNCTION
+msar.is_summary_cache_usable(tab_id oid, key_col_id smallint) RETURNS boolean AS $$/*
+Return true if the cached summaries of a table can be used in place of computing them live.
 
-This summary amounts to just the first string-like column value for that linked record.
+This is the case when the cache is enabled for the table, it's keyed by the given column, and it
+summarizes the column the current role would get summaries from, with the same column types as when
+it was filled. Also, all of its triggers must still be in place, and the table must not use row
+level security (which could hide some rows from the current role). Otherwise, the cache could be
+stale (or show rows the current role can't see), and summaries are computed live.
 
 Args:
-  tab_id: The table for whose fkey values' linked records we'll get summaries.
+  tab_id: The OID of the table whose summaries are cached.
+  key_col_id: The attnum of the column by which summaries would be looked up.
 */
-WITH fkey_map_cte AS (SELECT * FROM msar.get_fkey_map_table(tab_id))
-SELECT ', '
+SELECT EXISTS (
+  SELECT 1
+  FROM msar.summary_cache_tables AS sct
+    INNER JOIN pg_catalog.pg_class AS pgc ON pgc.oid = sct.tab_id
+  WHERE
+    sct.tab_id = is_summary_cache_usable.tab_id
+    AND sct.key_col_id = is_summary_cache_usable.key_col_id
+    AND sct.key_col_type = msar.get_column_full_type(sct.tab_id, sct.key_col_id)
+    AND sct.summary_col_id = msar.get_default_summary_column(sct.tab_id)
+    AND sct.summary_col_type = msar.get_column_full_type(sct.tab_id, sct.summary_col_id)
+    AND msar.is_summary_cache_type_supported(sct.tab_id, sct.key_col_id)
+    AND msar.is_summary_cache_type_supported(sct.tab_id, sct.summary_col_id)
+    AND NOT pgc.relrowsecurity
+    AND (
+      SELECT count(*) FROM pg_catalog.pg_trigger AS pgt
+      WHERE
+        pgt.tgrelid = sct.tab_id
+        AND pgt.tgfoid = 'msar.update_summary_cache()'::regprocedure
+        AND pgt.tgenabled <> 'D'
+    ) = 4
+);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+DROP FUNCTION IF EXISTS msar.build_summary_cte_expr_for_table(oid);
+CREATE OR REPLACE FUNCTION
+msar.build_summary_cte_expr_for_table(tab_id oid, cte_name text) RETURNS TEXT AS $$/*
+Build an SQL text expression defining a sequence of CTEs that give summaries for linked records.
+
+This summary amounts to just the first string-like column value for that linked record. Only the
+records linked from the rows of the main CTE (i.e., the current page) are summarized, looking them up
+by the distinct values of each fkey column on the page, so that the cost doesn't depend on the size
+of the linked tables.
+
+Where the summary cache of a table can be used (see msar.is_summary_cache_usable), its summaries are
+read from the cache rather than computed. Keys read from the cache are text, so they must be compared
+with the text of the fkey values (see msar.build_summary_join_expr_for_table).
+
+Args:
+  tab_id: The table for whose fkey values' linked records we'll get summaries.
+  cte_name: The name of the main CTE, giving the page of records of the table.
+*/
+WITH fkey_map_cte AS (SELECT * FROM msar.get_fkey_map_table(tab_id))
+SELECT ', '
   || NULLIF(
     concat_ws(', ',
-      'summary_cte_self AS (SELECT msar.format_data('
-        || quote_ident(msar.get_column_name(tab_id, msar.get_selectable_pkey_attnum(tab_id)))
-        || format(
-          ') AS key, %1$s AS summary FROM %2$I.%3$I)',
+      CASE
+      WHEN msar.get_selectable_pkey_attnum(tab_id) IS NULL THEN NULL
+      WHEN msar.is_summary_cache_usable(tab_id, msar.get_selectable_pkey_attnum(tab_id)) THEN
+        format(
+          $c$summary_cte_self AS (
+            SELECT key, summary FROM msar.summary_cache
+            WHERE tab_id = %1$L AND key = ANY(ARRAY(SELECT DISTINCT %2$I.%3$I::text FROM %2$I))
+          )$c$,
+          tab_id,
+          cte_name,
+          msar.get_selectable_pkey_attnum(tab_id)
+        )
+      ELSE
+        format(
+          $c$summary_cte_self AS (
+            SELECT msar.format_data(%1$I) AS key, %2$s AS summary
+            FROM %3$I.%4$I
+            WHERE msar.format_data(%1$I) = ANY(ARRAY(SELECT DISTINCT %5$I.%6$I FROM %5$I))
+          )$c$,
+          msar.get_column_name(tab_id, msar.get_selectable_pkey_attnum(tab_id)),
           msar.build_summary_expr(tab_id),
           msar.get_relation_schema_name(tab_id),
-          msar.get_relation_name(tab_id)
-        ),
+          msar.get_relation_name(tab_id),
+          cte_name,
+          msar.get_selectable_pkey_attnum(tab_id)
+        )
+      END,
       string_agg(
-        format(
-          $c$summary_cte_%1$s AS (
+        CASE WHEN msar.is_summary_cache_usable(target_oid, confkey) THEN
+          format(
+            $c$summary_cte_%1$s AS (
+            SELECT key AS fkey, summary FROM msar.summary_cache
+            WHERE tab_id = %2$L AND key = ANY(ARRAY(SELECT DISTINCT %3$I.%1$I::text FROM %3$I))
+          )$c$,
+            conkey,
+            target_oid,
+            cte_name
+          )
+        ELSE
+          format(
+            $c$summary_cte_%1$s AS (
             SELECT
               msar.format_data(%2$I) AS fkey,
               %3$s AS summary
             FROM %4$I.%5$I
+            WHERE msar.format_data(%2$I) = ANY(ARRAY(SELECT DISTINCT %6$I.%1$I FROM %6$I))
           )$c$,
-          conkey,
-          msar.get_column_name(target_oid, confkey),
-          msar.build_summary_expr(target_oid),
-          msar.get_relation_schema_name(target_oid),
-          msar.get_relation_name(target_oid)
-        ), ', '
+            conkey,
+            msar.get_column_name(target_oid, confkey),
+            msar.build_summary_expr(target_oid),
+            msar.get_relation_schema_name(target_oid),
+            msar.get_relation_name(target_oid),
+            cte_name
+          )
+        END, ', '
       )
     ),
     ''
@@ -4558,6 +5618,8 @@ CREATE OR REPLACE FUNCTION
 msar.build_summary_join_expr_for_table(tab_id oid, cte_name text) RETURNS TEXT AS $$/*
 Build an SQL expression to join the summary CTEs to the main CTE along fkey values.
 
+Values are compared as text when the summaries are read from the summary cache.
+
 Args:
   tab_oid: The table defining the columns of the main CTE.
   cte_name: The name of the main CTE we'll join the summary CTEs to.
@@ -4566,13 +5628,16 @@ WITH fkey_map_cte AS (SELECT * FROM msar.get_fkey_map_table(tab_id))
 SELECT concat(
   format(E'\nLEFT JOIN summary_cte_self ON %1$I.', cte_name)
   || quote_ident(msar.get_selectable_pkey_attnum(tab_id)::text)
+  || CASE WHEN msar.is_summary_cache_usable(tab_id, msar.get_selectable_pkey_attnum(tab_id))
+    THEN '::text' ELSE '' END
   || ' = summary_cte_self.key' ,
   string_agg(
     format(
       $j$
-      LEFT JOIN summary_cte_%1$s ON %2$I.%1$I = summary_cte_%1$s.fkey$j$,
+      LEFT JOIN summary_cte_%1$s ON %2$I.%1$I%3$s = summary_cte_%1$s.fkey$j$,
       conkey,
-      cte_name
+      cte_name,
+      CASE WHEN msar.is_summary_cache_usable(target_oid, confkey) THEN '::text' ELSE '' END
     ), ' '
   )
 )
@@ -4612,79 +5677,377 @@ $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
 CREATE OR REPLACE FUNCTION
-msar.list_records_from_table(
+msar.get_estimated_row_count(tab_id oid, filter_ jsonb) RETURNS bigint AS $$/*
+Get the planner's estimate of the number of rows of a table matching a filter, without scanning it.
+
+If no filter is given, we use `reltuples` from pg_class directly. Otherwise, we take the row
+estimate from the plan of a SELECT with the filter applied. Returns NULL if the table has never
+been vacuumed or analyzed, since no meaningful estimate is available in that case.
+
+Args:
+  tab_id: The OID of the table whose rows we'll count.
+  filter_: A filter definition object, or null.
+*/
+DECLARE
+  tab_reltuples real;
+  tab_relpages integer;
+  plan json;
+BEGIN
+  SELECT reltuples, relpages INTO tab_reltuples, tab_relpages
+  FROM pg_catalog.pg_class WHERE oid = tab_id;
+  -- reltuples is -1 for never-analyzed tables on PostgreSQL 14+, and 0 on earlier versions.
+  IF tab_reltuples < 0 OR (tab_reltuples = 0 AND tab_relpages = 0) THEN
+    RETURN NULL;
+  END IF;
+  IF filter_ IS NULL THEN
+    RETURN tab_reltuples::bigint;
+  END IF;
+  EXECUTE format(
+    'EXPLAIN (FORMAT JSON) SELECT 1 FROM %I.%I %s',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    msar.build_where_clause(tab_id, filter_)
+  ) INTO plan;
+  RETURN (plan -> 0 -> 'Plan' ->> 'Plan Rows')::bigint;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_count_cte_expr(
   tab_id oid,
-  limit_ integer,
-  offset_ integer,
+  filter_ jsonb,
+  count_mode text,
+  count_limit integer
+) RETURNS text AS $$/*
+Build the body of a CTE giving the count of rows in a table matching a filter, and how it's counted.
+
+The CTE has a single row with the columns `count` and `count_mode`. The count modes are:
+  exact: Count all rows matching the filter. This requires a scan of the table (or an index).
+  estimated: Use the planner's estimate of the number of matching rows. Falls back to `exact` if
+    the table has no statistics.
+  capped: Count matching rows, but stop at `count_limit`. The resulting `count_mode` is `capped`
+    if there are more than `count_limit` rows (and `count` is then `count_limit`), or `exact`
+    otherwise.
+  none: Don't count rows at all. The count will be NULL.
+
+Args:
+  tab_id: The OID of the table whose rows we'll count.
+  filter_: A filter definition object, or null.
+  count_mode: One of the count modes above. Defaults to `exact` if null.
+  count_limit: The maximum number of rows to count in `capped` mode. It must be at least 1.
+*/
+DECLARE
+  estimated_count bigint;
+BEGIN
+  CASE COALESCE(count_mode, 'exact')
+    WHEN 'exact' THEN
+      NULL;
+    WHEN 'none' THEN
+      RETURN 'SELECT NULL::bigint AS count, ''none'' AS count_mode';
+    WHEN 'estimated' THEN
+      estimated_count := msar.get_estimated_row_count(tab_id, filter_);
+      IF estimated_count IS NOT NULL THEN
+        RETURN format('SELECT %s::bigint AS count, ''estimated'' AS count_mode', estimated_count);
+      END IF;
+    WHEN 'capped' THEN
+      IF count_limit IS NULL OR count_limit < 1 THEN
+        RAISE EXCEPTION 'The count limit must be a positive integer in the capped count mode';
+      END IF;
+      RETURN format(
+        $c$
+        SELECT
+          least(count(1), %1$s) AS count,
+          CASE WHEN count(1) > %1$s THEN 'capped' ELSE 'exact' END AS count_mode
+        FROM (SELECT FROM %2$I.%3$I %4$s LIMIT %5$s) AS capped_cte
+        $c$,
+        count_limit,
+        msar.get_relation_schema_name(tab_id),
+        msar.get_relation_name(tab_id),
+        msar.build_where_clause(tab_id, filter_),
+        count_limit + 1
+      );
+    ELSE
+      RAISE EXCEPTION 'Unknown count mode: %', count_mode;
+  END CASE;
+  RETURN format(
+    'SELECT count(1) AS count, ''exact'' AS count_mode FROM %I.%I %s',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    msar.build_where_clause(tab_id, filter_)
+  );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_relation_catalog_version(tab_id oid) RETURNS text AS $$/*
+Return a fingerprint of the catalog state which queries built for listing a table's records depend on.
+
+The fingerprint changes whenever a DDL statement, privilege change, or role membership change could
+change the query built by `msar.build_list_records_query` for the table. It covers the table, the
+tables its foreign keys reference, their columns, constraints, triggers and schemas, whether their
+summaries are cached (see msar.is_summary_cache_usable), and role memberships.
+Since catalog rows are rewritten whenever they're modified, their `xmin` and `ctid` are enough to
+notice changes.
+
+Args:
+  tab_id: The OID of the table.
+*/
+WITH rels_cte AS (
+  SELECT tab_id AS rel_id
+  UNION SELECT confrelid FROM pg_catalog.pg_constraint WHERE conrelid = tab_id AND contype = 'f'
+)
+SELECT md5(string_agg(v, ',' ORDER BY v))
+FROM (
+  SELECT format('c%s:%s:%s:%s:%s', c.oid, c.xmin, c.ctid, n.xmin, n.ctid)
+  FROM rels_cte
+    JOIN pg_catalog.pg_class c ON c.oid = rel_id
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+  UNION ALL
+  SELECT format('a%s:%s:%s:%s', attrelid, attnum, xmin, ctid)
+  FROM rels_cte JOIN pg_catalog.pg_attribute ON attrelid = rel_id
+  WHERE attnum > 0
+  UNION ALL
+  SELECT format('k%s:%s:%s', oid, xmin, ctid)
+  FROM rels_cte JOIN pg_catalog.pg_constraint ON conrelid = rel_id
+  UNION ALL
+  SELECT format('t%s:%s:%s', oid, xmin, ctid)
+  FROM rels_cte JOIN pg_catalog.pg_trigger ON tgrelid = rel_id
+  UNION ALL
+  SELECT format('s%s:%s:%s', tab_id, xmin, ctid)
+  FROM rels_cte JOIN msar.summary_cache_tables ON tab_id = rel_id
+  UNION ALL
+  SELECT format('m%s:%s', count(1), max(xmin::text::bigint))
+  FROM pg_catalog.pg_auth_members
+) AS versions_cte(v);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_list_records_query(
+  tab_id oid,
+  limit_expr text,
+  offset_expr text,
   order_ jsonb,
   filter_ jsonb,
   group_ jsonb,
-  return_record_summaries boolean DEFAULT false
-) RETURNS jsonb AS $$/*
-Get records from a table. Only columns to which the user has access are returned.
+  return_record_summaries boolean DEFAULT false,
+  count_mode text DEFAULT 'exact',
+  count_limit integer DEFAULT null,
+  keyset_expr text DEFAULT null
+) RETURNS text AS $$/*
+Build a query returning a page of records from a table, as a single jsonb value.
 
 Args:
   tab_id: The OID of the table whose records we'll get
-  limit_: The maximum number of rows we'll return
-  offset_: The number of rows to skip before returning records from following rows.
+  limit_expr: An SQL expression giving the maximum number of rows to return.
+  offset_expr: An SQL expression giving the number of rows to skip.
   order_: An array of ordering definition objects.
   filter_: An array of filter definition objects.
   group_: An array of group definition objects.
   return_record_summaries : Whether to return a summary for each record listed.
+  count_mode: How to count the rows matching the filter. See msar.build_count_cte_expr.
+  count_limit: The maximum number of rows to count when count_mode is 'capped'.
+  keyset_expr: A condition restricting the rows to those after a cursor. See msar.build_keyset_expr.
 
-The order definition objects should have the form
-  {"attnum": <int>, "direction": <text>}
+The limit and offset are given as expressions so that they can be parameters (e.g., `$1`) of a
+prepared statement. Likewise, the filter may contain `param` nodes in place of literals. Apart from
+those parameters, the resulting query only depends on the arguments and the catalog state tracked by
+`msar.get_relation_catalog_version` (except in the `estimated` count mode, where the estimate is
+part of the query).
 */
 DECLARE
-  records jsonb;
+  where_clause text := msar.build_where_clause(tab_id, filter_);
 BEGIN
-  EXECUTE format(
+  IF keyset_expr IS NOT NULL THEN
+    where_clause := 'WHERE ' || concat_ws(
+      ' AND ', '(' || msar.build_expr(tab_id, filter_) || ')', keyset_expr
+    );
+  END IF;
+  RETURN format(
     $q$
     WITH count_cte AS (
-      SELECT count(1) AS count FROM %2$I.%3$I %7$s
+      %16$s
     ), enriched_results_cte AS (
-      SELECT %1$s, %8$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$L OFFSET %5$L
+      SELECT %1$s, %8$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$s OFFSET %5$s
     ), results_ranked_cte AS (
       SELECT *, row_number() OVER (%6$s) - 1 AS __mathesar_result_idx FROM enriched_results_cte
     ), groups_cte AS (
       SELECT %11$s
     )%12$s
-    SELECT jsonb_build_object(
-      'results', %9$s,
-      'count', coalesce(max(count_cte.count), 0),
-      'grouping', %10$s,
-      'linked_record_summaries', %14$s,
-      'record_summaries', %15$s,
-      'query', $iq$SELECT %1$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$L OFFSET %5$L$iq$
+    SELECT records || jsonb_build_object(
+      'next_cursor',
+      CASE WHEN jsonb_array_length(records -> 'results') = %4$s THEN
+        msar.encode_cursor(msar.get_cursor_values(%17$L, %18$L, records -> 'results' -> -1))
+      END
     )
-    FROM enriched_results_cte
-      LEFT JOIN groups_cte ON enriched_results_cte.__mathesar_gid = groups_cte.id %13$s
-      CROSS JOIN count_cte
+    FROM (
+      SELECT jsonb_build_object(
+        'results', %9$s,
+        'count', (SELECT count_cte.count FROM count_cte),
+        'count_mode', (SELECT count_cte.count_mode FROM count_cte),
+        'grouping', %10$s,
+        'linked_record_summaries', %14$s,
+        'record_summaries', %15$s,
+        'query', $iq$SELECT %1$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$s OFFSET %5$s$iq$
+      ) AS records
+      FROM enriched_results_cte
+        LEFT JOIN groups_cte ON enriched_results_cte.__mathesar_gid = groups_cte.id %13$s
+    ) AS records_cte
     $q$,
     msar.build_selectable_column_expr(tab_id),
     msar.get_relation_schema_name(tab_id),
     msar.get_relation_name(tab_id),
-    limit_,
-    offset_,
+    limit_expr,
+    offset_expr,
     msar.build_order_by_expr(tab_id, order_),
-    msar.build_where_clause(tab_id, filter_),
+    where_clause,
     msar.build_grouping_expr(tab_id, group_),
     msar.build_results_jsonb_expr(tab_id, 'enriched_results_cte', order_),
     COALESCE(msar.build_grouping_results_jsonb_expr(tab_id, 'groups_cte', group_), 'NULL'),
     COALESCE(msar.build_groups_cte_expr(tab_id, 'results_ranked_cte', group_), 'NULL AS id'),
-    msar.build_summary_cte_expr_for_table(tab_id),
+    msar.build_summary_cte_expr_for_table(tab_id, 'enriched_results_cte'),
     msar.build_summary_join_expr_for_table(tab_id, 'enriched_results_cte'),
     COALESCE(msar.build_summary_json_expr_for_table(tab_id), 'NULL'),
     COALESCE(
       CASE WHEN return_record_summaries THEN msar.build_self_summary_json_expr(tab_id) END,
       'NULL'
-    )
+    ),
+    msar.build_count_cte_expr(tab_id, filter_, count_mode, count_limit),
+    tab_id,
+    order_
+  );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+DROP FUNCTION IF EXISTS msar.list_records_from_table(oid, integer, integer, jsonb, jsonb, jsonb, boolean);
+DROP FUNCTION IF EXISTS msar.list_records_from_table(
+  oid, integer, integer, jsonb, jsonb, jsonb, boolean, text, integer
+);
+CREATE OR REPLACE FUNCTION
+msar.list_records_from_table(
+  tab_id oid,
+  limit_ integer,
+  offset_ integer,
+  order_ jsonb,
+  filter_ jsonb,
+  group_ jsonb,
+  return_record_summaries boolean DEFAULT false,
+  count_mode text DEFAULT 'exact',
+  count_limit integer DEFAULT null,
+  cursor_ text DEFAULT null
+) RETURNS jsonb AS $$/*
+Get records from a table. Only columns to which the user has access are returned.
+
+Args:
+  tab_id: The OID of the table whose records we'll get
+  limit_: The maximum number of rows we'll return
+  offset_: The number of rows to skip before returning records from following rows.
+  order_: An array of ordering definition objects.
+  filter_: An array of filter definition objects.
+  group_: An array of group definition objects.
+  return_record_summaries : Whether to return a summary for each record listed.
+  count_mode: How to count the rows matching the filter. See msar.build_count_cte_expr.
+  count_limit: The maximum number of rows to count when count_mode is 'capped'.
+  cursor_: A cursor from the `next_cursor` of a previous call. If given, only records after the
+    one the cursor points to (in the requested order) are returned.
+
+The order definition objects should have the form
+  {"attnum": <int>, "direction": <text>}
+
+When a full page of records is returned, `next_cursor` can be used to get the next page without
+having to skip over the rows of all previous pages.
+*/
+DECLARE
+  records jsonb;
+  keyset_expr text;
+BEGIN
+  IF cursor_ IS NOT NULL THEN
+    keyset_expr := msar.build_keyset_expr(
+      msar.build_keyset_keys(tab_id, order_, msar.decode_cursor(cursor_))
+    );
+  END IF;
+  EXECUTE msar.build_list_records_query(
+    tab_id,
+    quote_nullable(limit_),
+    quote_nullable(offset_),
+    order_,
+    filter_,
+    group_,
+    return_record_summaries,
+    count_mode,
+    count_limit,
+    keyset_expr
   ) INTO records;
   RETURN records;
 END;
 $$ LANGUAGE plpgsql STABLE;
 
 
+CREATE OR REPLACE FUNCTION
+msar.build_export_copy_expr(
+  tab_id oid,
+  order_ jsonb,
+  filter_ jsonb,
+  format_ text DEFAULT 'csv'
+) RETURNS text AS $$/*
+Build a COPY statement that streams the records of a table to the client.
+
+Only columns to which the user has access are exported. Columns are referred to by name rather
+than by attnum, and values are exported as stored rather than formatted for display. Records are
+filtered and (deterministically) ordered the same way as in `msar.list_records_from_table`.
+
+Args:
+  tab_id: The OID of the table whose records we'll export.
+  order_: An array of ordering definition objects.
+  filter_: An array of filter definition objects.
+  format_: Either 'csv' (with a header row), or 'jsonl' (a JSON object per line).
+*/
+DECLARE
+  column_names text[];
+  from_expr text;
+BEGIN
+  SELECT array_agg(quote_ident(attname) ORDER BY attnum) INTO column_names
+  FROM pg_catalog.pg_attribute
+  WHERE
+    attrelid = tab_id
+    AND attnum > 0
+    AND NOT attisdropped
+    AND has_column_privilege(attrelid, attnum, 'SELECT');
+  from_expr := concat_ws(
+    ' ',
+    format('FROM %I.%I', msar.get_relation_schema_name(tab_id), msar.get_relation_name(tab_id)),
+    msar.build_where_clause(tab_id, filter_),
+    'ORDER BY ' || (
+      SELECT string_agg(concat_ws(' ', quote_ident(key_ ->> 'attname'), key_ ->> 'direction'), ', ')
+      FROM jsonb_array_elements(msar.get_total_order_keys(tab_id, order_)) AS key_
+    )
+  );
+  CASE format_
+    WHEN 'csv' THEN
+      RETURN format(
+        'COPY (SELECT %s %s) TO STDOUT WITH (FORMAT csv, HEADER true)',
+        array_to_string(column_names, ', '),
+        from_expr
+      );
+    WHEN 'jsonl' THEN
+      -- The CSV format with unused quote and delimiter characters lets the JSON through verbatim,
+      -- whereas the text format would escape its backslashes.
+      RETURN format(
+        $c$COPY (SELECT row_to_json((SELECT r FROM (SELECT %s) AS r)) %s) TO STDOUT $c$
+        || $c$WITH (FORMAT csv, QUOTE E'\x01', DELIMITER E'\x02')$c$,
+        array_to_string(column_names, ', '),
+        from_expr
+      );
+    ELSE
+      RAISE EXCEPTION 'Unknown export format: %', format_;
+  END CASE;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
 CREATE OR REPLACE FUNCTION
 msar.get_score_expr(tab_id oid, parameters_ jsonb) RETURNS text AS $$
 SELECT string_agg(
@@ -4714,12 +6077,47 @@ WHERE
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_search_condition_expr(tab_id oid, parameters_ jsonb) RETURNS text AS $$/*
+Build a condition matching exactly the rows to which msar.get_score_expr gives a positive score.
+
+Unlike comparing the score with 0, this condition can use indexes: a pg_trgm GIN index (see
+msar.add_search_index) on each searched string column, and e.g. a B-tree index on other columns.
+
+Args:
+  tab_id: The OID of the table being searched.
+  parameters_: An array of search definition objects, as for msar.search_records_from_table.
+*/
+SELECT '(' || string_agg(
+  CASE WHEN pgt.typcategory = 'S' THEN
+    -- Any match scored by msar.get_score_expr is also a match for this pattern.
+    format('%1$I ILIKE %2$L', pga.attname, '%' || x.literal || '%')
+  ELSE
+    format('%1$I = %2$L', pga.attname, x.literal)
+  END,
+  ' OR '
+) || ')'
+FROM jsonb_to_recordset(parameters_) AS x(attnum smallint, literal text)
+  INNER JOIN pg_catalog.pg_attribute AS pga ON x.attnum = pga.attnum
+  INNER JOIN pg_catalog.pg_type AS pgt ON pga.atttypid = pgt.oid
+WHERE
+  pga.attrelid = tab_id
+  AND NOT pga.attisdropped
+  AND has_column_privilege(tab_id, x.attnum, 'SELECT')
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+DROP FUNCTION IF EXISTS msar.search_records_from_table(oid, jsonb, integer, boolean);
+DROP FUNCTION IF EXISTS msar.search_records_from_table(oid, jsonb, integer, boolean, text);
 CREATE OR REPLACE FUNCTION
 msar.search_records_from_table(
   tab_id oid,
   search_ jsonb,
   limit_ integer,
-  return_record_summaries boolean DEFAULT false
+  return_record_summaries boolean DEFAULT false,
+  cursor_ text DEFAULT null,
+  count_mode text DEFAULT 'exact',
+  use_search_indexes boolean DEFAULT false
 ) RETURNS jsonb AS $$/*
 Get records from a table, filtering and sorting according to a search specification.
 
@@ -4729,48 +6127,115 @@ Args:
   tab_id: The OID of the table whose records we'll get
   search_: An array of search definition objects.
   limit_: The maximum number of rows we'll return.
+  return_record_summaries : Whether to return a summary for each record listed.
+  cursor_: A cursor from the `next_cursor` of a previous call. If given, only records ranked after
+    the one the cursor points to are returned.
+  count_mode: Either 'exact' to count all matching records, or 'none' to skip counting them (the
+    count is then null).
+  use_search_indexes: Whether to filter records with a condition which can use indexes (see
+    msar.get_search_condition_expr), rather than by their score. The records found are the same,
+    but only the matching records are scored.
 
 The search definition objects should have the form
   {"attnum": <int>, "literal": <any>}
 */
 DECLARE
   records jsonb;
+  last_score integer;
+  score_expr text := msar.get_score_expr(tab_id, search_);
+  search_condition_expr text := CASE
+    WHEN use_search_indexes THEN msar.get_search_condition_expr(tab_id, search_)
+    ELSE score_expr || ' > 0'
+  END;
+  cursor_values jsonb;
+  keyset_keys jsonb;
+  where_clause text := 'WHERE ' || search_condition_expr;
 BEGIN
+  IF COALESCE(count_mode, 'exact') NOT IN ('exact', 'none') THEN
+    RAISE EXCEPTION 'Unsupported count mode for searching records: %', count_mode;
+  END IF;
+  IF cursor_ IS NOT NULL THEN
+    cursor_values := msar.decode_cursor(cursor_);
+    keyset_keys := COALESCE(msar.build_keyset_keys(tab_id, null, cursor_values), '[]'::jsonb);
+    IF score_expr IS NOT NULL THEN
+      keyset_keys := jsonb_build_array(
+        jsonb_strip_nulls(
+          jsonb_build_object(
+            'expr', score_expr,
+            'direction', 'DESC',
+            'not_null', true,
+            'value', cursor_values -> '__mathesar_score'
+          )
+        )
+      ) || keyset_keys;
+    END IF;
+    where_clause := 'WHERE ' || NULLIF(
+      concat_ws(' AND ', search_condition_expr, msar.build_keyset_expr(keyset_keys)), ''
+    );
+  END IF;
   EXECUTE format(
     $q$
     WITH count_cte AS (
-      SELECT count(1) AS count FROM %2$I.%3$I %4$s
+      %4$s
     ), results_cte AS (
-      SELECT %1$s FROM %2$I.%3$I %4$s ORDER BY %6$s LIMIT %5$L
+      SELECT %1$s, %12$s AS __mathesar_score FROM %2$I.%3$I %11$s ORDER BY %6$s LIMIT %5$L
     )%7$s
     SELECT jsonb_build_object(
-      'results', coalesce(jsonb_agg(row_to_json(results_cte.*)), jsonb_build_array()),
-      'count', coalesce(max(count_cte.count), 0),
+      'results', coalesce(
+        jsonb_agg(
+          to_jsonb(results_cte.*) - '__mathesar_score'
+          ORDER BY %13$s
+        ),
+        jsonb_build_array()
+      ),
+      'count', (SELECT count_cte.count FROM count_cte),
+      'count_mode', (SELECT count_cte.count_mode FROM count_cte),
       'linked_record_summaries', %9$s,
       'record_summaries', %10$s,
-      'query', $iq$SELECT %1$s FROM %2$I.%3$I %4$s ORDER BY %6$s LIMIT %5$L$iq$
-    )
+      'query', $iq$SELECT %1$s FROM %2$I.%3$I %11$s ORDER BY %6$s LIMIT %5$L$iq$
+    ), min(results_cte.__mathesar_score)
     FROM results_cte %8$s
-      CROSS JOIN count_cte
     $q$,
     msar.build_selectable_column_expr(tab_id),
     msar.get_relation_schema_name(tab_id),
     msar.get_relation_name(tab_id),
-    'WHERE ' || msar.get_score_expr(tab_id, search_) || ' > 0',
+    CASE WHEN count_mode = 'none' THEN
+      $c$SELECT NULL::bigint AS count, 'none' AS count_mode$c$
+    ELSE
+      format(
+        $c$SELECT count(1) AS count, 'exact' AS count_mode FROM %I.%I %s$c$,
+        msar.get_relation_schema_name(tab_id),
+        msar.get_relation_name(tab_id),
+        'WHERE ' || search_condition_expr
+      )
+    END,
     limit_,
     concat(
-      msar.get_score_expr(tab_id, search_) || ' DESC, ',
+      score_expr || ' DESC, ',
       msar.build_total_order_expr(tab_id, null)
     ),
-    msar.build_summary_cte_expr_for_table(tab_id),
+    msar.build_summary_cte_expr_for_table(tab_id, 'results_cte'),
     msar.build_summary_join_expr_for_table(tab_id, 'results_cte'),
     COALESCE(msar.build_summary_json_expr_for_table(tab_id), 'NULL'),
     COALESCE(
       CASE WHEN return_record_summaries THEN msar.build_self_summary_json_expr(tab_id) END,
       'NULL'
+    ),
+    where_clause,
+    COALESCE(score_expr, 'NULL::integer'),
+    concat_ws(
+      ', ', 'results_cte.__mathesar_score DESC', msar.build_total_order_expr(tab_id, null)
     )
-  ) INTO records;
-  RETURN records;
+  ) INTO records, last_score;
+  RETURN records || jsonb_build_object(
+    'next_cursor',
+    CASE WHEN jsonb_array_length(records -> 'results') = limit_ THEN
+      msar.encode_cursor(
+        msar.get_cursor_values(tab_id, null, records -> 'results' -> -1)
+        || jsonb_strip_nulls(jsonb_build_object('__mathesar_score', last_score))
+      )
+    END
+  );
 END;
 $$ LANGUAGE plpgsql;
 
@@ -4811,7 +6276,8 @@ Args:
   tab_id: The OID of the table whose record we'll delete.
   rec_ids: An array of primary key values
 
-The table must have a single primary key column.
+The table must have a single primary key column. The values are cast to the type of that column, so
+the primary key index can be used to find the records.
 */
 DECLARE
   num_deleted integer;
@@ -4825,13 +6291,9 @@ BEGIN
     msar.get_relation_name(tab_id),
     msar.build_where_clause(
       tab_id, jsonb_build_object(
-        'type', 'element_in_json_array_untyped', 'args', jsonb_build_array(
-          jsonb_build_object(
-            'type', 'format_data', 'args', jsonb_build_array(
-              jsonb_build_object('type', 'attnum', 'value', msar.get_pk_column(tab_id))
-            )
-          ),
-          jsonb_build_object('type', 'literal', 'value', rec_ids)
+        'type', 'element_in_array', 'args', jsonb_build_array(
+          jsonb_build_object('type', 'attnum', 'value', msar.get_pk_column(tab_id)),
+          jsonb_build_object('type', 'literal_array', 'value', rec_ids)
         )
       )
     )
@@ -4841,6 +6303,44 @@ END;
 $$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.delete_records_where(tab_id oid, filter_ jsonb, dry_run boolean DEFAULT false) RETURNS integer AS $$/*
+Delete all records of a table matching a filter, with a single statement.
+
+Args:
+  tab_id: The OID of the table whose records we'll delete.
+  filter_: A JSON object defining a filter expression, as for `msar.list_records_from_table`.
+  dry_run: If true, only count the records which would be deleted.
+
+Returns the number of records deleted (or which would be deleted).
+*/
+DECLARE
+  where_clause text;
+  num_deleted integer;
+BEGIN
+  IF filter_ IS NULL OR jsonb_typeof(filter_) = 'null' THEN
+    RAISE EXCEPTION 'A filter is required to delete records';
+  END IF;
+  -- A filter we can't build (e.g., `{}`, or an unknown type) results in a NULL clause, which would
+  -- otherwise be formatted as an empty string, deleting every record.
+  where_clause := msar.build_where_clause(tab_id, filter_);
+  IF where_clause IS NULL THEN
+    RAISE EXCEPTION 'Invalid filter: %', filter_;
+  END IF;
+  EXECUTE format(
+    CASE WHEN dry_run
+      THEN 'SELECT count(1) FROM %1$I.%2$I %3$s'
+      ELSE 'WITH delete_cte AS (DELETE FROM %1$I.%2$I %3$s RETURNING 1) SELECT count(1) FROM delete_cte'
+    END,
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    where_clause
+  ) INTO num_deleted;
+  RETURN num_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION
 msar.build_single_insert_expr(tab_id oid, rec_def jsonb) RETURNS TEXT AS $$
 SELECT
@@ -4892,6 +6392,216 @@ END;
 $$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_records_by_pkeys(
+  tab_id oid,
+  rec_ids jsonb,
+  return_record_summaries boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Get the records of a table with the given primary key values, in the order of those values.
+
+Primary key values which aren't in the table are skipped.
+
+Args:
+  tab_id: The OID of the table whose records we'll get.
+  rec_ids: A JSON array of primary key values, formatted as by `msar.format_data`.
+  return_record_summaries: Whether to return a summary for each record.
+
+The table must have a single primary key column.
+*/
+WITH records_cte AS (
+  SELECT msar.list_records_from_table(
+    tab_id, null, null, null,
+    jsonb_build_object(
+      'type', 'element_in_array', 'args', jsonb_build_array(
+        jsonb_build_object('type', 'attnum', 'value', msar.get_pk_column(tab_id)),
+        jsonb_build_object('type', 'literal_array', 'value', rec_ids)
+      )
+    ),
+    null,
+    return_record_summaries
+  ) AS recs
+)
+SELECT jsonb_build_object(
+  'results', (
+    SELECT COALESCE(jsonb_agg(rec ORDER BY x.ordinality), '[]'::jsonb)
+    FROM jsonb_array_elements_text(rec_ids) WITH ORDINALITY AS x(id, ordinality)
+      INNER JOIN jsonb_array_elements(recs -> 'results') AS rec
+      ON rec ->> msar.get_pk_column(tab_id)::text = x.id
+  ),
+  'record_summaries', recs -> 'record_summaries',
+  'linked_record_summaries', recs -> 'linked_record_summaries'
+)
+FROM records_cte;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_multi_insert_expr(
+  tab_id oid,
+  rec_defs jsonb,
+  attnums smallint[],
+  on_conflict text
+) RETURNS TEXT AS $$/*
+Build a query inserting records sharing a set of keys, returning their primary key values in order.
+
+The records are read with `jsonb_to_recordset`, so each batch of records results in a single
+INSERT statement. Values are read as text and cast to the column type, in the same way as
+`msar.build_single_insert_expr` does. The query returns a JSONB array of the
+formatted primary key values of the records, as text, in the same order as `rec_defs`.
+
+When the records don't define the primary key, its default is evaluated for each record before
+inserting, so that the ids are read from the input rows in order, rather than relying on the order
+of the rows returned by the INSERT, which Postgres doesn't guarantee.
+
+Args:
+  tab_id: The OID of the table where we'll insert records.
+  rec_defs: A JSON array of record definition objects, all having the keys given by `attnums`.
+  attnums: The attnums of the columns defined by the records, in ascending order.
+  on_conflict: What to do when the primary key of a record is already in the table. One of
+    'error', 'ignore' (keep the existing record) or 'update' (overwrite the given columns of the
+    existing record). Only relevant when the records define the primary key.
+*/
+WITH col_cte AS (
+  SELECT attnum, attname, format_type(atttypid, atttypmod) AS type_name
+  FROM pg_catalog.pg_attribute
+  WHERE attrelid = tab_id AND attnum = ANY(attnums) AND NOT attisdropped
+), pk_cte AS (
+  SELECT
+    attnum,
+    attname,
+    format_type(atttypid, atttypmod) AS type_name,
+    attnum = ANY(attnums) AS is_supplied,
+    CASE
+      WHEN attidentity <> '' THEN
+        format('nextval(%L::regclass)', pg_get_serial_sequence(tab_id::regclass::text, attname))
+      ELSE COALESCE(pg_get_expr(adbin, adrelid), 'NULL')
+    END AS default_expr
+  FROM pg_catalog.pg_attribute
+    LEFT JOIN pg_catalog.pg_attrdef ON attrelid = adrelid AND attnum = adnum
+  WHERE attrelid = tab_id AND attnum = msar.get_pk_column(tab_id)
+)
+SELECT format(
+  $i$
+  WITH input_cte AS MATERIALIZED (
+    SELECT *%4$s FROM %1$s
+  ), insert_cte AS (
+    INSERT INTO %2$I.%3$I (%5$s) %6$s SELECT %7$s FROM input_cte ORDER BY ordinality %8$s
+  )
+  SELECT jsonb_agg(msar.format_data(%9$I::%10$s)::text ORDER BY ordinality) FROM input_cte
+  $i$,
+  CASE WHEN count(col_cte.attnum) > 0 THEN
+    format(
+      'ROWS FROM (jsonb_to_recordset(%L) AS (%s)) WITH ORDINALITY AS x',
+      rec_defs,
+      string_agg(format('%I text', col_cte.attnum), ', ' ORDER BY col_cte.attnum)
+    )
+  ELSE
+    format('jsonb_array_elements(%L) WITH ORDINALITY AS x', rec_defs)
+  END,
+  msar.get_relation_schema_name(tab_id),
+  msar.get_relation_name(tab_id),
+  CASE WHEN NOT pk_cte.is_supplied THEN
+    format(', %s::%s AS %I', pk_cte.default_expr, pk_cte.type_name, pk_cte.attnum)
+  END,
+  concat_ws(
+    ', ',
+    string_agg(quote_ident(col_cte.attname), ', ' ORDER BY col_cte.attnum),
+    CASE WHEN NOT pk_cte.is_supplied THEN quote_ident(pk_cte.attname) END
+  ),
+  CASE WHEN NOT pk_cte.is_supplied THEN 'OVERRIDING SYSTEM VALUE' END,
+  concat_ws(
+    ', ',
+    string_agg(format('%I::%s', col_cte.attnum, col_cte.type_name), ', ' ORDER BY col_cte.attnum),
+    CASE WHEN NOT pk_cte.is_supplied THEN quote_ident(pk_cte.attnum::text) END
+  ),
+  CASE
+    WHEN NOT pk_cte.is_supplied OR COALESCE(on_conflict, 'error') = 'error' THEN
+      NULL
+    WHEN on_conflict = 'ignore' OR count(col_cte.attnum) = 1 THEN
+      format('ON CONFLICT (%I) DO NOTHING', pk_cte.attname)
+    WHEN on_conflict = 'update' THEN
+      format(
+        'ON CONFLICT (%I) DO UPDATE SET %s',
+        pk_cte.attname,
+        string_agg(format('%1$I = EXCLUDED.%1$I', col_cte.attname), ', ' ORDER BY col_cte.attnum)
+          FILTER (WHERE col_cte.attnum <> pk_cte.attnum)
+      )
+  END,
+  pk_cte.attnum::text,
+  pk_cte.type_name
+)
+FROM pk_cte LEFT JOIN col_cte ON true
+GROUP BY pk_cte.attnum, pk_cte.attname, pk_cte.type_name, pk_cte.is_supplied, pk_cte.default_expr;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.add_records_to_table(
+  tab_id oid,
+  rec_defs jsonb,
+  on_conflict text DEFAULT 'error',
+  return_record_summaries boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Add a number of records to a table.
+
+Records defining the same set of columns are inserted together, in a single statement. Missing keys
+use the column defaults, as in `msar.add_record_to_table`.
+
+Args:
+  tab_id: The OID of the table where we'll add the records.
+  rec_defs: A JSON array of record definition objects.
+  on_conflict: What to do with records whose primary key is already in the table. One of 'error',
+    'ignore', or 'update'. See `msar.build_multi_insert_expr`.
+  return_record_summaries: Whether to return a summary for each record added.
+
+The form of the objects in `rec_defs` is as for `msar.add_record_to_table`. The resulting records
+are returned in the same order as `rec_defs`. The table must have a single primary key column.
+*/
+DECLARE
+  rec_batch record;
+  batch_ids jsonb;
+  rec_ids jsonb := '[]'::jsonb;
+BEGIN
+  IF on_conflict NOT IN ('error', 'ignore', 'update') THEN
+    RAISE EXCEPTION 'Unknown on_conflict action: %', on_conflict;
+  END IF;
+  FOR rec_batch IN
+    SELECT jsonb_agg(rec ORDER BY ord) AS recs, array_agg(ord ORDER BY ord) AS ords, attnums
+    FROM (
+      SELECT
+        rec,
+        ord,
+        ARRAY(SELECT k::smallint FROM jsonb_object_keys(rec) AS k ORDER BY k::smallint) AS attnums
+      FROM jsonb_array_elements(rec_defs) WITH ORDINALITY AS x(rec, ord)
+    ) AS recs_cte
+    GROUP BY attnums
+    ORDER BY min(ord)
+  LOOP
+    EXECUTE msar.build_multi_insert_expr(tab_id, rec_batch.recs, rec_batch.attnums, on_conflict)
+      INTO batch_ids;
+    rec_ids := rec_ids || COALESCE(
+      (
+        SELECT jsonb_agg(jsonb_build_object('ord', u.ord, 'id', u.id))
+        FROM unnest(
+          rec_batch.ords, ARRAY(SELECT jsonb_array_elements_text(batch_ids))
+        ) AS u(ord, id)
+      ),
+      '[]'::jsonb
+    );
+  END LOOP;
+  RETURN msar.get_records_by_pkeys(
+    tab_id,
+    (
+      SELECT COALESCE(jsonb_agg(rec_id -> 'id' ORDER BY (rec_id ->> 'ord')::integer), '[]'::jsonb)
+      FROM jsonb_array_elements(rec_ids) AS rec_id
+    ),
+    return_record_summaries
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION
 msar.build_update_expr(tab_id oid, rec_def jsonb) RETURNS TEXT AS $$
 SELECT
@@ -4954,3 +6664,191 @@ BEGIN
   );
 END;
 $$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_multi_update_expr(tab_id oid, rec_patches jsonb, attnums smallint[]) RETURNS TEXT AS $$/*
+Build a query applying patches which set the same columns to a number of records.
+
+The query returns a JSONB array of objects of the form {"ord": <int>, "id": <text>}, giving the
+formatted primary key value of each patched record after the patch (which may have changed it),
+along with the `__mathesar_ord` of the patch applied to it.
+
+Args:
+  tab_id: The OID of the table whose records we'll patch.
+  rec_patches: A JSON array of patch objects. Each has keys given by `attnums`, along with a
+    `__mathesar_id` key giving the primary key value of the record to patch, and a
+    `__mathesar_ord` key giving the position of the patch in the input.
+  attnums: The attnums of the columns set by the patches.
+*/
+WITH col_cte AS (
+  SELECT attnum, attname, format_type(atttypid, atttypmod) AS type_name
+  FROM pg_catalog.pg_attribute
+  WHERE attrelid = tab_id AND attnum = ANY(attnums) AND NOT attisdropped
+), pk_cte AS (
+  SELECT attname, format_type(atttypid, atttypmod) AS type_name
+  FROM pg_catalog.pg_attribute
+  WHERE attrelid = tab_id AND attnum = msar.get_pk_column(tab_id)
+)
+SELECT format(
+  $u$
+  WITH update_cte AS (
+    UPDATE %1$I.%2$I SET (%3$s) = ROW(%4$s)
+    FROM jsonb_to_recordset(%5$L)
+      AS __mathesar_patch(__mathesar_id text, __mathesar_ord integer, %6$s)
+    WHERE %2$I.%7$I = __mathesar_patch.__mathesar_id::%8$s
+    RETURNING __mathesar_patch.__mathesar_ord, msar.format_data(%2$I.%7$I)::text AS __mathesar_id
+  )
+  SELECT jsonb_agg(jsonb_build_object('ord', __mathesar_ord, 'id', __mathesar_id)) FROM update_cte
+  $u$,
+  msar.get_relation_schema_name(tab_id),
+  msar.get_relation_name(tab_id),
+  string_agg(quote_ident(attname), ', ' ORDER BY attnum),
+  string_agg(format('__mathesar_patch.%I::%s', attnum, type_name), ', ' ORDER BY attnum),
+  rec_patches,
+  string_agg(format('%I text', attnum), ', ' ORDER BY attnum),
+  (SELECT attname FROM pk_cte),
+  (SELECT type_name FROM pk_cte)
+)
+FROM col_cte;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.patch_records_in_table(
+  tab_id oid,
+  rec_patches jsonb,
+  return_record_summaries boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Modify (update/patch) a number of records in a table.
+
+Patches setting the same columns are applied together, in a single UPDATE statement. These
+statements are run in the order of the first patch of each in `rec_patches`. Each record may only
+be patched once, so that it's clear which patch applies to it.
+
+Args:
+  tab_id: The OID of the table whose records we'll patch.
+  rec_patches: A JSON array of objects of the form
+    {"record_id": <primary key value>, "record_def": <object defining the patch>}
+  return_record_summaries: Whether to return a summary for each record patched.
+
+The form of each `record_def` is as for `msar.patch_record_in_table`. The patched records are
+returned in the same order as `rec_patches`, with their primary key values after patching. Only
+tables with a single primary key column are supported.
+*/
+DECLARE
+  pk_type text := (
+    SELECT format_type(atttypid, atttypmod) FROM pg_catalog.pg_attribute
+    WHERE attrelid = tab_id AND attnum = msar.get_pk_column(tab_id)
+  );
+  has_duplicates boolean;
+  patch_batch record;
+  batch_ids jsonb;
+  -- Records with empty patches aren't updated, so they keep their primary key values.
+  rec_ids jsonb;
+BEGIN
+  EXECUTE format(
+    $q$
+    WITH patch_cte AS (
+      SELECT rec_patch ->> 'record_id' AS id, rec_patch -> 'record_def' AS rec_def, ord
+      FROM jsonb_array_elements($1) WITH ORDINALITY AS x(rec_patch, ord)
+    )
+    SELECT
+      EXISTS (SELECT 1 FROM patch_cte GROUP BY id::%1$s HAVING count(1) > 1),
+      (
+        SELECT COALESCE(
+          jsonb_agg(jsonb_build_object('ord', ord, 'id', msar.format_data(id::%1$s)::text)),
+          '[]'::jsonb
+        )
+        FROM patch_cte
+        WHERE COALESCE(rec_def, '{}'::jsonb) = '{}'::jsonb
+      )
+    $q$,
+    pk_type
+  ) INTO has_duplicates, rec_ids USING rec_patches;
+  IF has_duplicates THEN
+    RAISE EXCEPTION 'A record can only be patched once per call';
+  END IF;
+  FOR patch_batch IN
+    SELECT
+      jsonb_agg(
+        (rec_patch -> 'record_def') || jsonb_build_object(
+          '__mathesar_id', rec_patch -> 'record_id', '__mathesar_ord', ord
+        )
+      ) AS patches,
+      attnums
+    FROM (
+      SELECT
+        rec_patch,
+        ord,
+        ARRAY(
+          SELECT k::smallint FROM jsonb_object_keys(rec_patch -> 'record_def') AS k ORDER BY k::smallint
+        ) AS attnums
+      FROM jsonb_array_elements(rec_patches) WITH ORDINALITY AS x(rec_patch, ord)
+    ) AS patches_cte
+    WHERE cardinality(attnums) > 0
+    GROUP BY attnums
+    ORDER BY min(ord)
+  LOOP
+    EXECUTE msar.build_multi_update_expr(tab_id, patch_batch.patches, patch_batch.attnums)
+      INTO batch_ids;
+    rec_ids := rec_ids || COALESCE(batch_ids, '[]'::jsonb);
+  END LOOP;
+  RETURN msar.get_records_by_pkeys(
+    tab_id,
+    (
+      SELECT COALESCE(jsonb_agg(rec_id -> 'id' ORDER BY (rec_id ->> 'ord')::integer), '[]'::jsonb)
+      FROM jsonb_array_elements(rec_ids) AS rec_id
+    ),
+    return_record_summaries
+  );
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.update_records_where(
+  tab_id oid,
+  filter_ jsonb,
+  rec_def jsonb,
+  dry_run boolean DEFAULT false
+) RETURNS integer AS $$/*
+Set the same values for all records of a table matching a filter, with a single statement.
+
+Args:
+  tab_id: The OID of the table whose records we'll update.
+  filter_: A JSON object defining a filter expression, as for `msar.list_records_from_table`.
+  rec_def: A JSON object defining the values to set, as for `msar.patch_record_in_table`.
+  dry_run: If true, only count the records which would be updated.
+
+Returns the number of records updated (or which would be updated).
+*/
+DECLARE
+  where_clause text;
+  num_updated integer;
+BEGIN
+  IF filter_ IS NULL OR jsonb_typeof(filter_) = 'null' THEN
+    RAISE EXCEPTION 'A filter is required to update records';
+  END IF;
+  -- As in `msar.delete_records_where`, a NULL clause would update every record.
+  where_clause := msar.build_where_clause(tab_id, filter_);
+  IF where_clause IS NULL THEN
+    RAISE EXCEPTION 'Invalid filter: %', filter_;
+  END IF;
+  IF dry_run OR rec_def IS NULL OR rec_def = '{}'::jsonb THEN
+    EXECUTE format(
+      'SELECT count(1) FROM %I.%I %s',
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id),
+      where_clause
+    ) INTO num_updated;
+  ELSE
+    EXECUTE format(
+      'WITH update_cte AS (%s %s RETURNING 1) SELECT count(1) FROM update_cte',
+      msar.build_update_expr(tab_id, rec_def),
+      where_clause
+    ) INTO num_updated;
+  END IF;
+  RETURN num_updated;
+END;
+$$ LANGUAGE plpgsql;
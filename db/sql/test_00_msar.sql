@@ -1467,6 +1467,137 @@ END;
 $f$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_infer_table_column_data_types_single_pass() RETURNS SETOF TEXT AS $f$
+BEGIN
+  PERFORM __setup_type_inference();
+  RETURN NEXT is(
+    msar.infer_table_column_data_types_single_pass('"Types Test"'::regclass),
+    msar.infer_table_column_data_types('"Types Test"'::regclass)
+  );
+  RETURN NEXT is(
+    msar.infer_table_column_data_types_single_pass('"Types Test"'::regclass, sample_percent => 100),
+    msar.infer_table_column_data_types('"Types Test"'::regclass)
+  );
+  INSERT INTO "Types Test" ("Numeric") VALUES ('not a number');
+  RETURN NEXT is(
+    msar.infer_table_column_data_types_single_pass('"Types Test"'::regclass) -> '5',
+    '"text"'::jsonb
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_suggest_table_column_data_types() RETURNS SETOF TEXT AS $f$
+DECLARE
+  suggestions jsonb;
+BEGIN
+  PERFORM __setup_type_inference();
+  suggestions := msar.suggest_table_column_data_types('"Types Test"'::regclass);
+  RETURN NEXT is(suggestions -> 'types', msar.infer_table_column_data_types('"Types Test"'::regclass));
+  RETURN NEXT is(suggestions - 'types', '{"sampled_rows": 4, "total_rows": 4, "confidence": 1}'::jsonb);
+  RETURN NEXT is(
+    (SELECT reltuples FROM pg_catalog.pg_class WHERE oid = '"Types Test"'::regclass),
+    -1::real,
+    'Reading the whole table needs no statistics'
+  );
+  RETURN NEXT is(
+    msar.suggest_table_column_data_types('"Types Test"'::regclass, sample_size => 10) - 'types',
+    '{"sampled_rows": 4, "total_rows": 4, "confidence": 1}'::jsonb,
+    'A sample as big as the table reads the whole table'
+  );
+  RETURN NEXT is(
+    msar.suggest_table_column_data_types('"Types Test"'::regclass, sample_size => 2) - 'types',
+    '{"sampled_rows": 2, "total_rows": 4, "confidence": 0.5}'::jsonb,
+    'A table without statistics is analyzed before it is sampled'
+  );
+  RETURN NEXT is(
+    (SELECT reltuples FROM pg_catalog.pg_class WHERE oid = '"Types Test"'::regclass),
+    4::real
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_is_castable() RETURNS SETOF TEXT AS $f$
+BEGIN
+  RETURN NEXT is(msar.is_castable('3.14', 'numeric'), true);
+  RETURN NEXT is(msar.is_castable('cat', 'numeric'), false);
+  RETURN NEXT is(msar.is_castable('2000-01-01', 'date'), true);
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_all_castable() RETURNS SETOF TEXT AS $f$
+BEGIN
+  RETURN NEXT is(msar.all_castable(ARRAY['3.14', '-2', '1e3'], 'numeric'), true);
+  RETURN NEXT is(msar.all_castable(ARRAY['3.14', 'cat', '1e3'], 'numeric'), false);
+  RETURN NEXT is(msar.all_castable(ARRAY[]::text[], 'date'), true);
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_suggest_table_column_data_types_cast_statements() RETURNS SETOF TEXT AS $f$
+/*
+The number of cast statements (and so, of subtransactions) needed to infer the types of a table
+must depend on the number of columns, candidate types and batches, but not on the number of values.
+A candidate which fails for a batch mustn't be tried again for later batches.
+*/
+DECLARE
+  num_candidates integer := cardinality(msar.get_type_inference_sequence());
+BEGIN
+  SET LOCAL track_functions = 'pl';
+  CREATE TABLE wide_text_table (
+    id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    nums text,
+    words text,
+    dates text
+  );
+  INSERT INTO wide_text_table (nums, words, dates)
+  SELECT x::text, 'word ' || x, '2000-01-01'::date + x
+  FROM generate_series(1, 5000) AS x;
+  RETURN NEXT is(
+    msar.suggest_table_column_data_types('wide_text_table'::regclass) -> 'types',
+    msar.infer_table_column_data_types('wide_text_table'::regclass)
+  );
+  RETURN NEXT cmp_ok(
+    (
+      SELECT calls FROM pg_catalog.pg_stat_xact_user_functions
+      WHERE funcid = 'msar.all_castable(text[], regtype)'::regprocedure
+    ),
+    '<=',
+    3::bigint * num_candidates
+  );
+  RETURN NEXT is_empty(
+    $q$
+    SELECT 1 FROM pg_catalog.pg_stat_xact_user_functions
+    WHERE funcid = 'msar.is_castable(text, regtype)'::regprocedure
+    $q$
+  );
+  -- Values which only fail in a later batch are still caught.
+  UPDATE wide_text_table SET nums = 'not a number' WHERE id = 4999;
+  RETURN NEXT is(
+    msar.suggest_table_column_data_types('wide_text_table'::regclass, batch_rows => 1000) -> 'types',
+    msar.infer_table_column_data_types('wide_text_table'::regclass)
+  );
+  RETURN NEXT is(
+    msar.suggest_table_column_data_types(
+      'wide_text_table'::regclass, batch_rows => 1000
+    ) -> 'types' -> '2',
+    '"text"'::jsonb
+  );
+  -- The words fail every candidate in the first batch, and are never cast again.
+  RETURN NEXT cmp_ok(
+    (
+      SELECT calls FROM pg_catalog.pg_stat_xact_user_functions
+      WHERE funcid = 'msar.all_castable(text[], regtype)'::regprocedure
+    ),
+    '<=',
+    3::bigint * num_candidates + 2 * (2 * 5 * num_candidates + num_candidates)
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
 -- msar.add_mathesar_table
 
 CREATE OR REPLACE FUNCTION __setup_create_table() RETURNS SETOF TEXT AS $f$
@@ -1613,6 +1744,36 @@ END;
 $f$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_prepare_temp_table_for_import_preview() RETURNS SETOF TEXT AS $f$
+DECLARE
+  col_defs jsonb := $j$[
+    {"name": "name", "type": {"name": "text"}},
+    {"name": "Item Count", "type": {"name": "text"}}
+  ]$j$;
+  import_info jsonb;
+BEGIN
+  import_info := msar.prepare_temp_table_for_import_preview(col_defs);
+  RETURN NEXT is(
+    import_info ->> 'copy_sql',
+    'COPY pg_temp.msar_import_preview (name, "Item Count") FROM STDIN CSV'
+  );
+  RETURN NEXT is(
+    import_info -> 'columns',
+    '[{"id": 2, "name": "name"}, {"id": 3, "name": "Item Count"}]'::jsonb,
+    'columns should have the attnums of an imported table'
+  );
+  RETURN NEXT is(
+    (SELECT relpersistence FROM pg_class WHERE oid = (import_info ->> 'table_oid')::oid),
+    't'::"char",
+    'preview table should be temporary'
+  );
+  -- The table can be prepared again, e.g. for a second preview in the same transaction.
+  INSERT INTO pg_temp.msar_import_preview (name) VALUES ('a');
+  import_info := msar.prepare_temp_table_for_import_preview(col_defs);
+  RETURN NEXT is((SELECT count(*) FROM pg_temp.msar_import_preview), 0::bigint);
+END;
+$f$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION test_add_mathesar_table_comment() RETURNS SETOF TEXT AS $f$
 DECLARE
   comment_ text := $c$my "Super;";'; DROP SCHEMA tab_create_schema;'$c$;
@@ -1717,6 +1878,31 @@ END;
 $f$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_alter_columns_type_uncastable() RETURNS SETOF TEXT AS $f$
+DECLARE
+  col_alters_jsonb jsonb := $j$[
+    {"attnum": 3, "type": {"name": "integer"}},
+    {"attnum": 4, "type": {"name": "integer"}}
+  ]$j$;
+BEGIN
+  PERFORM __setup_column_alter();
+  INSERT INTO col_alters (col1, col2, "Col sp") VALUES ('a', 1, '12'), ('b', 2, 'x1'), ('c', 3, null);
+  RETURN NEXT is(
+    msar.find_uncastable_value('col_alters'::regclass::oid, col_alters_jsonb),
+    '{"attnum": 4, "value": "x1", "type": "integer"}'::jsonb
+  );
+  RETURN NEXT is(
+    msar.find_uncastable_value('col_alters'::regclass::oid, '[{"attnum": 3, "type": {"name": "integer"}}]'),
+    null
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.alter_columns(%s, %L)', 'col_alters'::regclass::oid, col_alters_jsonb)
+  );
+  RETURN NEXT col_type_is('col_alters', 'col2', 'numeric');
+END;
+$f$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_alter_columns_type_options() RETURNS SETOF TEXT AS $f$
 DECLARE
   col_alters_jsonb jsonb := $j$[
@@ -2784,6 +2970,30 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_get_listing_catalog_version() RETURNS SETOF TEXT AS $$
+DECLARE
+  version_1 text;
+  version_2 text;
+  version_3 text;
+BEGIN
+  version_1 := msar.get_listing_catalog_version();
+  RETURN NEXT is(msar.get_listing_catalog_version(), version_1);
+  CREATE SCHEMA foo;
+  version_2 := msar.get_listing_catalog_version();
+  RETURN NEXT isnt(version_2, version_1, 'Creating a schema changes the version');
+  CREATE TABLE foo.test_table (id serial PRIMARY KEY);
+  version_3 := msar.get_listing_catalog_version();
+  RETURN NEXT isnt(version_3, version_2, 'Creating a table changes the version');
+  INSERT INTO foo.test_table DEFAULT VALUES;
+  RETURN NEXT is(msar.get_listing_catalog_version(), version_3, 'DML keeps the version');
+  COMMENT ON TABLE foo.test_table IS 'A test table';
+  RETURN NEXT isnt(
+    msar.get_listing_catalog_version(), version_3, 'Commenting on a table changes the version'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_list_schemas() RETURNS SETOF TEXT AS $$
 DECLARE
   initial_schema_count int;
@@ -3101,6 +3311,8 @@ BEGIN
     ),
     $j${
       "count": 3,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [
         {"1": 1, "2": 5, "3": "sdflkj", "4": "s", "5": {"a": "val"}},
         {"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]},
@@ -3129,6 +3341,7 @@ BEGIN
     ),
     $j${
       "count": 3,
+      "count_mode": "exact",
       "results": [
         {"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]},
         {"1": 1, "2": 5, "3": "sdflkj", "4": "s", "5": {"a": "val"}}
@@ -3142,7 +3355,8 @@ BEGIN
         ' msar.format_data(col2) AS "3", msar.format_data(col3) AS "4",'
         ' msar.format_data(col4) AS "5" FROM public.atable'
         '  ORDER BY "2" DESC, "1" ASC LIMIT ''2'' OFFSET NULL'
-      )
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 1, "2": 5}')
     )
   );
   RETURN NEXT is(
@@ -3156,6 +3370,8 @@ BEGIN
     ),
     $j${
       "count": 3,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [
         {"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]},
         {"1": 1, "2": 5, "3": "sdflkj", "4": "s", "5": {"a": "val"}}
@@ -3188,6 +3404,8 @@ BEGIN
     ),
     $j${
       "count": 3,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [
         {"2": 2, "3": "abcde", "4": {"k": 3242348}, "5": true},
         {"2": 5, "3": "sdflkj", "4": "s", "5": {"a": "val"}},
@@ -3215,6 +3433,8 @@ BEGIN
     ),
     $j${
       "count": 3,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [
         {"2": 5, "3": "sdflkj", "4": "s", "5": {"a": "val"}},
         {"2": 34, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]},
@@ -3235,92 +3455,589 @@ END;
 $$ LANGUAGE plpgsql;
 
 
-CREATE OR REPLACE FUNCTION test_list_records_with_grouping() RETURNS SETOF TEXT AS $$
+CREATE OR REPLACE FUNCTION test_list_records_count_modes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  list_result jsonb;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  list_result := msar.list_records_from_table(
+    rel_id, 1, null, null, null, null, count_mode => 'none'
+  );
+  RETURN NEXT is(list_result -> 'count', 'null'::jsonb);
+  RETURN NEXT is(list_result ->> 'count_mode', 'none');
+  RETURN NEXT is(jsonb_array_length(list_result -> 'results'), 1);
+  list_result := msar.list_records_from_table(
+    rel_id, 1, null, null, null, null, count_mode => 'capped', count_limit => 2
+  );
+  RETURN NEXT is(list_result -> 'count', '2'::jsonb);
+  RETURN NEXT is(list_result ->> 'count_mode', 'capped');
+  list_result := msar.list_records_from_table(
+    rel_id, 1, null, null, null, null, count_mode => 'capped', count_limit => 3
+  );
+  RETURN NEXT is(list_result -> 'count', '3'::jsonb);
+  RETURN NEXT is(list_result ->> 'count_mode', 'exact');
+  list_result := msar.list_records_from_table(
+    rel_id, 1, null, null,
+    '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]}',
+    null,
+    count_mode => 'capped',
+    count_limit => 5
+  );
+  RETURN NEXT is(list_result -> 'count', '2'::jsonb);
+  RETURN NEXT is(list_result ->> 'count_mode', 'exact');
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.list_records_from_table(%s, 1, null, null, null, null, count_mode => ''capped'')',
+      rel_id
+    ),
+    'P0001',
+    'The count limit must be a positive integer in the capped count mode'
+  );
+  RETURN NEXT throws_ok(
+    format(
+      $q$SELECT msar.list_records_from_table(
+        %s, 1, null, null, null, null, count_mode => 'capped', count_limit => -1
+      )$q$,
+      rel_id
+    ),
+    'P0001',
+    'The count limit must be a positive integer in the capped count mode'
+  );
+  -- Without statistics, the estimate falls back to an exact count.
+  list_result := msar.list_records_from_table(
+    rel_id, 1, null, null, null, null, count_mode => 'estimated'
+  );
+  RETURN NEXT is(list_result -> 'count', '3'::jsonb);
+  RETURN NEXT is(list_result ->> 'count_mode', 'exact');
+  ANALYZE atable;
+  list_result := msar.list_records_from_table(
+    rel_id, 1, null, null, null, null, count_mode => 'estimated'
+  );
+  RETURN NEXT is(list_result -> 'count', '3'::jsonb);
+  RETURN NEXT is(list_result ->> 'count_mode', 'estimated');
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.list_records_from_table(%s, 1, null, null, null, null, count_mode => ''nope'')',
+      rel_id
+    ),
+    'P0001',
+    'Unknown count mode: nope'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION __page_through_records(
+  tab_id oid, limit_ integer, order_ jsonb, filter_ jsonb
+) RETURNS jsonb AS $$
+DECLARE
+  list_result jsonb;
+  results jsonb := '[]'::jsonb;
+  cursor_ text;
+BEGIN
+  LOOP
+    list_result := msar.list_records_from_table(
+      tab_id, limit_, null, order_, filter_, null, cursor_ => cursor_
+    );
+    results := results || (list_result -> 'results');
+    cursor_ := list_result ->> 'next_cursor';
+    EXIT WHEN cursor_ IS NULL;
+  END LOOP;
+  RETURN results;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_build_list_records_query_with_params() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  param_result jsonb;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  EXECUTE format(
+    'PREPARE list_atable AS %s',
+    msar.build_list_records_query(
+      rel_id, '$1', '$2', '[{"attnum": 2, "direction": "desc"}]',
+      '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "param", "value": 3}]}',
+      null
+    )
+  );
+  EXECUTE 'EXECUTE list_atable(1, 0, ''10'')' INTO param_result;
+  RETURN NEXT is(
+    param_result - 'query',
+    msar.list_records_from_table(
+      rel_id, 1, 0, '[{"attnum": 2, "direction": "desc"}]',
+      '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]}',
+      null
+    ) - 'query'
+  );
+  RETURN NEXT is(param_result -> 'results' -> 0 ->> '1', '1');
+  RETURN NEXT is(param_result -> 'count', '2'::jsonb);
+  EXECUTE 'EXECUTE list_atable(5, 0, ''3'')' INTO param_result;
+  RETURN NEXT is(jsonb_path_query_array(param_result, '$.results[*]."1"'), '[3]'::jsonb);
+  RETURN NEXT is(param_result -> 'next_cursor', 'null'::jsonb);
+  DEALLOCATE list_atable;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION __parameterize_filter(
+  filter_ jsonb,
+  params text[],
+  OUT param_filter jsonb,
+  OUT all_params text[]
+) AS $$/*
+Replace the literals of a filter with `param` nodes, as `query_cache.parameterize_filter` does.
+*/
+DECLARE
+  arg jsonb;
+  param_arg jsonb;
+  param_args jsonb := '[]';
+BEGIN
+  all_params := params;
+  IF filter_ ->> 'type' = 'literal' THEN
+    all_params := all_params || (filter_ ->> 'value');
+    param_filter := jsonb_build_object('type', 'param', 'value', cardinality(all_params));
+  ELSIF filter_ ? 'args' THEN
+    FOR arg IN SELECT jsonb_array_elements(filter_ -> 'args') LOOP
+      SELECT p.param_filter, p.all_params INTO param_arg, all_params
+      FROM __parameterize_filter(arg, all_params) AS p;
+      param_args := param_args || jsonb_build_array(param_arg);
+    END LOOP;
+    param_filter := filter_ || jsonb_build_object('args', param_args);
+  ELSE
+    param_filter := filter_;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION __list_records_from_table_prepared(
+  tab_id oid,
+  limit_ integer,
+  offset_ integer,
+  order_ jsonb,
+  filter_ jsonb
+) RETURNS jsonb AS $$/*
+List records as the prepared statement path of `records.list` does.
+*/
+DECLARE
+  param_filter jsonb;
+  params text[];
+  records jsonb;
+BEGIN
+  SELECT p.param_filter, p.all_params INTO param_filter, params
+  FROM __parameterize_filter(filter_, ARRAY[limit_, offset_]::text[]) AS p;
+  EXECUTE format(
+    'PREPARE list_records_prepared AS %s',
+    msar.build_list_records_query(tab_id, '$1', '$2', order_, param_filter, null)
+  );
+  EXECUTE format(
+    'EXECUTE list_records_prepared(%s)',
+    (SELECT string_agg(quote_nullable(p), ', ' ORDER BY i) FROM unnest(params) WITH ORDINALITY AS x(p, i))
+  ) INTO records;
+  DEALLOCATE list_records_prepared;
+  RETURN records;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_prepared_parity() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  order_ jsonb := '[{"attnum": 1, "direction": "asc"}]';
+  test_case record;
+BEGIN
+  CREATE TABLE parity_table (
+    id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    num integer,
+    txt text,
+    dat date,
+    js jsonb
+  );
+  INSERT INTO parity_table (num, txt, dat, js) VALUES
+    (5, 'Apple pie', '2020-03-21', '[1, 2]'),
+    (34, 'apple', '2021-04-13', '["a"]'),
+    (2, 'it''s 100% banana', null, '[]'),
+    (null, null, '2020-03-02', null);
+  rel_id := 'parity_table'::regclass::oid;
+  FOR test_case IN
+    SELECT family, filter_ FROM (VALUES
+      ('comparison', '{"type": "equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 5}]}'),
+      ('comparison', '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 5}]}'),
+      ('comparison', '{"type": "greater", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": "5"}]}'),
+      ('comparison', '{"type": "lesser_or_equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 5}]}'),
+      ('comparison', '{"type": "greater_or_equal", "args": [{"type": "attnum", "value": 4}, {"type": "literal", "value": "2020-03-21"}]}'),
+      ('comparison', '{"type": "null", "args": [{"type": "attnum", "value": 2}]}'),
+      ('comparison', '{"type": "not_null", "args": [{"type": "attnum", "value": 4}]}'),
+      ('composition', $f${
+        "type": "and",
+        "args": [
+          {"type": "greater", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 1}]},
+          {"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 30}]}
+        ]
+      }$f$),
+      ('composition', $f${
+        "type": "or",
+        "args": [
+          {"type": "equal", "args": [{"type": "attnum", "value": 3}, {"type": "literal", "value": "apple"}]},
+          {"type": "null", "args": [{"type": "attnum", "value": 4}]}
+        ]
+      }$f$),
+      ('string', '{"type": "contains_case_insensitive", "args": [{"type": "attnum", "value": 3}, {"type": "literal", "value": "APPLE"}]}'),
+      ('string', '{"type": "starts_with_case_insensitive", "args": [{"type": "attnum", "value": 3}, {"type": "literal", "value": "It"}]}'),
+      ('string', $f${"type": "contains", "args": [{"type": "attnum", "value": 3}, {"type": "literal", "value": "'s 100%"}]}$f$),
+      ('string', '{"type": "starts_with", "args": [{"type": "attnum", "value": 3}, {"type": "literal", "value": "app"}]}'),
+      ('json', $f${
+        "type": "greater",
+        "args": [
+          {"type": "json_array_length", "args": [{"type": "attnum", "value": 5}]},
+          {"type": "literal", "value": 0}
+        ]
+      }$f$),
+      ('json', $f${"type": "json_array_contains", "args": [{"type": "attnum", "value": 5}, {"type": "literal", "value": "[\"a\"]"}]}$f$),
+      ('json', $f${
+        "type": "element_in_json_array_untyped",
+        "args": [{"type": "literal", "value": 2}, {"type": "attnum", "value": 5}]
+      }$f$),
+      ('date part', $f${
+        "type": "equal",
+        "args": [
+          {"type": "truncate_to_year", "args": [{"type": "attnum", "value": 4}]},
+          {"type": "literal", "value": "2020 AD"}
+        ]
+      }$f$),
+      ('date part', $f${
+        "type": "equal",
+        "args": [
+          {"type": "truncate_to_month", "args": [{"type": "attnum", "value": 4}]},
+          {"type": "literal", "value": "2020-03 AD"}
+        ]
+      }$f$),
+      ('date part', $f${
+        "type": "equal",
+        "args": [
+          {"type": "truncate_to_day", "args": [{"type": "attnum", "value": 4}]},
+          {"type": "literal", "value": "2021-04-13 AD"}
+        ]
+      }$f$),
+      ('format_data', $f${
+        "type": "equal",
+        "args": [
+          {"type": "format_data", "args": [{"type": "attnum", "value": 4}]},
+          {"type": "literal", "value": "2020-03-02 AD"}
+        ]
+      }$f$)
+    ) AS cases(family, filter_)
+  LOOP
+    RETURN NEXT is(
+      __list_records_from_table_prepared(rel_id, 10, 0, order_, test_case.filter_::jsonb) - 'query',
+      msar.list_records_from_table(rel_id, 10, 0, order_, test_case.filter_::jsonb, null) - 'query',
+      format('Prepared and literal %s filters agree: %s', test_case.family, test_case.filter_)
+    );
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_get_relation_catalog_version() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  version_1 text;
+  version_2 text;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  version_1 := msar.get_relation_catalog_version(rel_id);
+  RETURN NEXT is(msar.get_relation_catalog_version(rel_id), version_1);
+  INSERT INTO atable (col1) VALUES (99);
+  RETURN NEXT is(msar.get_relation_catalog_version(rel_id), version_1, 'DML keeps the version');
+  ALTER TABLE atable RENAME COLUMN col1 TO col1_renamed;
+  version_2 := msar.get_relation_catalog_version(rel_id);
+  RETURN NEXT isnt(version_2, version_1, 'Renaming a column changes the version');
+  CREATE ROLE catalog_version_role;
+  GRANT SELECT (col2) ON atable TO catalog_version_role;
+  RETURN NEXT isnt(
+    msar.get_relation_catalog_version(rel_id), version_2, 'Granting privileges changes the version'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_with_cursor() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
+  list_result jsonb;
 BEGIN
   PERFORM __setup_customers_table();
   rel_id := '"Customers"'::regclass::oid;
+  list_result := msar.list_records_from_table(rel_id, 10, null, null, null, null);
   RETURN NEXT is(
     msar.list_records_from_table(
-      tab_id => rel_id,
-      limit_ => 10,
-      offset_ => null,
-      order_ => '[{"attnum": 3, "direction": "asc"}, {"attnum": 2, "direction": "asc"}]',
-      filter_ => null,
-      group_ => '{"columns": [3, 2]}'
-    ),
-    $j${
-      "count": 21,
-      "results": [
-        {"1": 5, "2": "Abigail", "3": "Abbott", "4": "2020-07-05 AD"},
-        {"1": 8, "2": "Abigail", "3": "Abbott", "4": "2020-10-30 AD"},
-        {"1": 15, "2": "Abigail", "3": "Abbott", "4": "2021-11-30 AD"},
-        {"1": 18, "2": "Abigail", "3": "Abbott", "4": "2022-03-23 AD"},
-        {"1": 20, "2": "Abigail", "3": "Abbott", "4": "2022-04-29 AD"},
-        {"1": 7, "2": "Aaron", "3": "Acevedo", "4": "2020-10-29 AD"},
-        {"1": 16, "2": "Aaron", "3": "Acevedo", "4": "2022-02-04 AD"},
-        {"1": 10, "2": "Abigail", "3": "Acevedo", "4": "2021-03-29 AD"},
-        {"1": 11, "2": "Aaron", "3": "Acosta", "4": "2021-04-13 AD"},
-        {"1": 2, "2": "Abigail", "3": "Acosta", "4": "2020-04-16 AD"}
-      ],
-      "grouping": {
-        "columns": [3, 2],
-        "preproc": null,
-        "groups": [
-          {
-            "id": 1,
-            "count": 5,
-            "results_eq": {"2": "Abigail", "3": "Abbott"},
-            "result_indices": [0, 1, 2, 3, 4]
-          },
-          {
-            "id": 2,
-            "count": 2,
-            "results_eq": {"2": "Aaron", "3": "Acevedo"},
-            "result_indices": [5, 6]
-          },
-          {
-            "id": 3,
-            "count": 1,
-            "results_eq": {"2": "Abigail", "3": "Acevedo"},
-            "result_indices": [7]
-          },
-          {
-            "id": 4,
-            "count": 1,
-            "results_eq": {"2": "Aaron", "3": "Acosta"},
-            "result_indices": [8]
-          },
-          {
-            "id": 5,
-            "count": 1,
-            "results_eq": {"2": "Abigail", "3": "Acosta"},
-            "result_indices": [9]
-          }
-        ]
-      },
-      "linked_record_summaries": null,
-      "record_summaries": null
-    }$j$ || jsonb_build_object(
-      'query', concat(
-        'SELECT msar.format_data(id) AS "1", msar.format_data("First Name") AS "2",'
-        ' msar.format_data("Last Name") AS "3", msar.format_data("Subscription Date") AS "4"'
-        ' FROM public."Customers"  ORDER BY "3" ASC, "2" ASC, "1" ASC LIMIT ''10'' OFFSET NULL'
+      rel_id, 10, null, null, null, null, cursor_ => list_result ->> 'next_cursor'
+    ) - 'next_cursor',
+    msar.list_records_from_table(rel_id, 10, 10, null, null, null) - 'next_cursor' - 'query'
+      || jsonb_build_object(
+        'query', concat(
+          'SELECT msar.format_data(id) AS "1", msar.format_data("First Name") AS "2",'
+          ' msar.format_data("Last Name") AS "3", msar.format_data("Subscription Date") AS "4"'
+          ' FROM public."Customers" WHERE (msar.format_data(id)) > (''10'') ORDER BY "1" ASC'
+          ' LIMIT ''10'' OFFSET NULL'
+        )
       )
-    )
   );
   RETURN NEXT is(
+    __page_through_records(rel_id, 4, null, null),
+    msar.list_records_from_table(rel_id, null, null, null, null, null) -> 'results'
+  );
+  RETURN NEXT is(
+    __page_through_records(
+      rel_id, 4, '[{"attnum": 3, "direction": "asc"}, {"attnum": 2, "direction": "desc"}]', null
+    ),
     msar.list_records_from_table(
-      tab_id => rel_id,
-      limit_ => 3,
-      offset_ => null,
+      rel_id, null, null,
+      '[{"attnum": 3, "direction": "asc"}, {"attnum": 2, "direction": "desc"}]', null, null
+    ) -> 'results'
+  );
+  RETURN NEXT is(
+    __page_through_records(
+      rel_id, 3, null,
+      '{"type": "equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": "Abigail"}]}'
+    ),
+    msar.list_records_from_table(
+      rel_id, null, null, null,
+      '{"type": "equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": "Abigail"}]}',
+      null
+    ) -> 'results'
+  );
+  -- The count isn't affected by the cursor.
+  list_result := msar.list_records_from_table(
+    rel_id, 10, null, null, null, null, cursor_ => list_result ->> 'next_cursor'
+  );
+  RETURN NEXT is(list_result -> 'count', '21'::jsonb);
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.list_records_from_table(%s, 10, null, %L, null, null, cursor_ => %L)',
+      rel_id, '[{"attnum": 3, "direction": "asc"}]', list_result ->> 'next_cursor'
+    ),
+    'P0001',
+    'The cursor does not match the requested ordering'
+  );
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.list_records_from_table(%s, 10, null, null, null, null, cursor_ => %L)',
+      rel_id, 'notacursor'
+    ),
+    'P0001',
+    'Invalid cursor: notacursor'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_with_cursor_and_nulls() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  CREATE TABLE cursor_table (id integer PRIMARY KEY, val integer);
+  INSERT INTO cursor_table VALUES (1, 3), (2, null), (3, 1), (4, null), (5, 3), (6, 2);
+  rel_id := 'cursor_table'::regclass::oid;
+  RETURN NEXT is(
+    __page_through_records(rel_id, 2, '[{"attnum": 2, "direction": "asc"}]', null),
+    '[
+      {"1": 3, "2": 1}, {"1": 6, "2": 2}, {"1": 1, "2": 3},
+      {"1": 5, "2": 3}, {"1": 2, "2": null}, {"1": 4, "2": null}
+    ]'::jsonb
+  );
+  RETURN NEXT is(
+    __page_through_records(rel_id, 2, '[{"attnum": 2, "direction": "desc"}]', null),
+    '[
+      {"1": 2, "2": null}, {"1": 4, "2": null}, {"1": 1, "2": 3},
+      {"1": 5, "2": 3}, {"1": 6, "2": 2}, {"1": 3, "2": 1}
+    ]'::jsonb
+  );
+  RETURN NEXT is(
+    __page_through_records(rel_id, 4, '[{"attnum": 1, "direction": "desc"}]', null),
+    '[
+      {"1": 6, "2": 2}, {"1": 5, "2": 3}, {"1": 4, "2": null},
+      {"1": 3, "2": 1}, {"1": 2, "2": null}, {"1": 1, "2": 3}
+    ]'::jsonb
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_build_export_copy_expr() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.build_export_copy_expr(rel_id, null, null),
+    'COPY (SELECT id, col1, col2, col3, col4 FROM public.atable ORDER BY id ASC)'
+    ' TO STDOUT WITH (FORMAT csv, HEADER true)'
+  );
+  RETURN NEXT is(
+    msar.build_export_copy_expr(
+      rel_id,
+      '[{"attnum": 2, "direction": "desc"}]',
+      '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]}',
+      'csv'
+    ),
+    'COPY (SELECT id, col1, col2, col3, col4 FROM public.atable WHERE (col1) < (''10'')'
+    ' ORDER BY col1 DESC, id ASC) TO STDOUT WITH (FORMAT csv, HEADER true)'
+  );
+  RETURN NEXT is(
+    msar.build_export_copy_expr(rel_id, null, null, 'jsonl'),
+    'COPY (SELECT row_to_json((SELECT r FROM (SELECT id, col1, col2, col3, col4) AS r))'
+    ' FROM public.atable ORDER BY id ASC) TO STDOUT'
+    ' WITH (FORMAT csv, QUOTE E''\x01'', DELIMITER E''\x02'')'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.build_export_copy_expr(%s, null, null, ''xml'')', rel_id),
+    'P0001',
+    'Unknown export format: xml'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_build_keyset_expr() RETURNS SETOF TEXT AS $$
+BEGIN
+  RETURN NEXT is(
+    msar.build_keyset_expr(
+      '[
+        {"expr": "a", "direction": "ASC", "not_null": true, "value": 1},
+        {"expr": "b", "direction": "ASC", "not_null": true, "value": "x"}
+      ]'
+    ),
+    '(a, b) > (''1'', ''x'')'
+  );
+  RETURN NEXT is(
+    msar.build_keyset_expr(
+      '[
+        {"expr": "a", "direction": "DESC", "not_null": false, "value": 1},
+        {"expr": "b", "direction": "ASC", "not_null": true, "value": "x"}
+      ]'
+    ),
+    '(a < ''1'' OR a = ''1'' AND b > ''x'')'
+  );
+  RETURN NEXT is(
+    msar.build_keyset_expr(
+      '[
+        {"expr": "a", "direction": "ASC", "not_null": false, "value": 1},
+        {"expr": "b", "direction": "ASC", "not_null": true, "value": "x"}
+      ]'
+    ),
+    '((a > ''1'' OR a IS NULL) OR a = ''1'' AND b > ''x'')'
+  );
+  RETURN NEXT is(
+    msar.build_keyset_expr(
+      '[
+        {"expr": "a", "direction": "ASC", "not_null": false, "value": null},
+        {"expr": "b", "direction": "ASC", "not_null": true, "value": "x"}
+      ]'
+    ),
+    '(false OR a IS NULL AND b > ''x'')'
+  );
+  RETURN NEXT is(msar.build_keyset_expr('[]'), null);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_with_grouping() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_customers_table();
+  rel_id := '"Customers"'::regclass::oid;
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 10,
+      offset_ => null,
       order_ => '[{"attnum": 3, "direction": "asc"}, {"attnum": 2, "direction": "asc"}]',
       filter_ => null,
       group_ => '{"columns": [3, 2]}'
     ),
     $j${
       "count": 21,
+      "count_mode": "exact",
+      "results": [
+        {"1": 5, "2": "Abigail", "3": "Abbott", "4": "2020-07-05 AD"},
+        {"1": 8, "2": "Abigail", "3": "Abbott", "4": "2020-10-30 AD"},
+        {"1": 15, "2": "Abigail", "3": "Abbott", "4": "2021-11-30 AD"},
+        {"1": 18, "2": "Abigail", "3": "Abbott", "4": "2022-03-23 AD"},
+        {"1": 20, "2": "Abigail", "3": "Abbott", "4": "2022-04-29 AD"},
+        {"1": 7, "2": "Aaron", "3": "Acevedo", "4": "2020-10-29 AD"},
+        {"1": 16, "2": "Aaron", "3": "Acevedo", "4": "2022-02-04 AD"},
+        {"1": 10, "2": "Abigail", "3": "Acevedo", "4": "2021-03-29 AD"},
+        {"1": 11, "2": "Aaron", "3": "Acosta", "4": "2021-04-13 AD"},
+        {"1": 2, "2": "Abigail", "3": "Acosta", "4": "2020-04-16 AD"}
+      ],
+      "grouping": {
+        "columns": [3, 2],
+        "preproc": null,
+        "groups": [
+          {
+            "id": 1,
+            "count": 5,
+            "results_eq": {"2": "Abigail", "3": "Abbott"},
+            "result_indices": [0, 1, 2, 3, 4]
+          },
+          {
+            "id": 2,
+            "count": 2,
+            "results_eq": {"2": "Aaron", "3": "Acevedo"},
+            "result_indices": [5, 6]
+          },
+          {
+            "id": 3,
+            "count": 1,
+            "results_eq": {"2": "Abigail", "3": "Acevedo"},
+            "result_indices": [7]
+          },
+          {
+            "id": 4,
+            "count": 1,
+            "results_eq": {"2": "Aaron", "3": "Acosta"},
+            "result_indices": [8]
+          },
+          {
+            "id": 5,
+            "count": 1,
+            "results_eq": {"2": "Abigail", "3": "Acosta"},
+            "result_indices": [9]
+          }
+        ]
+      },
+      "linked_record_summaries": null,
+      "record_summaries": null
+    }$j$ || jsonb_build_object(
+      'query', concat(
+        'SELECT msar.format_data(id) AS "1", msar.format_data("First Name") AS "2",'
+        ' msar.format_data("Last Name") AS "3", msar.format_data("Subscription Date") AS "4"'
+        ' FROM public."Customers"  ORDER BY "3" ASC, "2" ASC, "1" ASC LIMIT ''10'' OFFSET NULL'
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 2, "2": "Abigail", "3": "Acosta"}')
+    )
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 3,
+      offset_ => null,
+      order_ => '[{"attnum": 3, "direction": "asc"}, {"attnum": 2, "direction": "asc"}]',
+      filter_ => null,
+      group_ => '{"columns": [3, 2]}'
+    ),
+    $j${
+      "count": 21,
+      "count_mode": "exact",
       "results": [
         {"1": 5, "2": "Abigail", "3": "Abbott", "4": "2020-07-05 AD"},
         {"1": 8, "2": "Abigail", "3": "Abbott", "4": "2020-10-30 AD"},
@@ -3345,7 +4062,8 @@ BEGIN
         'SELECT msar.format_data(id) AS "1", msar.format_data("First Name") AS "2",'
         ' msar.format_data("Last Name") AS "3", msar.format_data("Subscription Date") AS "4"'
         ' FROM public."Customers"  ORDER BY "3" ASC, "2" ASC, "1" ASC LIMIT ''3'' OFFSET NULL'
-      )
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 15, "2": "Abigail", "3": "Abbott"}')
     )
   );
   RETURN NEXT is(
@@ -3359,6 +4077,7 @@ BEGIN
     ),
     $j${
       "count": 21,
+      "count_mode": "exact",
       "results": [
         {"1": 1, "2": "Aaron", "3": "Adams", "4": "2020-03-21 AD"},
         {"1": 2, "2": "Abigail", "3": "Acosta", "4": "2020-04-16 AD"},
@@ -3379,7 +4098,8 @@ BEGIN
         'SELECT msar.format_data(id) AS "1", msar.format_data("First Name") AS "2",'
         ' msar.format_data("Last Name") AS "3", msar.format_data("Subscription Date") AS "4"'
         ' FROM public."Customers"  ORDER BY "4" ASC, "1" ASC LIMIT ''3'' OFFSET NULL'
-      )
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 3, "4": "2020-04-29 AD"}')
     )
   );
   RETURN NEXT is(
@@ -3393,6 +4113,7 @@ BEGIN
     ),
     $j${
       "count": 21,
+      "count_mode": "exact",
       "results": [
         {"1": 1, "2": "Aaron", "3": "Adams", "4": "2020-03-21 AD"},
         {"1": 2, "2": "Abigail", "3": "Acosta", "4": "2020-04-16 AD"},
@@ -3414,7 +4135,8 @@ BEGIN
         'SELECT msar.format_data(id) AS "1", msar.format_data("First Name") AS "2",'
         ' msar.format_data("Last Name") AS "3", msar.format_data("Subscription Date") AS "4"'
         ' FROM public."Customers"  ORDER BY "4" ASC, "1" ASC LIMIT ''5'' OFFSET NULL'
-      )
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 5, "4": "2020-07-05 AD"}')
     )
   );
 END;
@@ -3438,6 +4160,8 @@ BEGIN
     ),
     $j${
      "count": 6,
+     "count_mode": "exact",
+     "next_cursor": null,
      "results": [
         {"1": 1, "2": "Tools", "3": null},
         {"1": 2, "2": "Power tools", "3": 1},
@@ -3794,6 +4518,72 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_build_expr_element_in_array() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.build_expr(
+      rel_id,
+      jsonb_build_object(
+        'type', 'element_in_array', 'args', jsonb_build_array(
+          jsonb_build_object('type', 'attnum', 'value', 1),
+          jsonb_build_object('type', 'literal_array', 'value', '[1, "2", "a,b"]'::jsonb)))),
+    '(id) = ANY(''{1,2,"a,b"}'')'
+  );
+  RETURN NEXT results_eq(
+    format(
+      'SELECT id FROM atable WHERE %s ORDER BY id',
+      msar.build_expr(
+        rel_id,
+        jsonb_build_object(
+          'type', 'element_in_array', 'args', jsonb_build_array(
+            jsonb_build_object('type', 'attnum', 'value', 1),
+            jsonb_build_object('type', 'literal_array', 'value', '[3, "1"]'::jsonb))))
+    ),
+    'VALUES (1), (3)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_element_in_array_uses_pkey_index() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  query_plan json;
+BEGIN
+  CREATE TABLE bigtable (id integer PRIMARY KEY, val text);
+  INSERT INTO bigtable SELECT x, 'val' || x FROM generate_series(1, 100000) AS x;
+  ANALYZE bigtable;
+  rel_id := 'bigtable'::regclass::oid;
+  EXECUTE format(
+    'EXPLAIN (FORMAT JSON) DELETE FROM bigtable %s',
+    msar.build_where_clause(
+      rel_id,
+      jsonb_build_object(
+        'type', 'element_in_array', 'args', jsonb_build_array(
+          jsonb_build_object('type', 'attnum', 'value', 1),
+          jsonb_build_object(
+            'type', 'literal_array', 'value', (SELECT jsonb_agg(x) FROM generate_series(1, 10000, 7) AS x)
+          )
+        )
+      )
+    )
+  ) INTO query_plan;
+  RETURN NEXT ok(
+    query_plan::text LIKE '%"Index Name": "bigtable_pkey"%',
+    'Deleting by a list of primary keys uses the primary key index'
+  );
+  RETURN NEXT is(
+    msar.delete_records_from_table(rel_id, (SELECT jsonb_agg(x) FROM generate_series(1, 10000, 7) AS x)),
+    1429
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 -- msar.search_records_from_table ------------------------------------------------------------------
 
 CREATE OR REPLACE FUNCTION __setup_search_records_table() RETURNS SETOF TEXT AS $$
@@ -3951,6 +4741,131 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_search_records_using_search_indexes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  search_ jsonb;
+  search_result jsonb;
+BEGIN
+  PERFORM __setup_search_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.get_search_condition_expr(
+      rel_id,
+      jsonb_build_array(
+        jsonb_build_object('attnum', 3, 'literal', 'b'),
+        jsonb_build_object('attnum', 2, 'literal', 1)
+      )
+    ),
+    $c$(col2 ILIKE '%b%' OR col1 = '1')$c$
+  );
+  -- The records found are the same as when filtering by score.
+  FOREACH search_ IN ARRAY ARRAY[
+    jsonb_build_array(jsonb_build_object('attnum', 3, 'literal', 'a')),
+    jsonb_build_array(
+      jsonb_build_object('attnum', 3, 'literal', 'b'),
+      jsonb_build_object('attnum', 2, 'literal', 1)
+    ),
+    jsonb_build_array(jsonb_build_object('attnum', 2, 'literal', 3)),
+    jsonb_build_array()
+  ] LOOP
+    RETURN NEXT is(
+      msar.search_records_from_table(rel_id, search_, 10, use_search_indexes => true) - 'query',
+      msar.search_records_from_table(rel_id, search_, 10) - 'query'
+    );
+  END LOOP;
+  search_result := msar.search_records_from_table(
+    rel_id,
+    jsonb_build_array(jsonb_build_object('attnum', 3, 'literal', 'a')),
+    10,
+    count_mode => 'none',
+    use_search_indexes => true
+  );
+  RETURN NEXT is(jsonb_array_length(search_result -> 'results'), 3);
+  RETURN NEXT is(search_result -> 'count', 'null'::jsonb);
+  RETURN NEXT is(search_result ->> 'count_mode', 'none');
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.search_records_from_table(%s, %L, 10, count_mode => %L)',
+      rel_id, jsonb_build_array(), 'estimated'
+    ),
+    'P0001',
+    'Unsupported count mode for searching records: estimated'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_search_indexes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_search_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(msar.list_search_indexes(rel_id), '[]'::jsonb);
+  RETURN NEXT is(
+    msar.add_search_index(rel_id, 3),
+    '[{"attnum": 3, "name": "atable_col2_idx"}]'::jsonb
+  );
+  -- Adding a second index for the same column does nothing.
+  RETURN NEXT is(
+    msar.add_search_index(rel_id, 3),
+    '[{"attnum": 3, "name": "atable_col2_idx"}]'::jsonb
+  );
+  -- Other indexes on the column aren't search indexes.
+  CREATE INDEX ON atable (col2);
+  RETURN NEXT is(
+    msar.list_search_indexes(rel_id),
+    '[{"attnum": 3, "name": "atable_col2_idx"}]'::jsonb
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.add_search_index(%s, 2)', rel_id),
+    'P0001',
+    'Search indexes can only be added to string columns'
+  );
+  RETURN NEXT is(msar.drop_search_index(rel_id, 3), '[]'::jsonb);
+  RETURN NEXT has_index('atable', 'atable_col2_idx1');
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION test_search_records_with_cursor() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  search_ jsonb := jsonb_build_array(jsonb_build_object('attnum', 3, 'literal', 'a'));
+  search_result jsonb;
+  results jsonb := '[]'::jsonb;
+  cursor_ text;
+BEGIN
+  PERFORM __setup_search_records_table();
+  rel_id := 'atable'::regclass::oid;
+  LOOP
+    search_result := msar.search_records_from_table(rel_id, search_, 1, cursor_ => cursor_);
+    RETURN NEXT is((search_result -> 'count')::integer, 3);
+    results := results || (search_result -> 'results');
+    cursor_ := search_result ->> 'next_cursor';
+    EXIT WHEN cursor_ IS NULL;
+  END LOOP;
+  RETURN NEXT is(
+    results,
+    jsonb_build_array(
+      jsonb_build_object('1', 4, '2', 2, '3', 'abcde'),
+      jsonb_build_object('1', 1, '2', 1, '3', 'bcdea'),
+      jsonb_build_object('1', 3, '2', 1, '3', 'edcba')
+    )
+  );
+  search_result := msar.search_records_from_table(rel_id, search_, 2);
+  search_result := msar.search_records_from_table(
+    rel_id, search_, 2, cursor_ => search_result ->> 'next_cursor'
+  );
+  RETURN NEXT is(
+    search_result -> 'results',
+    jsonb_build_array(jsonb_build_object('1', 3, '2', 1, '3', 'edcba'))
+  );
+  RETURN NEXT is(search_result -> 'next_cursor', 'null'::jsonb);
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_get_record_from_table() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
@@ -3961,6 +4876,8 @@ BEGIN
     msar.get_record_from_table(rel_id, 2),
     $j${
       "count": 1,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [
         {"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]}
       ],
@@ -3980,6 +4897,8 @@ BEGIN
     msar.get_record_from_table(rel_id, 200),
     $j${
       "count": 0,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [],
       "grouping": null,
       "linked_record_summaries": null,
@@ -4017,6 +4936,42 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_delete_records_where() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  filter_ jsonb := '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]}';
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(msar.delete_records_where(rel_id, filter_, dry_run => true), 2);
+  RETURN NEXT results_eq('SELECT count(1)::integer FROM atable', 'VALUES (3)');
+  RETURN NEXT is(msar.delete_records_where(rel_id, filter_), 2);
+  RETURN NEXT results_eq('SELECT id FROM atable ORDER BY id', 'VALUES (2)');
+  RETURN NEXT throws_ok(
+    format('SELECT msar.delete_records_where(%s, null)', rel_id),
+    'P0001',
+    'A filter is required to delete records'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.delete_records_where(%s, %L)', rel_id, '{}'),
+    'P0001',
+    'Invalid filter: {}'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.delete_records_where(%s, %L)', rel_id, '{"type": "nope", "args": []}'),
+    'P0001',
+    'Invalid filter: {"args": [], "type": "nope"}'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.delete_records_where(%s, %L, true)', rel_id, '{"type": "and", "args": []}'),
+    'P0001',
+    'Invalid filter: {"args": [], "type": "and"}'
+  );
+  RETURN NEXT results_eq('SELECT id FROM atable ORDER BY id', 'VALUES (2)');
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_delete_records_from_table_null() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
@@ -4259,6 +5214,116 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_add_records_to_table() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.add_records_to_table(
+      rel_id,
+      $r$[
+        {"2": 234, "3": "ab234", "4": {"key": "val"}, "5": "\"x\""},
+        {"3": "cd", "5": {"a": 1}},
+        {"2": 1, "3": "ef", "4": null, "5": null}
+      ]$r$
+    ),
+    $a${
+      "results": [
+        {"1": 4, "2": 234, "3": "ab234", "4": {"key": "val"}, "5": "x"},
+        {"1": 6, "2": 200, "3": "cd", "4": null, "5": {"a": 1}},
+        {"1": 5, "2": 1, "3": "ef", "4": null, "5": null}
+      ],
+      "linked_record_summaries": null,
+      "record_summaries": null
+    }$a$
+  );
+  RETURN NEXT is(
+    msar.add_records_to_table(rel_id, '[]'),
+    '{"results": [], "linked_record_summaries": null, "record_summaries": null}'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_add_records_to_table_on_conflict() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  CREATE TABLE upsert_table (id integer PRIMARY KEY, val text NOT NULL, other text DEFAULT 'd');
+  INSERT INTO upsert_table VALUES (1, 'a', 'x'), (2, 'b', 'y');
+  rel_id := 'upsert_table'::regclass::oid;
+  RETURN NEXT is(
+    msar.add_records_to_table(rel_id, '[{"1": 2, "2": "B"}, {"1": 3, "2": "c"}]', 'update')
+      -> 'results',
+    '[{"1": 2, "2": "B", "3": "y"}, {"1": 3, "2": "c", "3": "d"}]'
+  );
+  RETURN NEXT is(
+    msar.add_records_to_table(rel_id, '[{"1": 4, "2": "d"}, {"1": 1, "2": "A"}]', 'ignore')
+      -> 'results',
+    '[{"1": 4, "2": "d", "3": "d"}, {"1": 1, "2": "a", "3": "x"}]'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.add_records_to_table(%s, ''[{"1": 1, "2": "A"}]'')', rel_id),
+    '23505'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.add_records_to_table(%s, ''[{"1": 1, "2": "A"}]'', ''nope'')', rel_id),
+    'P0001',
+    'Unknown on_conflict action: nope'
+  );
+  RETURN NEXT is(
+    (SELECT jsonb_agg(to_jsonb(upsert_table.*) ORDER BY id) FROM upsert_table),
+    $j$[
+      {"id": 1, "val": "a", "other": "x"},
+      {"id": 2, "val": "B", "other": "y"},
+      {"id": 3, "val": "c", "other": "d"},
+      {"id": 4, "val": "d", "other": "d"}
+    ]$j$
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_add_records_to_table_default_pkeys() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  CREATE TABLE always_id_table (id integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY, val integer);
+  CREATE TABLE uuid_table (id uuid DEFAULT gen_random_uuid() PRIMARY KEY, val integer);
+  rel_id := 'always_id_table'::regclass::oid;
+  -- Every record must be paired with the id it was inserted with, whatever the order of the rows
+  -- returned by the INSERT.
+  RETURN NEXT is(
+    (
+      SELECT bool_and((rec ->> '2')::integer = ord)
+      FROM jsonb_array_elements(
+        msar.add_records_to_table(
+          rel_id, (SELECT jsonb_agg(jsonb_build_object('2', i)) FROM generate_series(1, 500) AS i)
+        ) -> 'results'
+      ) WITH ORDINALITY AS x(rec, ord)
+    ),
+    true
+  );
+  RETURN NEXT is(
+    msar.add_records_to_table(rel_id, '[{}, {}]') -> 'results',
+    '[{"1": 501, "2": null}, {"1": 502, "2": null}]'
+  );
+  rel_id := 'uuid_table'::regclass::oid;
+  RETURN NEXT is(
+    (
+      SELECT jsonb_agg(rec -> '2' ORDER BY ord)
+      FROM jsonb_array_elements(
+        msar.add_records_to_table(rel_id, '[{"2": 3}, {"2": 1}, {"2": 2}]') -> 'results'
+      ) WITH ORDINALITY AS x(rec, ord)
+    ),
+    '[3, 1, 2]'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_patch_record_in_table_single() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
@@ -4311,6 +5376,150 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_patch_records_in_table() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  patch_result jsonb;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  patch_result := msar.patch_records_in_table(
+    rel_id,
+    $p$[
+      {"record_id": 3, "record_def": {"2": 30}},
+      {"record_id": 1, "record_def": {"2": 10, "3": "patched"}},
+      {"record_id": "2", "record_def": {"2": 20}}
+    ]$p$
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(patch_result, '$.results[*]."1"'),
+    '[3, 1, 2]'::jsonb
+  );
+  RETURN NEXT is(
+    patch_result -> 'results' -> 2,
+    '{"1": 2, "2": 20, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]}'::jsonb
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1, col2 = ''patched'' FROM atable ORDER BY id',
+    'VALUES (1, 10, true), (2, 20, false), (3, 30, false)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_patch_records_in_table_is_atomic() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.patch_records_in_table(%s, %L)',
+      rel_id,
+      '[{"record_id": 1, "record_def": {"2": 10}}, {"record_id": 2, "record_def": {"2": "abc"}}]'
+    ),
+    '22P02'
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1 FROM atable ORDER BY id',
+    'VALUES (1, 5), (2, 34), (3, 2)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_patch_records_in_table_changing_pkeys() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  patch_result jsonb;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  ALTER TABLE atable ALTER COLUMN id SET GENERATED BY DEFAULT;
+  -- The second patch only works once the first has been applied.
+  patch_result := msar.patch_records_in_table(
+    rel_id,
+    $p$[
+      {"record_id": 1, "record_def": {"1": 10}},
+      {"record_id": 2, "record_def": {"1": 1, "2": 20}},
+      {"record_id": 3, "record_def": {}}
+    ]$p$
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(patch_result, '$.results[*]."1"'),
+    '[10, 1, 3]'::jsonb
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1 FROM atable ORDER BY id',
+    'VALUES (1, 20), (3, 2), (10, 5)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_patch_records_in_table_duplicate_ids() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.patch_records_in_table(%s, %L)',
+      rel_id,
+      '[{"record_id": 1, "record_def": {"2": 10}}, {"record_id": "1", "record_def": {"3": "x"}}]'
+    ),
+    'P0001',
+    'A record can only be patched once per call'
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1 FROM atable ORDER BY id',
+    'VALUES (1, 5), (2, 34), (3, 2)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_update_records_where() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  filter_ jsonb := '{"type": "lesser", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}]}';
+BEGIN
+  PERFORM __setup_add_record_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(msar.update_records_where(rel_id, filter_, '{"2": 100}', dry_run => true), 2);
+  RETURN NEXT results_eq('SELECT id, col1 FROM atable ORDER BY id', 'VALUES (1, 5), (2, 34), (3, 2)');
+  RETURN NEXT is(msar.update_records_where(rel_id, filter_, '{"2": 100, "5": [1]}'), 2);
+  RETURN NEXT results_eq(
+    'SELECT id, col1, col4 FROM atable ORDER BY id',
+    $v$VALUES (1, 100, '[1]'::jsonb), (2, 34, '[1, 2, 3, 4]'::jsonb), (3, 100, '[1]'::jsonb)$v$
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.update_records_where(%s, null, %L)', rel_id, '{"2": 100}'),
+    'P0001',
+    'A filter is required to update records'
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.update_records_where(%s, %L, %L)', rel_id, '{}', '{"2": 7}'),
+    'P0001',
+    'Invalid filter: {}'
+  );
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.update_records_where(%s, %L, %L)',
+      rel_id, '{"type": "nope", "args": []}', '{"2": 7}'
+    ),
+    'P0001',
+    'Invalid filter: {"args": [], "type": "nope"}'
+  );
+  RETURN NEXT results_eq(
+    'SELECT id, col1 FROM atable ORDER BY id', 'VALUES (1, 100), (2, 34), (3, 100)'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION __setup_preview_fkey_cols() RETURNS SETOF TEXT AS $$
 BEGIN
 CREATE TABLE "Counselors" (
@@ -4371,6 +5580,8 @@ BEGIN
     ),
     $j${
       "count": 6,
+      "count_mode": "exact",
+      "next_cursor": null,
       "results": [
         {"1": 1, "2": 2.345, "3": 3, "4": "Fred Fredrickson", "5": 95, "6": "ffredrickson@example.edu"},
         {"1": 2, "2": 1.234, "3": 1, "4": "Gabby Gabberson", "5": 100, "6": "ggabberson@example.edu"},
@@ -4419,6 +5630,7 @@ BEGIN
     ),
     $j${
       "count": 6,
+      "count_mode": "exact",
       "results": [
         {"1": 2, "2": 1.234, "3": 1, "4": "Gabby Gabberson", "5": 100, "6": "ggabberson@example.edu"},
         {"1": 3, "2": 1.234, "3": 2, "4": "Hank Hankson", "5": 75, "6": "hhankson@example.edu"},
@@ -4442,7 +5654,8 @@ BEGIN
         ' msar.format_data("Teacher") AS "3", msar.format_data("Name") AS "4",',
         ' msar.format_data("Grade") AS "5", msar.format_data("Email") AS "6"',
         ' FROM public."Students"  ORDER BY "1" ASC LIMIT ''3'' OFFSET ''1'''
-      )
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 4}')
     )
   );
   RETURN NEXT is(
@@ -4456,6 +5669,7 @@ BEGIN
     ),
     $j${
       "count": 6,
+      "count_mode": "exact",
       "results": [
         {"1": 2, "2": 1.234, "3": 1, "4": "Gabby Gabberson", "5": 100, "6": "ggabberson@example.edu"},
         {"1": 3, "2": 1.234, "3": 2, "4": "Hank Hankson", "5": 75, "6": "hhankson@example.edu"}
@@ -4481,7 +5695,8 @@ BEGIN
         ' msar.format_data("Teacher") AS "3", msar.format_data("Name") AS "4",',
         ' msar.format_data("Grade") AS "5", msar.format_data("Email") AS "6"',
         ' FROM public."Students"  ORDER BY "2" ASC, "1" ASC LIMIT ''2'' OFFSET NULL'
-      )
+      ),
+      'next_cursor', msar.encode_cursor('{"1": 3, "2": 1.234}')
     )
   );
 END;
@@ -4554,6 +5769,196 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_list_records_summarizes_only_linked_records_on_page()
+RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  query_plan jsonb;
+BEGIN
+  CREATE TABLE biglookup (id integer PRIMARY KEY, name text);
+  INSERT INTO biglookup SELECT x, 'name' || x FROM generate_series(1, 100000) AS x;
+  CREATE TABLE referrer (id integer PRIMARY KEY, lookup integer REFERENCES biglookup (id));
+  INSERT INTO referrer SELECT x, x * 7 FROM generate_series(1, 1000) AS x;
+  ANALYZE biglookup;
+  ANALYZE referrer;
+  rel_id := 'referrer'::regclass::oid;
+  EXECUTE format(
+    'EXPLAIN (FORMAT JSON) %s',
+    msar.build_list_records_query(rel_id, '50', 'NULL', null, null, null, true)
+  ) INTO query_plan;
+  RETURN NEXT ok(
+    jsonb_path_exists(query_plan, '$.** ? (@."Index Name" == "biglookup_pkey")'),
+    'Summaries of linked records are looked up with the primary key index'
+  );
+  RETURN NEXT ok(
+    NOT jsonb_path_exists(
+      query_plan, '$.** ? (@."Node Type" == "Seq Scan" && @."Relation Name" == "biglookup")'
+    ),
+    'The linked table is not scanned whole'
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(rel_id, 3, 1, null, null, null, true)
+      - 'results' - 'count' - 'count_mode' - 'grouping' - 'query' - 'next_cursor',
+    $j${
+      "linked_record_summaries": {"2": {"14": "name14", "21": "name21", "28": "name28"}},
+      "record_summaries": {"2": "2", "3": "3", "4": "4"}
+    }$j$
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- msar.enable_summary_cache -----------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION test_summary_cache() RETURNS SETOF TEXT AS $$
+DECLARE
+  teachers_id oid;
+  students_id oid;
+BEGIN
+  PERFORM __setup_preview_fkey_cols();
+  teachers_id := '"Teachers"'::regclass::oid;
+  students_id := '"Students"'::regclass::oid;
+  RETURN NEXT throws_ok(
+    format('SELECT msar.enable_summary_cache(%s)', '"Counselors"'::regclass::oid),
+    'P0001',
+    'The summary cache needs a table with a single-column primary key'
+  );
+  PERFORM msar.enable_summary_cache(teachers_id);
+  RETURN NEXT results_eq(
+    format('SELECT key, summary FROM msar.summary_cache WHERE tab_id = %s ORDER BY key', teachers_id),
+    $v$VALUES ('1', 'Carol Carlson'), ('2', 'Dave Davidson'), ('3', 'Eve Evilson')$v$
+  );
+  RETURN NEXT ok(msar.is_summary_cache_usable(teachers_id, 1::smallint));
+  RETURN NEXT ok(NOT msar.is_summary_cache_usable(teachers_id, 2::smallint));
+  RETURN NEXT matches(msar.build_summary_cte_expr_for_table(students_id, 'results_cte'), 'msar\.summary_cache');
+
+  -- The cache is kept up to date by the triggers.
+  UPDATE "Teachers" SET "Name" = 'Carol Carlsen' WHERE id = 1;
+  DELETE FROM "Students" WHERE "Teacher" = 3;
+  DELETE FROM "Teachers" WHERE id = 3;
+  INSERT INTO "Teachers" ("Counselor", "Name", "Email") VALUES (2.345, 'Gus Gustafson', null);
+  RETURN NEXT results_eq(
+    format('SELECT key, summary FROM msar.summary_cache WHERE tab_id = %s ORDER BY key', teachers_id),
+    $v$VALUES ('1', 'Carol Carlsen'), ('2', 'Dave Davidson'), ('4', 'Gus Gustafson')$v$
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => students_id,
+      limit_ => null,
+      offset_ => null,
+      order_ => null,
+      filter_ => null,
+      group_ => null
+    ) -> 'linked_record_summaries' -> '3',
+    '{"1": "Carol Carlsen", "2": "Dave Davidson"}'
+  );
+
+  -- Once the summary column's type changes, the cache is stale, and summaries are computed live.
+  ALTER TABLE "Teachers" ALTER COLUMN "Name" TYPE varchar(50);
+  RETURN NEXT ok(NOT msar.is_summary_cache_usable(teachers_id, 1::smallint));
+  RETURN NEXT doesnt_match(msar.build_summary_cte_expr_for_table(students_id, 'results_cte'), 'msar\.summary_cache');
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => students_id,
+      limit_ => null,
+      offset_ => null,
+      order_ => null,
+      filter_ => null,
+      group_ => null
+    ) -> 'linked_record_summaries' -> '3',
+    '{"1": "Carol Carlsen", "2": "Dave Davidson"}'
+  );
+  PERFORM msar.refresh_summary_cache(teachers_id);
+  RETURN NEXT ok(msar.is_summary_cache_usable(teachers_id, 1::smallint));
+
+  TRUNCATE "Students", "Teachers";
+  RETURN NEXT is_empty(format('SELECT * FROM msar.summary_cache WHERE tab_id = %s', teachers_id));
+
+  PERFORM msar.disable_summary_cache(teachers_id);
+  RETURN NEXT ok(NOT msar.is_summary_cache_usable(teachers_id, 1::smallint));
+  RETURN NEXT is_empty(
+    format('SELECT * FROM pg_catalog.pg_trigger WHERE tgrelid = %s AND NOT tgisinternal', teachers_id)
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_summary_cache_unsupported_types() RETURNS SETOF TEXT AS $$
+DECLARE
+  tab_id oid;
+BEGIN
+  CREATE TYPE cache_pair AS (a integer, b integer);
+  CREATE TABLE composite_keys (id cache_pair PRIMARY KEY, "Name" text);
+  RETURN NEXT throws_ok(
+    format('SELECT msar.enable_summary_cache(%s)', 'composite_keys'::regclass::oid),
+    'P0001',
+    'The summary cache only supports columns of built-in types'
+  );
+
+  -- Once a cached column has a type the trigger can't format safely, the cache is disabled.
+  CREATE DOMAIN cache_name AS text;
+  CREATE TABLE cached_names (id integer PRIMARY KEY, "Name" text);
+  tab_id := 'cached_names'::regclass::oid;
+  PERFORM msar.enable_summary_cache(tab_id);
+  ALTER TABLE cached_names ALTER COLUMN "Name" TYPE cache_name;
+  RETURN NEXT ok(NOT msar.is_summary_cache_usable(tab_id, 1::smallint));
+  RETURN NEXT throws_ok(
+    format('SELECT msar.refresh_summary_cache(%s)', tab_id),
+    'P0001',
+    'The summary cache only supports columns of built-in types'
+  );
+  INSERT INTO cached_names VALUES (1, 'Alice');
+  RETURN NEXT is_empty(format('SELECT * FROM msar.summary_cache_tables WHERE tab_id = %s', tab_id));
+  RETURN NEXT is_empty(format('SELECT * FROM msar.summary_cache WHERE tab_id = %s', tab_id));
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_summary_cache_changed_columns() RETURNS SETOF TEXT AS $$
+DECLARE
+  tab_id oid;
+BEGIN
+  CREATE TABLE cached_people (id integer PRIMARY KEY, "Name" text, "Age" integer);
+  tab_id := 'cached_people'::regclass::oid;
+  INSERT INTO cached_people VALUES (1, 'Alice', 30);
+  PERFORM msar.enable_summary_cache(tab_id);
+
+  -- While a cached column's type differs from when the cache was filled, the cache isn't updated.
+  ALTER TABLE cached_people ALTER COLUMN "Name" TYPE varchar(20);
+  INSERT INTO cached_people VALUES (2, 'Bob', 40);
+  RETURN NEXT results_eq(
+    format('SELECT key, summary FROM msar.summary_cache WHERE tab_id = %s ORDER BY key', tab_id),
+    $v$VALUES ('1', 'Alice')$v$
+  );
+  PERFORM msar.refresh_summary_cache(tab_id);
+  RETURN NEXT ok(msar.is_summary_cache_usable(tab_id, 1::smallint));
+  RETURN NEXT results_eq(
+    format('SELECT key, summary FROM msar.summary_cache WHERE tab_id = %s ORDER BY key', tab_id),
+    $v$VALUES ('1', 'Alice'), ('2', 'Bob')$v$
+  );
+
+  -- Once the summary column is dropped, changing the table still works, and disables the cache.
+  ALTER TABLE cached_people DROP COLUMN "Name";
+  RETURN NEXT ok(NOT msar.is_summary_cache_usable(tab_id, 1::smallint));
+  RETURN NEXT throws_ok(
+    format('SELECT msar.refresh_summary_cache(%s)', tab_id),
+    'P0001',
+    'A cached column was dropped, so the summary cache must be enabled again'
+  );
+  RETURN NEXT lives_ok('INSERT INTO cached_people VALUES (3, 35)');
+  RETURN NEXT lives_ok('UPDATE cached_people SET "Age" = 31 WHERE id = 1');
+  RETURN NEXT is_empty(format('SELECT * FROM msar.summary_cache_tables WHERE tab_id = %s', tab_id));
+  RETURN NEXT is_empty(format('SELECT * FROM msar.summary_cache WHERE tab_id = %s', tab_id));
+  -- Without a string column left, the table is summarized by its first column.
+  PERFORM msar.enable_summary_cache(tab_id);
+  RETURN NEXT results_eq(
+    format('SELECT key, summary FROM msar.summary_cache WHERE tab_id = %s ORDER BY key', tab_id),
+    $v$VALUES ('1', '1'), ('2', '2'), ('3', '3')$v$
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 -- msar.replace_database_privileges_for_roles ------------------------------------------------------
 
 CREATE OR REPLACE FUNCTION
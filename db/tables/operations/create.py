@@ -101,18 +101,12 @@ def prepare_table_for_import(
 
     Returns the copy_sql and table_oid for carrying out import into the created table.
     """
-    column_data_list = [
-        {
-            "name": column_name,
-            "type": {"name": PostgresType.TEXT.id}
-        } for column_name in column_names
-    ]
     import_info = exec_msar_func(
         conn,
         'prepare_table_for_import',
         schema_oid,
         table_name,
-        json.dumps(column_data_list),
+        json.dumps(_get_text_column_data_list(column_names)),
         header,
         delimiter,
         escapechar,
@@ -127,6 +121,39 @@ def prepare_table_for_import(
     )
 
 
+def prepare_temp_table_for_import_preview(column_names, conn):
+    """
+    Create a temporary table for previewing an import, with all columns
+    being String type.
+
+    The table has the same columns (and attnums) as the table which
+    `prepare_table_for_import` would create, and is dropped at the end of
+    the transaction.
+
+    Returns the copy_sql, table_oid and columns (with their attnums as ids)
+    for filling the created table with default CSV formatted data.
+    """
+    import_info = exec_msar_func(
+        conn,
+        'prepare_temp_table_for_import_preview',
+        json.dumps(_get_text_column_data_list(column_names))
+    ).fetchone()[0]
+    return (
+        import_info['copy_sql'],
+        import_info['table_oid'],
+        import_info['columns']
+    )
+
+
+def _get_text_column_data_list(column_names):
+    return [
+        {
+            "name": column_name,
+            "type": {"name": PostgresType.TEXT.id}
+        } for column_name in column_names
+    ]
+
+
 class CreateTableAs(DDLElement):
     def __init__(self, name, selectable):
         self.name = name
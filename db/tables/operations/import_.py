@@ -1,31 +1,84 @@
+import codecs
+import datetime
+from itertools import islice
 import json
-import tempfile
+import os
 
 import clevercsv as csv
 
 from db.connection import exec_msar_func
-from db.columns.operations.alter import _transform_column_alter_dict
-from db.tables.operations.create import prepare_table_for_import
+from db.columns.operations.alter import _transform_column_alter_dict, alter_columns_in_table
+from db.columns.operations.select import get_column_info_for_table
+from db.tables.operations.create import (
+    prepare_table_for_import, prepare_temp_table_for_import_preview
+)
+from db.tables.operations.infer_types import infer_table_column_data_types
 from db.encoding_utils import get_sql_compatible_encoding
 from mathesar.models.deprecated import DataFile
-from mathesar.imports.csv import get_file_encoding, get_sv_reader, process_column_names
+from mathesar.imports.csv import get_data_file_encoding, get_sv_reader, process_column_names
+from mathesar.imports.excel import get_excel_columns, iter_excel_records
 
+# The number of characters read from a CSV file at once while importing it.
+COPY_READ_SIZE = 2 ** 20
+# The number of records of a data file copied to a temporary table to
+# preview it.
+PREVIEW_SAMPLE_SIZE = 1000
 
-def import_csv(data_file_id, table_name, schema_oid, conn, comment=None):
+
+def import_data_file(
+    data_file_id,
+    table_name,
+    schema_oid,
+    conn,
+    comment=None,
+    progress_callback=None,
+    columns=None
+):
+    """
+    Import a data file into a new table, choosing the importer by file type.
+
+    The `progress_callback` is only called while importing CSV/TSV files.
+    If `columns` are given (as for `get_preview`, e.g. with the types found
+    by `get_data_file_preview`), their types are applied to the new table
+    once all records are in, with a single table rewrite.
+    """
+    data_file = DataFile.objects.get(id=data_file_id)
+    if data_file.type == 'excel':
+        table_info = import_excel(
+            data_file_id, table_name, schema_oid, conn, comment, columns
+        )
+    else:
+        table_info = import_csv(
+            data_file_id, table_name, schema_oid, conn, comment, progress_callback
+        )
+        _alter_imported_columns(table_info['oid'], columns, conn)
+    return table_info
+
+
+def _alter_imported_columns(table_oid, columns, conn):
+    # All columns are imported as text, so only columns of other types are
+    # altered; with a `USING` clause, even a no-op type change rewrites.
+    columns = [
+        column for column in columns or []
+        if column.get('type') not in (None, 'text') or column.get('type_options')
+    ]
+    if columns:
+        alter_columns_in_table(table_oid, columns, conn)
+
+
+def import_csv(
+    data_file_id, table_name, schema_oid, conn, comment=None, progress_callback=None
+):
     data_file = DataFile.objects.get(id=data_file_id)
     file_path = data_file.file.path
     header = data_file.header
     if table_name is None or table_name == '':
         table_name = data_file.base_name
-    dialect = csv.dialect.SimpleDialect(
-        data_file.delimiter,
-        data_file.quotechar,
-        data_file.escapechar
-    )
-    encoding = get_file_encoding(data_file.file)
+    dialect = _get_data_file_dialect(data_file)
+    encoding = get_data_file_encoding(data_file)
     conversion_encoding, sql_encoding = get_sql_compatible_encoding(encoding)
     with open(file_path, 'rb') as csv_file:
-        csv_reader = get_sv_reader(csv_file, header, dialect)
+        csv_reader = get_sv_reader(csv_file, header, dialect, encoding)
         column_names = process_column_names(csv_reader.fieldnames)
     copy_sql, table_oid, db_table_name = prepare_table_for_import(
         table_name,
@@ -44,7 +97,8 @@ def import_csv(data_file_id, table_name, schema_oid, conn, comment=None):
         file_path,
         encoding,
         conversion_encoding,
-        conn
+        conn,
+        progress_callback
     )
     return {"oid": table_oid, "name": db_table_name}
 
@@ -54,26 +108,228 @@ def insert_csv_records(
     file_path,
     encoding,
     conversion_encoding,
-    conn
+    conn,
+    progress_callback=None
 ):
+    """
+    Stream a CSV file into a table, using the `COPY` statement given.
+
+    The file is read in chunks of `COPY_READ_SIZE` characters, which are
+    decoded from `encoding` and encoded to `conversion_encoding` (the
+    encoding named in the `COPY` statement) incrementally, and written
+    straight to `COPY`. So, memory usage doesn't depend on the size of the
+    file.
+
+    Args:
+        copy_sql: The `COPY ... FROM STDIN` statement to use.
+        file_path: The path of the CSV file.
+        encoding: The encoding of the file.
+        conversion_encoding: The encoding the database expects the data in.
+        progress_callback: If given, called after each chunk with the
+            number of bytes of the file read so far and its total size.
+    """
+    total_bytes = os.path.getsize(file_path)
+    # Characters which don't exist in the database's encoding are replaced.
+    encoder = codecs.getincrementalencoder(conversion_encoding)("replace")
     cursor = conn.cursor()
     with open(file_path, 'r', encoding=encoding) as csv_file:
-        if conversion_encoding == encoding:
-            with cursor.copy(copy_sql) as copy:
-                while data := csv_file.read():
-                    copy.write(data)
-        else:
-            # File needs to be converted to compatible database supported encoding
-            with tempfile.SpooledTemporaryFile(mode='wb+', encoding=conversion_encoding) as temp_file:
-                while True:
-                    contents = csv_file.read().encode(conversion_encoding, "replace")
-                    if not contents:
-                        break
-                    temp_file.write(contents)
-                temp_file.seek(0)
-                with cursor.copy(copy_sql) as copy:
-                    while data := temp_file.read():
-                        copy.write(data)
+        with cursor.copy(copy_sql) as copy:
+            while data := csv_file.read(COPY_READ_SIZE):
+                copy.write(encoder.encode(data))
+                if progress_callback is not None:
+                    progress_callback(csv_file.buffer.tell(), total_bytes)
+            if data := encoder.encode('', final=True):
+                copy.write(data)
+
+
+def import_excel(data_file_id, table_name, schema_oid, conn, comment=None, columns=None):
+    """
+    Import a sheet of an Excel-like workbook into a new table.
+
+    The sheet is read row by row (twice: once to find its non-empty
+    columns, and once to send its rows along), and the rows are written
+    to the table with `COPY`, so the workbook is never loaded whole.
+
+    The table's columns are in the order of the sheet. If `columns` found
+    by previewing the sheet are given, their types are applied to the
+    columns at the same positions in the sheet (see
+    `_get_imported_excel_column_ids`).
+    """
+    data_file = DataFile.objects.get(id=data_file_id)
+    file_path = data_file.file.path
+    header = data_file.header
+    sheet_index = data_file.sheet_index
+    if table_name is None or table_name == '':
+        table_name = data_file.base_name
+    column_names, column_indexes = get_excel_columns(file_path, sheet_index, header)
+    # The header row is skipped while reading the sheet, rather than by COPY.
+    copy_sql, table_oid, db_table_name = prepare_table_for_import(
+        table_name,
+        schema_oid,
+        process_column_names(column_names),
+        False,
+        conn,
+        comment=comment
+    )
+    if column_indexes:
+        insert_records(
+            copy_sql,
+            iter_excel_records(file_path, column_indexes, sheet_index, header),
+            conn
+        )
+    if columns:
+        column_ids = _get_imported_excel_column_ids(
+            data_file, column_indexes, table_oid, conn
+        )
+        columns = [
+            column | {"id": column_ids.get(column["id"], column["id"])}
+            for column in columns
+        ]
+        _alter_imported_columns(table_oid, columns, conn)
+    return {"oid": table_oid, "name": db_table_name}
+
+
+def _get_imported_excel_column_ids(data_file, column_indexes, table_oid, conn):
+    """
+    Map the ids of the columns of an Excel sheet's preview to the imported ones.
+
+    The preview only reads the first `PREVIEW_SAMPLE_SIZE` rows of the
+    sheet, so it misses any columns having values only further down, and
+    the columns after those get different ids on import. The columns of
+    both tables are in the order of the sheet, and are numbered alike, so
+    they're matched up by their positions in the sheet.
+
+    Args:
+        data_file: The DataFile of the imported sheet.
+        column_indexes: The positions of the imported columns in the sheet.
+        table_oid: The OID of the imported table.
+    """
+    _, preview_column_indexes = get_excel_columns(
+        data_file.file.path,
+        data_file.sheet_index,
+        data_file.header,
+        max_rows=PREVIEW_SAMPLE_SIZE,
+    )
+    attnums = sorted(
+        column["id"] for column in get_column_info_for_table(table_oid, conn)
+        if not column["primary_key"]
+    )
+    positions = {sheet_position: i for i, sheet_position in enumerate(column_indexes)}
+    return {
+        attnums[i]: attnums[positions[sheet_position]]
+        for i, sheet_position in enumerate(preview_column_indexes)
+    }
+
+
+def insert_records(copy_sql, records, conn):
+    """
+    Write records to a table, using the CSV `COPY` statement given.
+
+    Args:
+        copy_sql: A `COPY ... FROM STDIN CSV` statement, with the default
+            delimiter and quoting.
+        records: An iterable of lists of cell values.
+    """
+    cursor = conn.cursor()
+    with cursor.copy(copy_sql) as copy:
+        for record in records:
+            copy.write(
+                ','.join(_get_csv_field(value) for value in record) + '\n'
+            )
+
+
+def _get_csv_field(value):
+    # An unquoted empty field is NULL, while a quoted one is an empty string.
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        value = 'true' if value else 'false'
+    elif isinstance(value, datetime.datetime):
+        value = value.isoformat(sep=' ')
+    elif isinstance(value, (datetime.date, datetime.time)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def get_data_file_preview(data_file_id, conn, sample_size=PREVIEW_SAMPLE_SIZE, limit=20):
+    """
+    Preview a data file, without waiting for all of it to be imported.
+
+    The first `sample_size` records of the file are copied into a temporary
+    table, the types of its columns are inferred from them, and the table is
+    previewed with those types. The temporary table has the same columns as
+    the table `import_data_file` creates, so the (possibly adjusted) columns
+    can be passed along to it. For Excel files, only the sampled rows are
+    read, so columns with values only further down the sheet are missing
+    from the preview; on import, the given columns are matched to the
+    sheet's columns by position (with the default `sample_size`).
+
+    Args:
+        data_file_id: The Django id of the DataFile to preview.
+        sample_size: The number of records to copy into the temporary table.
+        limit: The upper limit for the number of records to return.
+
+    Returns:
+        A dict with the "columns" of the file (each with its "id", "name"
+        and inferred "type"), and the "records" of the preview.
+    """
+    data_file = DataFile.objects.get(id=data_file_id)
+    column_names, records = _get_data_file_sample(data_file, sample_size)
+    copy_sql, table_oid, columns = prepare_temp_table_for_import_preview(
+        column_names, conn
+    )
+    insert_records(copy_sql, records, conn)
+    column_types = infer_table_column_data_types(conn, table_oid) or {}
+    columns = [
+        column | {"type": column_types.get(str(column["id"]), 'text')}
+        for column in columns
+    ]
+    column_list = [{"id": column["id"], "type": column["type"]} for column in columns]
+    return {
+        "columns": columns,
+        "records": get_preview(table_oid, column_list, conn, limit),
+    }
+
+
+def _get_data_file_sample(data_file, sample_size):
+    file_path = data_file.file.path
+    header = data_file.header
+    if data_file.type == 'excel':
+        sheet_index = data_file.sheet_index
+        # Only the sampled rows are read, so the columns are those having
+        # values in the header or the sample (see `import_excel`).
+        column_names, column_indexes = get_excel_columns(
+            file_path, sheet_index, header, max_rows=sample_size
+        )
+        records = []
+        if column_indexes:
+            records = list(islice(
+                iter_excel_records(file_path, column_indexes, sheet_index, header),
+                sample_size
+            ))
+        return process_column_names(column_names), records
+    encoding = get_data_file_encoding(data_file)
+    with open(file_path, 'rb') as csv_file:
+        csv_reader = get_sv_reader(
+            csv_file, header, _get_data_file_dialect(data_file), encoding
+        )
+        column_names = process_column_names(csv_reader.fieldnames)
+        # As with `COPY`, empty fields are read as NULL.
+        records = [
+            [record.get(fieldname) or None for fieldname in csv_reader.fieldnames]
+            for record in islice(csv_reader, sample_size)
+        ]
+    return column_names, records
+
+
+def _get_data_file_dialect(data_file):
+    return csv.dialect.SimpleDialect(
+        data_file.delimiter,
+        data_file.quotechar,
+        data_file.escapechar
+    )
 
 
 def get_preview(table_oid, column_list, conn, limit=20):
@@ -22,7 +22,8 @@ def infer_table_column_data_types(conn, table_oid):
     Infer the best type for each column in the table.
 
     Currently we only suggest different types for columns which originate
-    as type `text`.
+    as type `text`. The table is read only once, testing all candidate
+    types against all columns in that one pass.
 
     Args:
         tab_id: The OID of the table whose columns we're inferring types for.
@@ -32,7 +33,32 @@ def infer_table_column_data_types(conn, table_oid):
     Restricted to columns to which the user has access.
     """
     return exec_msar_func(
-        conn, 'infer_table_column_data_types', table_oid
+        conn, 'infer_table_column_data_types_single_pass', table_oid
+    ).fetchone()[0]
+
+
+def suggest_table_column_data_types(
+        conn, table_oid, sample_size=None, sample_percent=None
+):
+    """
+    Suggest the best type for each column, looking only at a sample.
+
+    Args:
+        tab_id: The OID of the table whose columns we're inferring types for.
+        sample_size: The max number of rows to look at.
+        sample_percent: Look at a random sample of (roughly) this
+            percentage of the table's pages.
+
+    The response JSON will have the keys `types` (as for
+    `infer_table_column_data_types`), `sampled_rows`, `total_rows`, and
+    `confidence`, the fraction of the table the suggestions are based on.
+    """
+    return exec_msar_func(
+        conn,
+        'suggest_table_column_data_types',
+        table_oid,
+        sample_percent,
+        sample_size,
     ).fetchone()[0]
 
 
@@ -0,0 +1,29 @@
+from db.connection import exec_msar_func
+
+
+def list_search_indexes(table_oid, conn):
+    return exec_msar_func(conn, 'list_search_indexes', table_oid).fetchone()[0]
+
+
+def add_search_index(table_oid, column_attnum, conn):
+    """
+    Add a pg_trgm index for searching a string column of a table.
+
+    Returns:
+        The search indexes of the table, after adding the new one.
+    """
+    return exec_msar_func(
+        conn, 'add_search_index', table_oid, column_attnum
+    ).fetchone()[0]
+
+
+def drop_search_index(table_oid, column_attnum, conn):
+    """
+    Drop the search indexes of a column of a table.
+
+    Returns:
+        The search indexes left on the table.
+    """
+    return exec_msar_func(
+        conn, 'drop_search_index', table_oid, column_attnum
+    ).fetchone()[0]
@@ -0,0 +1,21 @@
+from db.connection import exec_msar_func
+
+
+def enable_summary_cache(table_oid, conn):
+    """
+    Start caching the record summaries of a table, and fill the cache.
+
+    The cache is kept up to date by triggers on the table, and is used
+    when summarizing records linked to the table's records.
+    """
+    exec_msar_func(conn, 'enable_summary_cache', table_oid)
+
+
+def refresh_summary_cache(table_oid, conn):
+    """Recompute all cached record summaries of a table."""
+    exec_msar_func(conn, 'refresh_summary_cache', table_oid)
+
+
+def disable_summary_cache(table_oid, conn):
+    """Stop caching the record summaries of a table."""
+    exec_msar_func(conn, 'disable_summary_cache', table_oid)
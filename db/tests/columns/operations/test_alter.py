@@ -59,6 +59,30 @@ def test_alter_columns_in_table_basic():
         assert json.loads(mock_exec.call_args.args[3]) == expect_json_arg
 
 
+def test_alter_columns_in_table_logs_rewrite_time(caplog):
+    caplog.set_level('INFO', logger=col_alt.__name__)
+    with patch.object(col_alt.db_conn, 'exec_msar_func') as mock_exec:
+        col_alt.alter_columns_in_table(
+            123,
+            [
+                {"id": 3, "type": "numeric"},
+                {"id": 4, "name": "colname4"},
+                {"id": 6, "type": "boolean"},
+            ],
+            'conn'
+        )
+    # All the type changes are made with a single call.
+    assert mock_exec.call_count == 1
+    assert 'type of 2 column(s) of table 123 with one table rewrite' in caplog.text
+
+
+def test_alter_columns_in_table_no_type_change(caplog):
+    caplog.set_level('INFO', logger=col_alt.__name__)
+    with patch.object(col_alt.db_conn, 'exec_msar_func'):
+        col_alt.alter_columns_in_table(123, [{"id": 4, "name": "colname4"}], 'conn')
+    assert caplog.text == ''
+
+
 def _rename_column_and_assert(table, old_col_name, new_col_name, engine):
     """
     Renames the colum of a table and assert the change went through
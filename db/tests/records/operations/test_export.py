@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+
+from db import connection as db_conn
+from db.records.operations import export
+
+
+class MockCursor:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.copy_expr = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    @contextmanager
+    def copy(self, copy_expr):
+        self.copy_expr = copy_expr
+        yield iter(self.chunks)
+
+
+class MockConnection:
+    def __init__(self, chunks):
+        self._cursor = MockCursor(chunks)
+
+    def cursor(self):
+        return self._cursor
+
+
+class MockResult:
+    def fetchone(self):
+        return ['COPY (SELECT 1) TO STDOUT']
+
+
+def test_stream_records_from_table_chunks(monkeypatch):
+    calls = []
+
+    def mock_exec_msar_func(conn, func_name, *args):
+        calls.append((func_name, args))
+        return MockResult()
+
+    monkeypatch.setattr(db_conn, 'exec_msar_func', mock_exec_msar_func)
+    conn = MockConnection([b'id,name\n', b'1,a\n', b'2,b\n', b'3,c\n'])
+    chunks = list(
+        export.stream_records_from_table(
+            conn, 123, format='jsonl', order=[{'attnum': 1, 'direction': 'desc'}], chunk_size=10
+        )
+    )
+    assert chunks == [b'id,name\n1,a\n', b'2,b\n3,c\n']
+    assert conn.cursor().copy_expr == 'COPY (SELECT 1) TO STDOUT'
+    assert calls == [
+        ('build_export_copy_expr', (123, '[{"attnum": 1, "direction": "desc"}]', None, 'jsonl'))
+    ]
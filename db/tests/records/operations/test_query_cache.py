@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+
+import pytest
+
+from db import connection as db_conn
+from db.records.operations import query_cache
+
+
+class MockResult:
+    def __init__(self, value):
+        self.value = value
+
+    def fetchone(self):
+        return [self.value]
+
+
+class MockConnection:
+    def __init__(self):
+        self.info = SimpleNamespace(
+            host='localhost', port=5432, dbname='mydb', user='alice'
+        )
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        return MockResult({'results': []})
+
+
+class MockClientCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, statement, params=None):
+        return self.conn.execute(statement, params)
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    state = {'catalog_version': 'v1', 'calls': []}
+
+    def mock_exec_msar_func(conn, func_name, *args):
+        state['calls'].append((func_name, args))
+        if func_name == 'get_relation_catalog_version':
+            return MockResult(state['catalog_version'])
+        return MockResult(f"SELECT {state['catalog_version']}")
+
+    monkeypatch.setattr(db_conn, 'exec_msar_func', mock_exec_msar_func)
+    monkeypatch.setattr(query_cache, 'ClientCursor', MockClientCursor)
+    monkeypatch.setattr(query_cache, '_query_cache', query_cache.OrderedDict())
+    monkeypatch.setattr(query_cache, '_prepared_statements', query_cache.weakref.WeakKeyDictionary())
+    return state
+
+
+def _filter(value):
+    return {
+        'type': 'and',
+        'args': [
+            {'type': 'lesser', 'args': [{'type': 'attnum', 'value': 2}, {'type': 'literal', 'value': value}]},
+            {'type': 'contains', 'args': [{'type': 'attnum', 'value': 3}, {'type': 'literal', 'value': 'ab%c'}]},
+        ]
+    }
+
+
+def test_parameterize_filter():
+    params = [10, 0]
+    actual_filter = query_cache.parameterize_filter(_filter(5), params)
+    assert actual_filter == {
+        'type': 'and',
+        'args': [
+            {'type': 'lesser', 'args': [{'type': 'attnum', 'value': 2}, {'type': 'param', 'value': 3}]},
+            {'type': 'contains', 'args': [{'type': 'attnum', 'value': 3}, {'type': 'param', 'value': 4}]},
+        ]
+    }
+    assert params == [10, 0, '5', 'ab%c']
+
+
+def test_parameterize_filter_none():
+    params = []
+    assert query_cache.parameterize_filter(None, params) is None
+    assert params == []
+
+
+def test_list_records_with_cached_query_reuses_query(mock_db):
+    conn = MockConnection()
+    query_cache.list_records_with_cached_query(conn, 123, limit=10, offset=0, filter=_filter(5))
+    query_cache.list_records_with_cached_query(conn, 123, limit=10, offset=10, filter=_filter(8))
+    build_calls = [args for name, args in mock_db['calls'] if name == 'build_list_records_query']
+    assert len(build_calls) == 1
+    assert build_calls[0][:3] == (123, '$1', '$2')
+    prepares = [s for s, _ in conn.statements if s.startswith('PREPARE')]
+    executes = [(s, p) for s, p in conn.statements if s.startswith('EXECUTE')]
+    assert len(prepares) == 1
+    assert prepares[0].endswith(' AS SELECT v1')
+    statement_name = prepares[0].split()[1]
+    assert executes == [
+        (f'EXECUTE {statement_name}(%s, %s, %s, %s)', [10, 0, '5', 'ab%c']),
+        (f'EXECUTE {statement_name}(%s, %s, %s, %s)', [10, 10, '8', 'ab%c']),
+    ]
+
+
+def test_list_records_with_cached_query_invalidated_by_ddl(mock_db):
+    conn = MockConnection()
+    query_cache.list_records_with_cached_query(conn, 123, limit=10)
+    mock_db['catalog_version'] = 'v2'
+    query_cache.list_records_with_cached_query(conn, 123, limit=10)
+    build_calls = [args for name, args in mock_db['calls'] if name == 'build_list_records_query']
+    prepares = [s for s, _ in conn.statements if s.startswith('PREPARE')]
+    assert len(build_calls) == 2
+    assert len(prepares) == 2
+    assert prepares[1].endswith(' AS SELECT v2')
+
+
+def test_prepared_statements_are_deallocated(mock_db, monkeypatch):
+    monkeypatch.setattr(query_cache, 'PREPARED_STATEMENTS_MAX_SIZE', 1)
+    conn = MockConnection()
+    query_cache.list_records_with_cached_query(conn, 123, limit=10)
+    first_name = conn.statements[0][0].split()[1]
+    mock_db['catalog_version'] = 'v2'
+    query_cache.list_records_with_cached_query(conn, 123, limit=10)
+    assert (f'DEALLOCATE {first_name}', None) in conn.statements
+
+
+def test_render_query():
+    query = (
+        'SELECT "$1", \'$2 it\'\'s\' FROM "a""$1" WHERE (col) < ($3)'
+        ' AND strpos((col2), ($4))::boolean LIMIT $1 OFFSET $2'
+    )
+    assert query_cache.render_query(query, [10, None, "it's", 'a\\b']) == (
+        'SELECT "$1", \'$2 it\'\'s\' FROM "a""$1" WHERE (col) < (\'it\'\'s\')'
+        ' AND strpos((col2), (E\'a\\\\b\'))::boolean LIMIT \'10\' OFFSET NULL'
+    )
+
+
+def test_render_query_many_params():
+    params = list(range(12))
+    assert query_cache.render_query('$1, $12, $2', params) == "'0', '11', '1'"
+
+
+def test_list_records_with_cached_query_renders_query(mock_db):
+    class QueryConnection(MockConnection):
+        def execute(self, statement, params=None):
+            self.statements.append((statement, params))
+            return MockResult(
+                {'results': [], 'query': 'SELECT 1 WHERE (col) < ($3) LIMIT $1 OFFSET $2'}
+            )
+
+    conn = QueryConnection()
+    result = query_cache.list_records_with_cached_query(
+        conn, 123, limit=10, offset=0, filter=_filter(5)
+    )
+    assert result['query'] == "SELECT 1 WHERE (col) < ('5') LIMIT '10' OFFSET '0'"
@@ -0,0 +1,154 @@
+from types import SimpleNamespace
+
+from db.tables.operations import import_
+from mathesar.imports import excel
+
+
+class MockDataFileManager:
+    def __init__(self, data_file):
+        self.data_file = data_file
+
+    def get(self, id):
+        if id != self.data_file.id:
+            raise AssertionError('incorrect parameters passed')
+        return self.data_file
+
+
+def _mock_data_file(monkeypatch, type_='csv'):
+    data_file = SimpleNamespace(id=3, type=type_)
+    monkeypatch.setattr(import_.DataFile, 'objects', MockDataFileManager(data_file))
+    return data_file
+
+
+def test_get_data_file_preview(monkeypatch):
+    _mock_data_file(monkeypatch)
+    conn = object()
+    calls = []
+
+    def mock_get_data_file_sample(data_file, sample_size):
+        calls.append(('sample', sample_size))
+        return ['name', 'age'], [['alice', '32'], ['bob', None]]
+
+    def mock_prepare_temp_table(column_names, _conn):
+        assert column_names == ['name', 'age'] and _conn is conn
+        return 'COPY ...', 1234, [{'id': 1, 'name': 'name'}, {'id': 2, 'name': 'age'}]
+
+    def mock_insert_records(copy_sql, records, _conn):
+        calls.append(('insert', copy_sql, records))
+
+    def mock_get_preview(table_oid, column_list, _conn, limit):
+        calls.append(('preview', table_oid, column_list, limit))
+        return [{'1': 'alice', '2': 32}]
+
+    monkeypatch.setattr(import_, '_get_data_file_sample', mock_get_data_file_sample)
+    monkeypatch.setattr(import_, 'prepare_temp_table_for_import_preview', mock_prepare_temp_table)
+    monkeypatch.setattr(import_, 'insert_records', mock_insert_records)
+    monkeypatch.setattr(
+        import_, 'infer_table_column_data_types', lambda _conn, table_oid: {'2': 'integer'}
+    )
+    monkeypatch.setattr(import_, 'get_preview', mock_get_preview)
+    preview = import_.get_data_file_preview(3, conn, sample_size=50, limit=5)
+    assert preview == {
+        'columns': [
+            {'id': 1, 'name': 'name', 'type': 'text'},
+            {'id': 2, 'name': 'age', 'type': 'integer'},
+        ],
+        'records': [{'1': 'alice', '2': 32}],
+    }
+    assert calls == [
+        ('sample', 50),
+        ('insert', 'COPY ...', [['alice', '32'], ['bob', None]]),
+        ('preview', 1234, [{'id': 1, 'type': 'text'}, {'id': 2, 'type': 'integer'}], 5),
+    ]
+
+
+def test_get_data_file_sample_excel_reads_sample_only(monkeypatch):
+    data_file = SimpleNamespace(
+        type='excel', file=SimpleNamespace(path='a.xlsx'), header=True, sheet_index=0
+    )
+    rows_read = []
+
+    def mock_iter_excel_rows(file_path, sheet_index=0):
+        for i in range(10 ** 6):
+            rows_read.append(i)
+            yield ('name', 'age') if i == 0 else (f'name {i}', i)
+
+    monkeypatch.setattr(excel, 'iter_excel_rows', mock_iter_excel_rows)
+    column_names, records = import_._get_data_file_sample(data_file, 10)
+    assert column_names == ['name', 'age']
+    assert records[0] == ['name 1', 1] and len(records) == 10
+    assert len(rows_read) <= 2 * 12
+
+
+def _mock_import(monkeypatch, type_):
+    _mock_data_file(monkeypatch, type_)
+    altered = []
+
+    def mock_import(data_file_id, table_name, schema_oid, conn, *args):
+        return {'oid': 1234, 'name': table_name}
+
+    def mock_alter_columns_in_table(table_oid, columns, conn):
+        altered.append((table_oid, columns))
+
+    monkeypatch.setattr(import_, 'import_csv', mock_import)
+    monkeypatch.setattr(import_, 'import_excel', mock_import)
+    monkeypatch.setattr(import_, 'alter_columns_in_table', mock_alter_columns_in_table)
+    return altered
+
+
+def test_import_data_file_applies_column_types(monkeypatch):
+    altered = _mock_import(monkeypatch, 'csv')
+    columns = [
+        {'id': 1, 'type': 'text'},
+        {'id': 2, 'type': 'integer'},
+        {'id': 3, 'type': None},
+        {'id': 4, 'type': 'text', 'type_options': {'length': 10}},
+        {'id': 5},
+    ]
+    table_info = import_.import_data_file(3, 'mytable', 2200, object(), columns=columns)
+    assert table_info == {'oid': 1234, 'name': 'mytable'}
+    assert altered == [(
+        1234,
+        [{'id': 2, 'type': 'integer'}, {'id': 4, 'type': 'text', 'type_options': {'length': 10}}],
+    )]
+
+
+def test_import_data_file_skips_text_columns(monkeypatch):
+    altered = _mock_import(monkeypatch, 'csv')
+    import_.import_data_file(3, 'mytable', 2200, object(), columns=[{'id': 1, 'type': 'text'}])
+    import_.import_data_file(3, 'mytable', 2200, object())
+    assert altered == []
+
+
+def test_import_excel_keeps_sheet_order(monkeypatch):
+    data_file = _mock_data_file(monkeypatch, 'excel')
+    data_file.file = SimpleNamespace(path='a.xlsx')
+    data_file.header = True
+    data_file.sheet_index = 0
+    # The third column of the sheet only has values after the preview's sample.
+    rows = [('a', 'b', None, 'd')] + [(1, 2, None, 4)] * import_.PREVIEW_SAMPLE_SIZE + [(1, 2, 3, 4)]
+    prepared = []
+    altered = []
+
+    def mock_prepare_table_for_import(table_name, schema_oid, column_names, *args, **kwargs):
+        prepared.append(column_names)
+        return 'COPY ...', 1234, table_name
+
+    def mock_get_column_info_for_table(table_oid, conn):
+        return [{'id': 1, 'primary_key': True}] + [
+            {'id': i + 2, 'primary_key': False} for i in range(len(prepared[0]))
+        ]
+
+    def mock_alter_columns_in_table(table_oid, columns, conn):
+        altered.append((table_oid, columns))
+
+    monkeypatch.setattr(excel, 'iter_excel_rows', lambda file_path, sheet_index=0: iter(rows))
+    monkeypatch.setattr(import_, 'prepare_table_for_import', mock_prepare_table_for_import)
+    monkeypatch.setattr(import_, 'insert_records', lambda copy_sql, records, conn: list(records))
+    monkeypatch.setattr(import_, 'get_column_info_for_table', mock_get_column_info_for_table)
+    monkeypatch.setattr(import_, 'alter_columns_in_table', mock_alter_columns_in_table)
+    # The preview had the columns "a" (2), "b" (3) and "d" (4).
+    columns = [{'id': 3, 'type': 'integer'}, {'id': 4, 'type': 'numeric'}]
+    import_.import_data_file(3, 'mytable', 2200, object(), columns=columns)
+    assert prepared == [['a', 'b', 'Column 2', 'd']]
+    assert altered == [(1234, [{'id': 3, 'type': 'integer'}, {'id': 5, 'type': 'numeric'}])]
@@ -0,0 +1,43 @@
+import pytest
+
+from db import engine as db_engine
+
+
+class MockEngine:
+    def __init__(self, *args):
+        self.args = args
+        self.disposed = False
+
+    def dispose(self):
+        self.disposed = True
+
+
+@pytest.fixture
+def mock_registry(monkeypatch):
+    monkeypatch.setattr(db_engine, 'create_future_engine_with_custom_types', MockEngine)
+    monkeypatch.setattr(db_engine, '_engine_registry', db_engine.OrderedDict())
+    monkeypatch.setattr(db_engine, 'ENGINE_REGISTRY_MAX_SIZE', 2)
+
+
+def test_get_cached_engine_reuses_engine(mock_registry):
+    engine_one = db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'mydb', 5432)
+    engine_two = db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'mydb', 5432)
+    assert engine_one is engine_two
+
+
+def test_get_cached_engine_evicts_least_recently_used(mock_registry):
+    engine_one = db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'db1', 5432)
+    engine_two = db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'db2', 5432)
+    db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'db1', 5432)
+    engine_three = db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'db3', 5432)
+    assert engine_two.disposed is True
+    assert engine_one.disposed is False
+    assert engine_three.disposed is False
+    assert len(db_engine._engine_registry) == 2
+
+
+def test_dispose_cached_engines(mock_registry):
+    engine_one = db_engine.get_cached_engine_with_custom_types('alice', 'pass', 'localhost', 'db1', 5432)
+    db_engine.dispose_cached_engines()
+    assert engine_one.disposed is True
+    assert len(db_engine._engine_registry) == 0
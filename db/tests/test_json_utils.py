@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+from db.json_utils import flatten_json_object, iter_json_items
+
+JSON_ARRAY = (
+    '[\n  {"a": 1, "b": "x,]y"},\n  {"a": 12345.5, "c": {"d": [true, null]}},'
+    '\n  "text", -42, false\n]\n'
+)
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 7, 1000])
+def test_iter_json_items_array(read_size):
+    items = list(iter_json_items(io.StringIO(JSON_ARRAY), read_size=read_size))
+    assert items == json.loads(JSON_ARRAY)
+
+
+@pytest.mark.parametrize('read_size', [1, 5, 1000])
+def test_iter_json_items_binary(read_size):
+    json_file = io.BytesIO(('\ufeff' + '[{"név": "Ünnep"}, 7]').encode('utf-8'))
+    assert list(iter_json_items(json_file, read_size=read_size)) == [{'név': 'Ünnep'}, 7]
+
+
+@pytest.mark.parametrize(
+    'text,expect_items', [
+        ('{"a": {"b": 2}}', [{'a': {'b': 2}}]),
+        ('  []  ', []),
+        ('123', [123]),
+    ]
+)
+def test_iter_json_items_single_values(text, expect_items):
+    assert list(iter_json_items(io.StringIO(text), read_size=2)) == expect_items
+
+
+def test_iter_json_items_long_string():
+    long_string = 'x' * 1000
+    json_file = io.StringIO(json.dumps([long_string, long_string]))
+    assert list(iter_json_items(json_file, read_size=10)) == [long_string, long_string]
+
+
+@pytest.mark.parametrize(
+    'text', ['', '[', '[1, 2', '[1 2]', '[{"a": 1,}]', '[1] 2', '{"a": 1} x', '[tru]']
+)
+def test_iter_json_items_invalid(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(io.StringIO(text), read_size=3))
+
+
+def test_flatten_json_object():
+    json_object = {'a': 1, 'b': {'c': 2, 'd': {'e': 3}}, 'f': [1, {'g': 4}]}
+    assert flatten_json_object(json_object, 0) == json_object
+    assert flatten_json_object(json_object, 1) == {
+        'a': 1, 'b.c': 2, 'b.d': {'e': 3}, 'f': [1, {'g': 4}]
+    }
+    assert flatten_json_object(json_object, 2) == {
+        'a': 1, 'b.c': 2, 'b.d.e': 3, 'f': [1, {'g': 4}]
+    }
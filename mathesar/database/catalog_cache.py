@@ -0,0 +1,61 @@
+"""
+In-process cache of the schema and table listings of user databases.
+
+Each page of the app includes the schemas of the current database, and the
+tables of the current schema. Listing those involves catalog queries
+(descriptions, privileges, table counts, and so on) which rarely change
+between page loads.
+
+Here, each listing is cached under the database, the connecting role, and
+what's listed, along with the version of the catalog rows it depends on
+(see `msar.get_listing_catalog_version`). Checking that version is a
+single cheap query, and any DDL, comment, or privilege change touching
+those rows changes it, so stale listings are never used. Entries also
+expire after `MATHESAR_CATALOG_CACHE_TTL` seconds, which bounds the size
+of the cache.
+"""
+from threading import Lock
+import time
+
+from django.conf import settings
+
+from db.connection import exec_msar_func
+
+_cache = {}
+_cache_lock = Lock()
+
+
+def get_cached_listing(conn, key, get_listing):
+    """
+    Get a listing of catalog objects, using a cached one if it's current.
+
+    The listing returned may be shared with other callers, so it mustn't
+    be modified.
+
+    Args:
+        conn: A psycopg connection to the user database.
+        key: A hashable identifying the listing within the database, e.g.,
+            `('tables', schema_oid)`.
+        get_listing: A function of the connection, returning the listing.
+    """
+    catalog_version = exec_msar_func(conn, 'get_listing_catalog_version').fetchone()[0]
+    full_key = (conn.info.host, conn.info.port, conn.info.dbname, conn.info.user, key)
+    now = time.monotonic()
+    with _cache_lock:
+        cached_version, listing, expires_at = _cache.get(full_key, (None, None, 0))
+    if cached_version == catalog_version and now < expires_at:
+        return listing
+    listing = get_listing(conn)
+    with _cache_lock:
+        for expired_key in [k for k, v in _cache.items() if v[2] <= now]:
+            del _cache[expired_key]
+        _cache[full_key] = (
+            catalog_version, listing, now + settings.MATHESAR_CATALOG_CACHE_TTL
+        )
+    return listing
+
+
+def clear_catalog_cache():
+    """Forget all cached listings."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,61 @@
+"""
+In-process cache of the credentials used to connect to user databases.
+
+Resolving the connection parameters for a (user, database) pair
+involves several internal DB lookups and a password decryption. Since
+those rows rarely change, we cache the result for a short time, and
+clear the cache whenever a relevant model instance is saved or deleted
+(see `mathesar.signals`).
+"""
+from threading import Lock
+import time
+
+from django.conf import settings
+
+from mathesar.models.base import UserDatabaseRoleMap
+
+_cache = {}
+_cache_lock = Lock()
+
+
+def get_connection_params(user, database_id):
+    """
+    Get the parameters needed to connect to a database as a user.
+
+    Args:
+        user: A user model instance who'll connect to the database.
+        database_id: The Django id of the Database used for connecting.
+
+    Returns:
+        A dict with `host`, `port`, `dbname`, `role`, and `password`
+        keys, suitable for passing to `get_pooled_connection`.
+    """
+    key = (user.id, int(database_id))
+    now = time.monotonic()
+    with _cache_lock:
+        params, expires_at = _cache.get(key, (None, 0))
+    if params is not None and now < expires_at:
+        return params
+    params = _get_connection_params_from_db(user, database_id)
+    with _cache_lock:
+        _cache[key] = (params, now + settings.MATHESAR_CREDENTIAL_CACHE_TTL)
+    return params
+
+
+def clear_connection_params_cache():
+    """Forget all cached connection parameters."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _get_connection_params_from_db(user, database_id):
+    user_database_role = UserDatabaseRoleMap.objects.select_related(
+        'server', 'database', 'configured_role'
+    ).get(user=user, database__id=database_id)
+    return dict(
+        host=user_database_role.server.host,
+        port=user_database_role.server.port,
+        dbname=user_database_role.database.name,
+        role=user_database_role.configured_role.name,
+        password=user_database_role.configured_role.password,
+    )
@@ -0,0 +1,176 @@
+"""
+Pooled psycopg connections to user databases.
+
+Pools are keyed on the (host, port, database, role) used for connecting,
+so each configured role on each database gets its own bounded pool. The
+pools are process-local, and are created lazily on first use.
+
+A pool retries failing connection attempts in the background, so a caller
+waiting on it would only see a `PoolTimeout`. Instead, whenever a new pool
+can't connect quickly, or an existing pool times out, we connect directly,
+so that the actual connection error (e.g., for a wrong password) is raised.
+
+Pools are created outside of the lock guarding the registry, so that a
+slow or unreachable database server only holds up the callers waiting for
+a pool to that same server, database and role.
+"""
+from contextlib import contextmanager, ExitStack
+from threading import Lock
+
+from django.conf import settings
+import psycopg
+from psycopg_pool import ConnectionPool, PoolTimeout
+
+_pools = {}
+_pools_lock = Lock()
+# Locks held while creating the pool for a key, so it's only created once.
+_pool_creation_locks = {}
+
+# Seconds to wait for a new pool's first connection before connecting
+# directly to find out whether (and why) connecting fails.
+_POOL_OPEN_WAIT = 1
+
+
+@contextmanager
+def get_pooled_connection(host, port, dbname, role, password):
+    """
+    Get a psycopg connection from the pool for the given parameters.
+
+    The result is a context manager. On exit, the transaction is
+    committed (or rolled back on error), and the connection is returned
+    to the pool rather than closed.
+
+    If no connection can be made, the error from the database server
+    is raised, rather than a `PoolTimeout`.
+
+    Args:
+        host: The host of the database server.
+        port: The port of the database server.
+        dbname: The name of the database on the server.
+        role: The name of the role used for connecting.
+        password: The password of the role used for connecting.
+    """
+    pool = _get_pool(host, port, dbname, role, password)
+    with ExitStack() as stack:
+        try:
+            conn = stack.enter_context(pool.connection())
+        except PoolTimeout:
+            # Raises the connection error, if that's why the pool timed out.
+            _check_connection(pool.kwargs)
+            raise
+        yield conn
+
+
+def get_pool_stats():
+    """
+    Get usage statistics for all open connection pools.
+
+    Returns:
+        A list of dicts, each describing a single pool. See the
+        psycopg_pool documentation for the meaning of the stats keys.
+    """
+    with _pools_lock:
+        pools = list(_pools.items())
+    return [
+        {
+            "host": host,
+            "port": port,
+            "database": dbname,
+            "role": role,
+            "stats": pool.get_stats(),
+        }
+        for (host, port, dbname, role), (pool, _) in pools
+    ]
+
+
+def close_pool(host, port, dbname, role):
+    """Close and forget the pool for the given parameters, if any."""
+    with _pools_lock:
+        pool, _ = _pools.pop((host, port, dbname, role), (None, None))
+    if pool is not None:
+        pool.close()
+
+
+def close_all_pools():
+    """Close and forget all connection pools."""
+    with _pools_lock:
+        pools = [pool for pool, _ in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _get_pool(host, port, dbname, role, password):
+    key = (host, port, dbname, role)
+    with _pools_lock:
+        pool, pool_password = _pools.get(key, (None, None))
+        if pool is not None and pool_password == password:
+            return pool
+        creation_lock = _pool_creation_locks.setdefault(key, Lock())
+    with creation_lock:
+        with _pools_lock:
+            pool, pool_password = _pools.get(key, (None, None))
+        if pool is not None and pool_password == password:
+            # Another caller created the pool while we were waiting.
+            return pool
+        new_pool = _create_pool(host, port, dbname, role, password)
+        with _pools_lock:
+            # If the role's password was changed, connections in the old
+            # pool are still valid, but new ones couldn't be made.
+            stale_pool, _ = _pools.get(key, (None, None))
+            _pools[key] = (new_pool, password)
+    if stale_pool is not None:
+        stale_pool.close()
+    return new_pool
+
+
+def _create_pool(host, port, dbname, role, password):
+    pool_settings = settings.MATHESAR_CONNECTION_POOL
+    kwargs = dict(host=host, port=port, dbname=dbname, user=role, password=password)
+    pool = ConnectionPool(
+        kwargs=kwargs,
+        min_size=pool_settings['MIN_SIZE'],
+        max_size=pool_settings['MAX_SIZE'],
+        max_idle=pool_settings['MAX_IDLE'],
+        timeout=pool_settings['TIMEOUT'],
+        check=ConnectionPool.check_connection,
+        reset=_reset_session,
+        name=f"{role}@{host}:{port}/{dbname}",
+        open=True,
+    )
+    try:
+        pool.wait(timeout=_POOL_OPEN_WAIT)
+    except PoolTimeout:
+        # Either connecting fails (and we raise why), or it's just slow.
+        try:
+            _check_connection(kwargs)
+        except Exception:
+            pool.close()
+            raise
+    return pool
+
+
+def _check_connection(kwargs):
+    """Connect (and disconnect) directly, raising any connection error."""
+    psycopg.connect(**kwargs).close()
+
+
+def _reset_session(conn):
+    """
+    Clear any session state left behind by the previous borrower.
+
+    This is run when a connection is returned to the pool, so that
+    settings, role changes, temp tables, and so on don't leak between
+    requests. Prepared statements are kept, since they're tied to the
+    (role, database) pair rather than to the borrower.
+    """
+    conn.execute(
+        "RESET ALL;"
+        " RESET ROLE;"
+        " DISCARD TEMP;"
+        " DISCARD SEQUENCES;"
+        " SELECT pg_advisory_unlock_all();"
+        " UNLISTEN *;"
+        " CLOSE ALL;"
+    )
+    conn.commit()
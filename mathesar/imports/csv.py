@@ -1,4 +1,6 @@
+import codecs
 from io import TextIOWrapper
+import os
 
 import clevercsv as csv
 
@@ -19,6 +21,23 @@ from mathesar.state import reset_reflection
 ALLOWED_DELIMITERS = ",\t:|;"
 SAMPLE_SIZE = 20000
 CHECK_ROWS = 10
+# Encoding detection starts with a sample of this many bytes, and looks at
+# bigger samples (up to the max) only if the result is ambiguous.
+ENCODING_SAMPLE_SIZE = 2 ** 16
+ENCODING_MAX_SAMPLE_SIZE = 2 ** 22
+# Beyond the head of the file, samples are taken from this many places.
+ENCODING_SAMPLE_STRIDES = 8
+ENCODING_CONFIDENCE_THRESHOLD = 0.9
+# Byte order marks, with the width of the code units of their encodings.
+# The UTF-32 ones come first, since the UTF-32-LE BOM starts with the
+# UTF-16-LE one.
+ENCODING_BOMS = [
+    (codecs.BOM_UTF32_LE, 4),
+    (codecs.BOM_UTF32_BE, 4),
+    (codecs.BOM_UTF8, 1),
+    (codecs.BOM_UTF16_LE, 2),
+    (codecs.BOM_UTF16_BE, 2),
+]
 
 
 def is_valid_csv(data):
@@ -31,17 +50,80 @@ def is_valid_csv(data):
 
 def get_file_encoding(file):
     """
-    Given a file, uses charset_normalizer if installed or chardet which is installed as part of clevercsv module to
-    detect the file encoding. Returns a default value of utf-8-sig if encoding could not be detected or detection
-    libraries are missing.
+    Given a file, uses charset_normalizer to detect the file encoding from a
+    sample of it. Returns a default value of utf-8 if the encoding could not
+    be detected.
+
+    The sample is made of the head of the file plus chunks from evenly
+    spaced places after it, so that characters which only show up deep in
+    the file have a chance of being seen. If the detection isn't confident,
+    we retry with bigger samples, up to `ENCODING_MAX_SAMPLE_SIZE` bytes.
     """
     from charset_normalizer import detect
-    # Sample Size reduces the accuracy
-    encoding = detect(file.read()).get('encoding', None)
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    sample_size = ENCODING_SAMPLE_SIZE
+    while True:
+        is_whole_file = file_size <= sample_size
+        result = detect(_get_encoding_sample(file, file_size, sample_size))
+        encoding = result.get('encoding')
+        confidence = result.get('confidence') or 0
+        if (
+            is_whole_file
+            or sample_size >= ENCODING_MAX_SAMPLE_SIZE
+            or (encoding is not None and confidence >= ENCODING_CONFIDENCE_THRESHOLD)
+        ):
+            break
+        sample_size *= 4
+    file.seek(0)
+    if encoding is None:
+        return "utf-8"
+    if encoding == "ascii" and not is_whole_file:
+        # Only the sample is known to be ASCII, and UTF-8 is a superset.
+        return "utf-8"
+    return encoding
+
+
+def _get_encoding_sample(file, file_size, sample_size):
     file.seek(0)
-    if encoding is not None:
-        return encoding
-    return "utf-8"
+    if file_size <= sample_size:
+        return file.read()
+    head = file.read(4)
+    file.seek(0)
+    for bom, unit_width in ENCODING_BOMS:
+        if head.startswith(bom):
+            # The BOM settles the encoding. Cutting chunks at b'\n' would
+            # break the alignment of multi-byte code units, so only the head
+            # is used, cut at a whole code unit.
+            sample = file.read(sample_size)
+            return sample[:len(sample) - len(sample) % unit_width]
+    head_size = sample_size // 2
+    sample = file.read(head_size)
+    # Cut the samples at line breaks, so we don't split any characters.
+    sample = sample[:sample.rfind(b'\n') + 1] or sample
+    chunk_size = (sample_size - head_size) // ENCODING_SAMPLE_STRIDES
+    stride = (file_size - head_size) // ENCODING_SAMPLE_STRIDES
+    for i in range(ENCODING_SAMPLE_STRIDES):
+        file.seek(head_size + i * stride)
+        chunk = file.read(chunk_size)
+        start = chunk.find(b'\n') + 1
+        end = chunk.rfind(b'\n') + 1
+        if 0 < start < end:
+            sample += chunk[start:end]
+    return sample
+
+
+def get_data_file_encoding(data_file):
+    """
+    Get the encoding of a DataFile's file, detecting it only once.
+
+    The detected encoding is saved on the DataFile.
+    """
+    if not data_file.encoding:
+        data_file.encoding = get_file_encoding(data_file.file)
+        if data_file.pk is not None:
+            data_file.save(update_fields=['encoding'])
+    return data_file.encoding
 
 
 def check_dialect(file, dialect):
@@ -101,8 +183,9 @@ def get_sv_dialect(file):
         raise InvalidTableError
 
 
-def get_sv_reader(file, header, dialect=None):
-    encoding = get_file_encoding(file)
+def get_sv_reader(file, header, dialect=None, encoding=None):
+    if encoding is None:
+        encoding = get_file_encoding(file)
     file = TextIOWrapper(file, encoding=encoding)
     if dialect:
         reader = csv.DictReader(file, dialect=dialect)
@@ -120,7 +203,7 @@ def get_sv_reader(file, header, dialect=None):
 def insert_records_from_csv_data_file(name, schema, column_names, engine, comment, data_file):
     dialect = csv.dialect.SimpleDialect(data_file.delimiter, data_file.quotechar,
                                         data_file.escapechar)
-    encoding = get_file_encoding(data_file.file)
+    encoding = get_data_file_encoding(data_file)
     table = create_string_column_table(
         name=name,
         schema_oid=schema.oid,
@@ -150,7 +233,9 @@ def create_db_table_from_csv_data_file(data_file, name, schema, comment=None):
     dialect = csv.dialect.SimpleDialect(data_file.delimiter, data_file.quotechar,
                                         data_file.escapechar)
     with open(sv_filename, 'rb') as sv_file:
-        sv_reader = get_sv_reader(sv_file, header, dialect=dialect)
+        sv_reader = get_sv_reader(
+            sv_file, header, dialect=dialect, encoding=get_data_file_encoding(data_file)
+        )
         column_names = process_column_names(sv_reader.fieldnames)
     try:
         table = insert_records_from_csv_data_file(name, schema, column_names, engine, comment, data_file)
@@ -1,6 +1,11 @@
+from itertools import islice
+from zipfile import BadZipFile
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
 import pandas
 
-from db.constants import ID, ID_ORIGINAL
+from db.constants import COLUMN_NAME_TEMPLATE, ID, ID_ORIGINAL
 from db.tables.operations.alter import update_pk_sequence_to_latest
 from mathesar.database.base import create_mathesar_engine
 from db.records.operations.insert import insert_records_from_excel
@@ -65,3 +70,83 @@ def create_db_table_from_excel_data_file(data_file, name, schema, comment=None):
 
     reset_reflection(db_name=db_model.name)
     return table
+
+
+def iter_excel_rows(file_path, sheet_index=0):
+    """
+    Iterate over the rows of a sheet, as tuples of cell values.
+
+    Workbooks that openpyxl can read (xlsx, xlsm) are streamed in
+    read-only mode, so only a row at a time is held in memory. Other
+    formats are read whole with pandas. Empty cells are None, and rows
+    may be of differing lengths.
+    """
+    try:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    except (InvalidFileException, BadZipFile):
+        dataframe = pandas.read_excel(file_path, sheet_index, header=None)
+        for row in dataframe.itertuples(index=False):
+            yield tuple(None if pandas.isna(value) else value for value in row)
+        return
+    try:
+        yield from workbook.worksheets[sheet_index].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def get_excel_columns(file_path, sheet_index=0, header=True, max_rows=None):
+    """
+    Get the names and positions of the non-empty columns of a sheet.
+
+    Empty rows are skipped, so the first non-empty row is used as the
+    header.
+
+    Args:
+        max_rows: If given, only this many (non-empty) rows after the
+            header are read, rather than the whole sheet.
+
+    Returns:
+        A tuple of the column names and the indexes (within each row) of
+        the corresponding columns, in the order of the sheet.
+    """
+    rows = (
+        row for row in iter_excel_rows(file_path, sheet_index)
+        if not _is_empty_row(row)
+    )
+    header_row = next(rows, ()) if header else None
+    if max_rows is not None:
+        rows = islice(rows, max_rows)
+    column_indexes = {i for i, value in enumerate(header_row or ()) if value is not None}
+    for row in rows:
+        column_indexes.update(i for i, value in enumerate(row) if value is not None)
+    column_indexes = sorted(column_indexes)
+    if header:
+        column_names = [
+            '' if i >= len(header_row) or header_row[i] is None else str(header_row[i])
+            for i in column_indexes
+        ]
+    else:
+        column_names = [
+            f"{COLUMN_NAME_TEMPLATE}{i}" for i in range(len(column_indexes))
+        ]
+    return column_names, column_indexes
+
+
+def iter_excel_records(file_path, column_indexes, sheet_index=0, header=True):
+    """
+    Iterate over the data rows of a sheet, with the given columns only.
+
+    Empty rows, and the header row (if any), are skipped.
+    """
+    rows = (
+        row for row in iter_excel_rows(file_path, sheet_index)
+        if not _is_empty_row(row)
+    )
+    if header:
+        next(rows, None)
+    for row in rows:
+        yield [row[i] if i < len(row) else None for i in column_indexes]
+
+
+def _is_empty_row(row):
+    return all(value is None for value in row)
@@ -1,6 +1,7 @@
 import json
 from json.decoder import JSONDecodeError
 
+from db.json_utils import iter_json_items
 from db.tables.operations.alter import update_pk_sequence_to_latest
 from mathesar.database.base import create_mathesar_engine
 from db.records.operations.insert import insert_records_from_json
@@ -25,18 +26,18 @@ def is_valid_json(data):
 
 
 def validate_json_format(data_file_content):
+    """
+    Check that the file holds a JSON object, or an array of objects.
+
+    The file is read item by item, so it's never fully loaded into memory.
+    """
     try:
-        data = json.load(data_file_content)
+        for item in iter_json_items(data_file_content):
+            if not isinstance(item, dict):
+                raise database_api_exceptions.UnsupportedJSONFormat()
     except (JSONDecodeError, ValueError) as e:
         raise database_api_exceptions.InvalidJSONFormat(e)
 
-    is_list_of_dicts = isinstance(data, list) and all(isinstance(val, dict) for val in data)
-    if is_list_of_dicts:
-        return
-    if isinstance(data, dict):
-        return
-    raise database_api_exceptions.UnsupportedJSONFormat()
-
 
 def get_flattened_keys(json_dict, max_level, prefix=''):
     keys = []
@@ -50,18 +51,17 @@ def get_flattened_keys(json_dict, max_level, prefix=''):
 
 
 def get_column_names_from_json(data_file, max_level):
-    with open(data_file, 'r') as f:
-        data = json.load(f)
-
-    if isinstance(data, list):
-        all_keys = []
-        for obj in data:
-            for key in get_flattened_keys(obj, max_level):
-                if key not in all_keys:
-                    all_keys.append(key)
-        return all_keys
-    else:
-        return get_flattened_keys(data, max_level)
+    """
+    Get the flattened keys of all objects in a JSON file, in order of appearance.
+
+    The file is read item by item, so it's never fully loaded into memory.
+    """
+    # A dict serves as an ordered set here.
+    all_keys = {}
+    with open(data_file, 'rb') as f:
+        for obj in iter_json_items(f):
+            all_keys.update(dict.fromkeys(get_flattened_keys(obj, max_level)))
+    return list(all_keys)
 
 
 def insert_records_from_json_data_file(name, schema, column_names, engine, comment, json_filepath, max_level):
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0015_tablemetadata_data_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datafile',
+            name='encoding',
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+    ]
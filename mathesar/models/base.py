@@ -156,3 +156,29 @@ class Explorations(BaseModel):
     display_options = models.JSONField(null=True)
     display_names = models.JSONField(null=False)
     description = models.CharField(null=True)
+
+
+class Job(BaseModel):
+    """A long-running operation, run in the background (see mathesar.utils.jobs)."""
+    PENDING = "pending"
+    RUNNING = "running"
+    CANCELLING = "cancelling"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+    user = models.ForeignKey('User', on_delete=models.CASCADE)
+    database = models.ForeignKey('Database', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=128)
+    status = models.CharField(
+        max_length=32,
+        choices=[
+            (s, s) for s in (PENDING, RUNNING, CANCELLING, SUCCEEDED, FAILED, CANCELLED)
+        ],
+        default=PENDING,
+    )
+    progress = models.FloatField(null=True)
+    result = models.JSONField(null=True)
+    error = models.JSONField(null=True)
+    backend_pid = models.IntegerField(null=True)
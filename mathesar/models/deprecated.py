@@ -905,6 +905,8 @@ class DataFile(BaseModel):
     delimiter = models.CharField(max_length=1, default=',', blank=True)
     escapechar = models.CharField(max_length=1, blank=True)
     quotechar = models.CharField(max_length=1, default='"', blank=True)
+    # The detected encoding of the file, cached so that it's only detected once.
+    encoding = models.CharField(max_length=128, blank=True, null=True)
 
 
 class PreviewColumnSettings(BaseModel):
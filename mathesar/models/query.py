@@ -269,6 +269,8 @@ class Exploration(BaseModel, Relation):
 
     @property
     def _sa_engine(self):
+        # The table's engine (and its connection pool) is already in use
+        # for this database, so we don't get one from the engine registry.
         return self.base_table._sa_engine
 
     @property
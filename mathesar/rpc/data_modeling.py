@@ -1,7 +1,7 @@
 """
 Classes and functions exposed to the RPC endpoint for managing data models.
 """
-from typing import TypedDict
+from typing import Optional, TypedDict, Union
 
 from modernrpc.core import rpc_method, REQUEST_KEY
 from modernrpc.auth.basic import http_basic_auth_login_required
@@ -9,6 +9,7 @@ from modernrpc.auth.basic import http_basic_auth_login_required
 from db.links.operations import create as links_create
 from db.tables.operations import infer_types, split, move_columns as move_cols
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.rpc.jobs import JobInfo, submit_rpc_job
 from mathesar.rpc.utils import connect
 
 
@@ -86,7 +87,9 @@ def add_mapping_table(
 @rpc_method(name="data_modeling.suggest_types")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
-def suggest_types(*, table_oid: int, database_id: int, **kwargs) -> dict:
+def suggest_types(
+        *, table_oid: int, database_id: int, as_job: bool = False, **kwargs
+) -> Union[dict, JobInfo]:
     """
     Infer the best type for each column in the table.
 
@@ -96,16 +99,92 @@ def suggest_types(*, table_oid: int, database_id: int, **kwargs) -> dict:
     Args:
         table_oid: The OID of the table whose columns we're inferring types for.
         database_id: The Django id of the database containing the table.
+        as_job: Whether to run in the background. If true, information
+            about the job is returned, and the result is found with
+            `jobs.get`.
 
     The response JSON will have attnum keys, and values will be the
     result of `format_type` for the inferred type of each column, i.e., the
     canonical string referring to the type.
     """
     user = kwargs.get(REQUEST_KEY).user
+    if as_job:
+        return submit_rpc_job(
+            "data_modeling.suggest_types",
+            user,
+            database_id,
+            lambda conn, report_progress: infer_types.infer_table_column_data_types(
+                conn, table_oid
+            )
+        )
     with connect(database_id, user) as conn:
         return infer_types.infer_table_column_data_types(conn, table_oid)
 
 
+class TypeSuggestions(TypedDict):
+    """
+    Types suggested for the columns of a table, based on a sample.
+
+    Attributes:
+        types: The suggested type for each column, keyed by attnum.
+        sampled_rows: The number of rows the suggestions are based on.
+        total_rows: The (estimated) number of rows in the table, if known.
+        confidence: The fraction of the table that was sampled, if known.
+    """
+    types: dict
+    sampled_rows: int
+    total_rows: Optional[int]
+    confidence: Optional[float]
+
+    @classmethod
+    def from_dict(cls, suggestions):
+        return cls(
+            types=suggestions["types"],
+            sampled_rows=suggestions["sampled_rows"],
+            total_rows=suggestions["total_rows"],
+            confidence=suggestions["confidence"],
+        )
+
+
+@rpc_method(name="data_modeling.suggest_types_from_sample")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def suggest_types_from_sample(
+        *,
+        table_oid: int,
+        database_id: int,
+        sample_size: int = 1000,
+        sample_percent: float = None,
+        **kwargs
+) -> TypeSuggestions:
+    """
+    Suggest the best type for each column, looking only at a sample.
+
+    This is much faster than `data_modeling.suggest_types` for big tables,
+    but a value outside the sample may not fit the suggested type. Such
+    values are reported when the types are applied via `tables.patch`.
+    A table which was never analyzed (e.g., one just imported) is
+    analyzed first, so that its size is known.
+
+    Args:
+        table_oid: The OID of the table whose columns we're inferring types for.
+        database_id: The Django id of the database containing the table.
+        sample_size: The max number of rows to look at.
+        sample_percent: Look at a random sample of (roughly) this
+            percentage of the table. Chosen based on `sample_size` if
+            not given.
+
+    Returns:
+        The suggested types, along with how much of the table they're based on.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        suggestions = infer_types.suggest_table_column_data_types(
+            conn, table_oid, sample_size=sample_size, sample_percent=sample_percent
+        )
+    return TypeSuggestions.from_dict(suggestions)
+
+
 @rpc_method(name="data_modeling.split_table")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -116,8 +195,9 @@ def split_table(
     extracted_table_name: str,
     database_id: int,
     relationship_fk_column_name: str = None,
+    as_job: bool = False,
     **kwargs
-) -> None:
+) -> Optional[JobInfo]:
     """
     Extract columns from a table to create a new table, linked by a foreign key.
 
@@ -127,8 +207,23 @@ def split_table(
         extracted_table_name: The name of the new table to be made from the extracted columns.
         database_id: The Django id of the database containing the table.
         relationship_fk_column_name: The name to give the new foreign key column in the remainder table (optional)
+        as_job: Whether to run in the background. If true, information
+            about the job is returned, to be followed with `jobs.get`.
     """
     user = kwargs.get(REQUEST_KEY).user
+    if as_job:
+        return submit_rpc_job(
+            "data_modeling.split_table",
+            user,
+            database_id,
+            lambda conn, report_progress: split.split_table(
+                conn,
+                table_oid,
+                column_attnums,
+                extracted_table_name,
+                relationship_fk_column_name
+            )
+        )
     with connect(database_id, user) as conn:
         split.split_table(
             conn,
@@ -148,8 +243,9 @@ def move_columns(
     target_table_oid: int,
     move_column_attnums: list[int],
     database_id: int,
+    as_job: bool = False,
     **kwargs
-) -> None:
+) -> Optional[JobInfo]:
     """
     Extract columns from a table to a referent table, linked by a foreign key.
 
@@ -158,8 +254,22 @@ def move_columns(
         target_table_oid: The OID of the target table where the extracted column(s) will be added.
         move_column_attnums: The list of attnum(s) to move from source table to the target table.
         database_id: The Django id of the database containing the table.
+        as_job: Whether to run in the background. If true, information
+            about the job is returned, to be followed with `jobs.get`.
     """
     user = kwargs.get(REQUEST_KEY).user
+    if as_job:
+        return submit_rpc_job(
+            "data_modeling.move_columns",
+            user,
+            database_id,
+            lambda conn, report_progress: move_cols.move_columns_to_referenced_table(
+                conn,
+                source_table_oid,
+                target_table_oid,
+                move_column_attnums
+            )
+        )
     with connect(database_id, user) as conn:
         move_cols.move_columns_to_referenced_table(
             conn,
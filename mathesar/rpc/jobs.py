@@ -0,0 +1,119 @@
+"""
+Classes and functions exposed to the RPC endpoint for following background jobs.
+
+Long-running methods (e.g. `tables.import`) accept an `as_job` argument.
+When it's true, they return a `JobInfo` right away, and do their work in
+the background. The job can then be followed with `jobs.get`, and
+stopped with `jobs.cancel`.
+"""
+from typing import Any, Literal, Optional, TypedDict
+
+from modernrpc.core import rpc_method, REQUEST_KEY
+from modernrpc.auth.basic import http_basic_auth_login_required
+
+from mathesar.models.base import Job
+from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.utils.jobs import cancel_job, submit_job
+
+
+class JobError(TypedDict):
+    """
+    Information about the error which made a job fail.
+
+    Attributes:
+        code: The error code, as for errors returned by RPC methods.
+        message: The error message.
+    """
+    code: int
+    message: str
+
+
+class JobInfo(TypedDict):
+    """
+    Information about a background job.
+
+    Attributes:
+        id: The Django id of the job.
+        database_id: The Django id of the database the job works on.
+        kind: The name of the RPC method run by the job.
+        status: The status of the job.
+        progress: The fraction (from 0 to 1) of the work done, if known.
+        result: Once the job has succeeded, the result of the RPC method.
+        error: If the job has failed, the error which made it fail.
+    """
+    id: int
+    database_id: int
+    kind: str
+    status: Literal[
+        "pending", "running", "cancelling", "succeeded", "failed", "cancelled"
+    ]
+    progress: Optional[float]
+    result: Optional[Any]
+    error: Optional[JobError]
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(
+            id=model.id,
+            database_id=model.database_id,
+            kind=model.kind,
+            status=model.status,
+            progress=model.progress,
+            result=model.result,
+            error=model.error,
+        )
+
+
+@rpc_method(name="jobs.get")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def get(*, job_id: int, **kwargs) -> JobInfo:
+    """
+    Get information about a background job started by the current user.
+
+    Args:
+        job_id: The Django id of the job.
+
+    Returns:
+        The status, progress and (once finished) result of the job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    return JobInfo.from_model(Job.objects.get(id=job_id, user=user))
+
+
+@rpc_method(name="jobs.cancel")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def cancel(*, job_id: int, **kwargs) -> JobInfo:
+    """
+    Cancel a background job started by the current user.
+
+    A pending job is cancelled right away. For a running job, its current
+    query is cancelled, and its changes are rolled back; the job's status
+    is "cancelling" until that's done. Finished jobs are left as they are.
+
+    Args:
+        job_id: The Django id of the job.
+
+    Returns:
+        Information about the job, after the cancellation was requested.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    return JobInfo.from_model(cancel_job(Job.objects.get(id=job_id, user=user)))
+
+
+def submit_rpc_job(kind, user, database_id, func):
+    """
+    Run the body of an RPC method as a background job.
+
+    Args:
+        kind: The name of the RPC method.
+        user: The user calling the method.
+        database_id: The Django id of the database the method works on.
+        func: The body of the method, as a function of a psycopg
+            connection and a callable for reporting progress.
+
+    Returns:
+        Information about the new job.
+    """
+    return JobInfo.from_model(submit_job(kind, user, database_id, func))
@@ -3,6 +3,7 @@ Classes and functions exposed to the RPC endpoint for managing table records.
 """
 from typing import Any, Literal, Optional, TypedDict, Union
 
+from django.conf import settings
 from modernrpc.core import rpc_method, REQUEST_KEY
 from modernrpc.auth.basic import http_basic_auth_login_required
 
@@ -43,10 +44,11 @@ class FilterLiteral(TypedDict):
     An object defining a literal for an argument to a filter.
 
     Attributes:
-      type: must be `"literal"`.
+      type: must be `"literal"`, or `"literal_array"` for an array of
+        values (e.g., the second argument of `element_in_array`).
       value: The value of the literal.
     """
-    type: Literal["literal"]
+    type: Literal["literal", "literal_array"]
     value: Any
 
 
@@ -77,6 +79,19 @@ class SearchParam(TypedDict):
     literal: Any
 
 
+class RecordPatch(TypedDict):
+    """
+    An object defining a modification of a single record.
+
+    Attributes:
+        record_id: The primary key value of the record to modify.
+        record_def: An object with the same form as the `record_def` of
+            `records.patch`.
+    """
+    record_id: Any
+    record_def: dict
+
+
 class Grouping(TypedDict):
     """
     Grouping definition.
@@ -137,28 +152,39 @@ class RecordList(TypedDict):
     given row, for the given column.
 
     Attributes:
-        count: The total number of records in the table.
+        count: The total number of records in the table. May be
+            approximate or missing, depending on `count_mode`.
+        count_mode: How `count` was computed. `exact` counts are exact,
+            `estimated` counts come from planner statistics, `capped`
+            means there are at least `count` records, and `none` means
+            records weren't counted.
         results: An array of record objects.
         grouping: Information for displaying grouped records.
         linked_record_smmaries: Information for previewing foreign key
             values, provides a map of foreign key to a text summary.
         record_summaries: Information for previewing returned records.
+        next_cursor: An opaque cursor for getting the records following
+            these ones. Only present when a full page was returned.
     """
-    count: int
+    count: Optional[int]
+    count_mode: Literal["exact", "estimated", "capped", "none"]
     results: list[dict]
     grouping: GroupingResponse
     linked_record_summaries: dict[str, dict[str, str]]
     record_summaries: dict[str, str]
+    next_cursor: Optional[str]
     query: str
 
     @classmethod
     def from_dict(cls, d):
         return cls(
             count=d["count"],
+            count_mode=d.get("count_mode", "exact"),
             results=d["results"],
             grouping=d.get("grouping"),
             linked_record_summaries=d.get("linked_record_summaries"),
             record_summaries=d.get("record_summaries"),
+            next_cursor=d.get("next_cursor"),
             query=d["query"],
         )
 
@@ -204,11 +230,32 @@ def list_(
         filter: Filter = None,
         grouping: Grouping = None,
         return_record_summaries: bool = False,
+        count_mode: Literal["exact", "estimated", "capped", "none"] = "exact",
+        count_limit: int = None,
+        cursor: str = None,
+        request_id: str = None,
         **kwargs
 ) -> RecordList:
     """
     List records from a table, and its row count. Exposed as `list`.
 
+    Counting all rows matching the filter requires scanning them, which
+    can dominate the cost of listing a page of a large table. The
+    `count_mode` controls this:
+
+    - `exact`: Count all matching rows.
+    - `estimated`: Use the planner's row estimate. This falls back to
+      `exact` if the table has no statistics.
+    - `capped`: Count matching rows, stopping after `count_limit`.
+    - `none`: Don't count rows; `count` will be `null`.
+
+    Large tables are best paged through by passing the `next_cursor` of
+    each result as the `cursor` of the following call, rather than by
+    increasing the `offset`. Skipping rows with an offset still requires
+    reading them, so deep pages get slower and slower, while a cursor
+    lets the database seek straight to the next page. The `order`
+    and `filter` should be the same for each call using a cursor.
+
     Args:
         table_oid: Identity of the table in the user's database.
         database_id: The Django id of the database containing the table.
@@ -220,12 +267,25 @@ def list_(
         grouping: An array of group definition objects.
         return_record_summaries: Whether to return summaries of retrieved
             records.
+        count_mode: How to count the records matching the filter.
+        count_limit: The maximum number of records to count when
+            `count_mode` is `capped`, where it's required (and must be at
+            least 1).
+        cursor: The `next_cursor` from a previous call. If given, only
+            records after the one it points to are returned.
+        request_id: An id for the request, chosen by the client. If an
+            earlier request with the same id is still running, it's
+            cancelled, since its results are no longer wanted.
 
     Returns:
         The requested records, along with some metadata.
     """
+    if count_mode == "capped" and (count_limit is None or count_limit < 1):
+        raise ValueError(
+            "count_limit must be a positive integer when count_mode is 'capped'"
+        )
     user = kwargs.get(REQUEST_KEY).user
-    with connect(database_id, user) as conn:
+    with _connect_for_records(database_id, user, request_id) as conn:
         record_info = record_select.list_records_from_table(
             conn,
             table_oid,
@@ -235,6 +295,9 @@ def list_(
             filter=filter,
             group=grouping,
             return_record_summaries=return_record_summaries,
+            count_mode=count_mode,
+            count_limit=count_limit,
+            cursor=cursor,
         )
     return RecordList.from_dict(record_info)
 
@@ -316,6 +379,59 @@ def add(
     return RecordAdded.from_dict(record_info)
 
 
+@rpc_method(name="records.add_many")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def add_many(
+        *,
+        record_defs: list[dict],
+        table_oid: int,
+        database_id: int,
+        on_conflict: Literal["error", "ignore", "update"] = "error",
+        return_record_summaries: bool = False,
+        **kwargs
+) -> RecordAdded:
+    """
+    Add a number of records to a table at once.
+
+    Each of the `record_defs` has the same form as the `record_def` of
+    `records.add`. Records defining the same set of columns are inserted
+    with a single statement, so this is much faster than adding them one
+    at a time.
+
+    The `on_conflict` determines what happens to a record whose primary
+    key is already in the table:
+
+    - `error`: Fail, without adding any of the records.
+    - `ignore`: Keep the existing record as it is.
+    - `update`: Overwrite the existing record with the given values.
+
+    Args:
+        record_defs: A list of objects representing the records to be
+            added.
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        on_conflict: What to do with records whose primary key is
+            already in the table.
+        return_record_summaries: Whether to return summaries of the added
+            records.
+
+    Returns:
+        The created (or existing) records in the order of `record_defs`,
+        along with some metadata.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        record_info = record_insert.add_records_to_table(
+            conn,
+            record_defs,
+            table_oid,
+            on_conflict=on_conflict,
+            return_record_summaries=return_record_summaries,
+        )
+    return RecordAdded.from_dict(record_info)
+
+
 @rpc_method(name="records.patch")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -360,6 +476,89 @@ def patch(
     return RecordAdded.from_dict(record_info)
 
 
+@rpc_method(name="records.patch_many")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def patch_many(
+        *,
+        record_patches: list[RecordPatch],
+        table_oid: int,
+        database_id: int,
+        return_record_summaries: bool = False,
+        **kwargs
+) -> RecordAdded:
+    """
+    Modify a number of records in a table at once.
+
+    Patches which set the same columns are applied with a single
+    statement, and all patches are applied in one transaction; if any of
+    them fails, none of the records are modified. Each record may only
+    be patched once per call.
+
+    Args:
+        record_patches: A list of objects defining the modification of
+            each record.
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        return_record_summaries: Whether to return summaries of the
+            modified records.
+
+    Returns:
+        The modified records in the order of `record_patches` (with their
+        new primary key values, if patched), along with some metadata.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        record_info = record_update.patch_records_in_table(
+            conn,
+            record_patches,
+            table_oid,
+            return_record_summaries=return_record_summaries,
+        )
+    return RecordAdded.from_dict(record_info)
+
+
+@rpc_method(name="records.update_where")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def update_where(
+        *,
+        record_def: dict,
+        filter: Filter,
+        table_oid: int,
+        database_id: int,
+        dry_run: bool = False,
+        **kwargs
+) -> int:
+    """
+    Modify all records in a table matching a filter.
+
+    The records are modified with a single statement, without having to
+    list them first.
+
+    Args:
+        record_def: An object with the same form as the `record_def` of
+            `records.patch`, applied to each matching record.
+        filter: A filter definition object, as for `records.list`.
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        dry_run: If true, only count the records which would be modified.
+
+    Returns:
+        The number of records modified (or which would be modified).
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        num_updated = record_update.update_records_where(
+            conn,
+            record_def,
+            filter,
+            table_oid,
+            dry_run=dry_run,
+        )
+    return num_updated
+
+
 @rpc_method(name="records.delete")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -391,6 +590,43 @@ def delete(
     return num_deleted
 
 
+@rpc_method(name="records.delete_where")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def delete_where(
+        *,
+        filter: Filter,
+        table_oid: int,
+        database_id: int,
+        dry_run: bool = False,
+        **kwargs
+) -> int:
+    """
+    Delete all records from a table matching a filter.
+
+    The records are deleted with a single statement, without having to
+    list them first.
+
+    Args:
+        filter: A filter definition object, as for `records.list`.
+        table_oid: The identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        dry_run: If true, only count the records which would be deleted.
+
+    Returns:
+        The number of records deleted (or which would be deleted).
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        num_deleted = record_delete.delete_records_where(
+            conn,
+            filter,
+            table_oid,
+            dry_run=dry_run,
+        )
+    return num_deleted
+
+
 @rpc_method(name="records.search")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -401,6 +637,10 @@ def search(
         search_params: list[SearchParam] = [],
         limit: int = 10,
         return_record_summaries: bool = False,
+        cursor: str = None,
+        count_mode: Literal["exact", "none"] = "exact",
+        use_search_indexes: bool = False,
+        request_id: str = None,
         **kwargs
 ) -> RecordList:
     """
@@ -419,17 +659,47 @@ def search(
         search_params: Results are ranked and filtered according to the
                        objects passed here.
         limit: The maximum number of rows we'll return.
+        return_record_summaries: Whether to return summaries of retrieved
+            records.
+        cursor: The `next_cursor` from a previous call with the same
+            `search_params`. If given, only records ranked after the one
+            it points to are returned.
+        count_mode: `exact` to count all matching records, or `none` to
+            skip counting them, which saves a scan of the table.
+        use_search_indexes: Whether to filter records in a way which can
+            use the indexes managed with `tables.search_indexes`. The
+            same records are found either way.
+        request_id: An id for the request, chosen by the client. If an
+            earlier request with the same id is still running, it's
+            cancelled. E.g., a record selector can pass the same id with
+            each search, so that only the latest search keeps running.
 
     Returns:
         The requested records, along with some metadata.
     """
     user = kwargs.get(REQUEST_KEY).user
-    with connect(database_id, user) as conn:
+    with _connect_for_records(database_id, user, request_id) as conn:
         record_info = record_select.search_records_from_table(
             conn,
             table_oid,
             search=search_params,
             limit=limit,
             return_record_summaries=return_record_summaries,
+            cursor=cursor,
+            count_mode=count_mode,
+            use_search_indexes=use_search_indexes,
         )
     return RecordList.from_dict(record_info)
+
+
+def _connect_for_records(database_id, user, request_id):
+    """Connect with the timeouts configured for listing and searching records."""
+    return connect(
+        database_id,
+        user,
+        statement_timeout=settings.MATHESAR_RECORDS_STATEMENT_TIMEOUT or None,
+        idle_in_transaction_session_timeout=(
+            settings.MATHESAR_RECORDS_IDLE_IN_TRANSACTION_TIMEOUT or None
+        ),
+        request_id=request_id,
+    )
@@ -11,6 +11,7 @@ from db.schemas.operations.create import create_schema
 from db.schemas.operations.select import list_schemas
 from db.schemas.operations.drop import drop_schema_via_oid
 from db.schemas.operations.alter import patch_schema
+from mathesar.database.catalog_cache import get_cached_listing
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
 from mathesar.rpc.utils import connect
 
@@ -85,6 +86,9 @@ def list_(*, database_id: int, **kwargs) -> list[SchemaInfo]:
     """
     List information about schemas in a database. Exposed as `list`.
 
+    The listing is cached for as long as the database's catalog doesn't
+    change (see `mathesar.database.catalog_cache`).
+
     Args:
         database_id: The Django id of the database containing the table.
 
@@ -93,7 +97,7 @@ def list_(*, database_id: int, **kwargs) -> list[SchemaInfo]:
     """
     user = kwargs.get(REQUEST_KEY).user
     with connect(database_id, user) as conn:
-        schemas = list_schemas(conn)
+        schemas = get_cached_listing(conn, ('schemas',), list_schemas)
 
     return [s for s in schemas if s['name'] not in INTERNAL_SCHEMAS]
 
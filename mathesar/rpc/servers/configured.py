@@ -1,8 +1,11 @@
 from typing import TypedDict
 
 from modernrpc.core import rpc_method
-from modernrpc.auth.basic import http_basic_auth_login_required
+from modernrpc.auth.basic import (
+    http_basic_auth_login_required, http_basic_auth_superuser_required
+)
 
+from mathesar.database.pool import get_pool_stats
 from mathesar.models.base import Server
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
 
@@ -29,6 +32,35 @@ class ConfiguredServerInfo(TypedDict):
         )
 
 
+class ConnectionPoolInfo(TypedDict):
+    """
+    Usage statistics for a pool of connections to a user database.
+
+    Attributes:
+        host: The host of the database server.
+        port: The port of the database server.
+        database: The name of the database on the server.
+        role: The name of the role used by connections in the pool.
+        stats: Counters and gauges reported by the pool, e.g.,
+            `pool_size`, `pool_available`, `requests_waiting`.
+    """
+    host: str
+    port: int
+    database: str
+    role: str
+    stats: dict[str, int]
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            host=d["host"],
+            port=d["port"],
+            database=d["database"],
+            role=d["role"],
+            stats=d["stats"],
+        )
+
+
 @rpc_method(name="servers.configured.list")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -42,3 +74,16 @@ def list_() -> list[ConfiguredServerInfo]:
     server_qs = Server.objects.all()
 
     return [ConfiguredServerInfo.from_model(db_model) for db_model in server_qs]
+
+
+@rpc_method(name="servers.configured.list_connection_pools")
+@http_basic_auth_superuser_required
+@handle_rpc_exceptions
+def list_connection_pools() -> list[ConnectionPoolInfo]:
+    """
+    List usage statistics for the connection pools of this process.
+
+    Returns:
+        A list of connection pool details.
+    """
+    return [ConnectionPoolInfo.from_dict(pool) for pool in get_pool_stats()]
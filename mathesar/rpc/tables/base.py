@@ -1,7 +1,7 @@
 """
 Classes and functions exposed to the RPC endpoint for managing tables in a database.
 """
-from typing import Literal, Optional, TypedDict
+from typing import Literal, Optional, TypedDict, Union
 
 from modernrpc.core import rpc_method, REQUEST_KEY
 from modernrpc.auth.basic import http_basic_auth_login_required
@@ -10,10 +10,14 @@ from db.tables.operations.select import get_table_info, get_table, list_joinable
 from db.tables.operations.drop import drop_table_from_database
 from db.tables.operations.create import create_table_on_database
 from db.tables.operations.alter import alter_table_on_database
-from db.tables.operations.import_ import import_csv, get_preview
+from db.tables.operations.import_ import (
+    import_data_file, get_data_file_preview, get_preview
+)
+from mathesar.database.catalog_cache import get_cached_listing
 from mathesar.rpc.columns import CreatableColumnInfo, SettableColumnInfo, PreviewableColumnInfo
 from mathesar.rpc.constraints import CreatableConstraintInfo
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.rpc.jobs import JobInfo, submit_rpc_job
 from mathesar.rpc.tables.metadata import TableMetaDataBlob
 from mathesar.rpc.utils import connect
 from mathesar.utils.tables import list_tables_meta_data, get_table_meta_data
@@ -63,6 +67,32 @@ class AddedTableInfo(TypedDict):
     name: str
 
 
+class DataFilePreviewColumn(TypedDict):
+    """
+    Information about a column of a data file, as found by previewing it.
+
+    Attributes:
+        id: The `attnum` the column will have in the imported table.
+        name: The name of the column.
+        type: The type inferred for the column.
+    """
+    id: int
+    name: str
+    type: str
+
+
+class DataFilePreview(TypedDict):
+    """
+    A preview of a data file, before it's imported.
+
+    Attributes:
+        columns: The columns of the file, with their inferred types.
+        records: The first records of the file, cast to those types.
+    """
+    columns: list[DataFilePreviewColumn]
+    records: list[dict]
+
+
 class SettableTableInfo(TypedDict):
     """
     Information about a table, restricted to settable fields.
@@ -280,24 +310,85 @@ def import_(
     database_id: int,
     table_name: str = None,
     comment: str = None,
+    columns: list[PreviewableColumnInfo] = None,
+    as_job: bool = False,
     **kwargs
-) -> AddedTableInfo:
+) -> Union[AddedTableInfo, JobInfo]:
     """
-    Import a CSV/TSV into a table.
+    Import a CSV/TSV or Excel file into a table.
 
     Args:
-        data_file_id: The Django id of the DataFile containing desired CSV/TSV.
+        data_file_id: The Django id of the DataFile containing desired CSV/TSV/Excel.
         schema_oid: Identity of the schema in the user's database.
         database_id: The Django id of the database containing the table.
         table_name: Name of the table to be imported.
         comment: The comment for the new table.
+        columns: Types to give the columns of the new table once it's
+            filled, e.g. as confirmed after `tables.preview_data_file`.
+        as_job: Whether to run in the background. If true, information
+            about the job is returned, and the result is found with
+            `jobs.get`.
 
     Returns:
         The `oid` and `name` of the created table.
     """
     user = kwargs.get(REQUEST_KEY).user
+    if as_job:
+        return submit_rpc_job(
+            "tables.import",
+            user,
+            database_id,
+            lambda conn, report_progress: import_data_file(
+                data_file_id,
+                table_name,
+                schema_oid,
+                conn,
+                comment,
+                progress_callback=lambda done, total: report_progress(
+                    done / total if total else 1
+                ),
+                columns=columns
+            )
+        )
+    with connect(database_id, user) as conn:
+        return import_data_file(
+            data_file_id, table_name, schema_oid, conn, comment, columns=columns
+        )
+
+
+@rpc_method(name="tables.preview_data_file")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def preview_data_file(
+    *,
+    data_file_id: int,
+    database_id: int,
+    sample_size: int = 1000,
+    limit: int = 20,
+    **kwargs
+) -> DataFilePreview:
+    """
+    Preview a data file before importing it, inferring its column types.
+
+    Only the first `sample_size` records of the file are loaded (into a
+    temporary table), so this is quick even for big files. The types found
+    can then be adjusted, and passed to `tables.import` as its `columns`.
+
+    Args:
+        data_file_id: The Django id of the DataFile to preview.
+        database_id: The Django id of the database to import into.
+        sample_size: The number of records to infer the column types from.
+        limit: The upper limit for the number of records to return.
+
+    Returns:
+        The columns of the file, with their inferred types, and the first
+        records of the file, cast to those types.
+    """
+    user = kwargs.get(REQUEST_KEY).user
     with connect(database_id, user) as conn:
-        return import_csv(data_file_id, table_name, schema_oid, conn, comment)
+        return DataFilePreview(
+            **get_data_file_preview(data_file_id, conn, sample_size, limit)
+        )
 
 
 @rpc_method(name="tables.get_import_preview")
@@ -362,6 +453,10 @@ def list_with_metadata(*, schema_oid: int, database_id: int, **kwargs) -> list:
     """
     List tables in a schema, along with the metadata associated with each table
 
+    The tables are cached for as long as the database's catalog doesn't
+    change (see `mathesar.database.catalog_cache`), while their metadata is
+    always read afresh.
+
     Args:
         schema_oid: PostgreSQL OID of the schema containing the tables.
         database_id: The Django id of the database containing the table.
@@ -371,7 +466,11 @@ def list_with_metadata(*, schema_oid: int, database_id: int, **kwargs) -> list:
     """
     user = kwargs.get(REQUEST_KEY).user
     with connect(database_id, user) as conn:
-        tables = get_table_info(schema_oid, conn)
+        tables = get_cached_listing(
+            conn,
+            ('tables', schema_oid),
+            lambda conn: get_table_info(schema_oid, conn)
+        )
 
     metadata_records = list_tables_meta_data(database_id)
     metadata_map = {
@@ -0,0 +1,109 @@
+"""
+Classes and functions exposed to the RPC endpoint for managing the indexes
+used to search the records of a table.
+
+With these indexes, `records.search` can be called with
+`use_search_indexes` set, so that searching a big table doesn't need to
+scan all of it.
+"""
+from typing import TypedDict
+
+from modernrpc.core import rpc_method, REQUEST_KEY
+from modernrpc.auth.basic import http_basic_auth_login_required
+
+from db.tables.operations.search_indexes import (
+    add_search_index, drop_search_index, list_search_indexes
+)
+from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.rpc.utils import connect
+
+
+class SearchIndexInfo(TypedDict):
+    """
+    Information about an index used to search a column.
+
+    Attributes:
+        attnum: The attnum of the indexed column.
+        name: The name of the index.
+    """
+    attnum: int
+    name: str
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            attnum=d["attnum"],
+            name=d["name"]
+        )
+
+
+@rpc_method(name="tables.search_indexes.list")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def list_(*, table_oid: int, database_id: int, **kwargs) -> list[SearchIndexInfo]:
+    """
+    List the indexes usable for searching the columns of a table.
+
+    These are single column `pg_trgm` GIN indexes.
+
+    Args:
+        table_oid: The OID of the table whose search indexes we'll list.
+        database_id: The Django id of the database containing the table.
+
+    Returns:
+        A list of search indexes.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        raw_indexes = list_search_indexes(table_oid, conn)
+    return [SearchIndexInfo.from_dict(i) for i in raw_indexes]
+
+
+@rpc_method(name="tables.search_indexes.add")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def add(
+        *, table_oid: int, column_attnum: int, database_id: int, **kwargs
+) -> list[SearchIndexInfo]:
+    """
+    Add an index for searching a string column of a table.
+
+    Creates the `pg_trgm` extension if needed. Nothing is done if the
+    column already has a search index. Note that writes to the table are
+    blocked while the index is built.
+
+    Args:
+        table_oid: The OID of the table containing the column.
+        column_attnum: The attnum of the string column to index.
+        database_id: The Django id of the database containing the table.
+
+    Returns:
+        The search indexes of the table, after adding the new one.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        raw_indexes = add_search_index(table_oid, column_attnum, conn)
+    return [SearchIndexInfo.from_dict(i) for i in raw_indexes]
+
+
+@rpc_method(name="tables.search_indexes.delete")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def delete(
+        *, table_oid: int, column_attnum: int, database_id: int, **kwargs
+) -> list[SearchIndexInfo]:
+    """
+    Drop the search indexes of a column of a table.
+
+    Args:
+        table_oid: The OID of the table containing the column.
+        column_attnum: The attnum of the column whose indexes we'll drop.
+        database_id: The Django id of the database containing the table.
+
+    Returns:
+        The search indexes left on the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        raw_indexes = drop_search_index(table_oid, column_attnum, conn)
+    return [SearchIndexInfo.from_dict(i) for i in raw_indexes]
@@ -0,0 +1,72 @@
+"""
+Classes and functions exposed to the RPC endpoint for managing the cache of
+record summaries of a table.
+
+When the cache is enabled for a table, the summaries of records linked to
+its records (e.g., in `records.list`) are read from the cache, rather than
+computed from the whole table. Summaries are computed as before whenever
+the cache could be stale, e.g., after the summarized column's type changed.
+"""
+from modernrpc.core import rpc_method, REQUEST_KEY
+from modernrpc.auth.basic import http_basic_auth_login_required
+
+from db.tables.operations.summary_cache import (
+    disable_summary_cache, enable_summary_cache, refresh_summary_cache
+)
+from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.rpc.utils import connect
+
+
+@rpc_method(name="tables.summary_cache.enable")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def enable(*, table_oid: int, database_id: int, **kwargs) -> None:
+    """
+    Start caching the record summaries of a table.
+
+    The table must have a single-column primary key. The cache is filled
+    right away, and kept up to date by triggers on the table. If the
+    cache is already enabled, it's set up again.
+
+    Args:
+        table_oid: The OID of the table whose summaries we'll cache.
+        database_id: The Django id of the database containing the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        enable_summary_cache(table_oid, conn)
+
+
+@rpc_method(name="tables.summary_cache.refresh")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def refresh(*, table_oid: int, database_id: int, **kwargs) -> None:
+    """
+    Recompute all cached record summaries of a table.
+
+    This is only needed once the cache can't have been kept up to date,
+    e.g., after the type of the summarized column changed.
+
+    Args:
+        table_oid: The OID of the table whose summaries are cached.
+        database_id: The Django id of the database containing the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        refresh_summary_cache(table_oid, conn)
+
+
+@rpc_method(name="tables.summary_cache.disable")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def disable(*, table_oid: int, database_id: int, **kwargs) -> None:
+    """
+    Stop caching the record summaries of a table.
+
+    Args:
+        table_oid: The OID of the table whose summaries are cached.
+        database_id: The Django id of the database containing the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        disable_summary_cache(table_oid, conn)
@@ -1,15 +1,77 @@
-from mathesar.models.base import UserDatabaseRoleMap
+from contextlib import contextmanager
+import hashlib
 
+from mathesar.database.credentials import get_connection_params
+from mathesar.database.pool import get_pooled_connection
 
-def connect(database_id, user):
+
+@contextmanager
+def connect(
+        database_id,
+        user,
+        statement_timeout=None,
+        idle_in_transaction_session_timeout=None,
+        request_id=None,
+):
     """
-    Get a psycopg database connection.
+    Get a pooled psycopg database connection.
+
+    The connection is returned to its pool (rather than closed) at the
+    end of the `with` block in which it's used. Any settings given here
+    only apply until then.
 
     Args:
         database_id: The Django id of the Database used for connecting.
         user: A user model instance who'll connect to the database.
+        statement_timeout: If given, the number of milliseconds after
+            which any single query is cancelled.
+        idle_in_transaction_session_timeout: If given, the number of
+            milliseconds the connection may sit idle in its transaction
+            before the server closes it.
+        request_id: If given, queries still running on behalf of an
+            earlier request with the same id (from the same user, to the
+            same database) are cancelled. This lets a client abandon a
+            superseded request, e.g. a search for a string the user has
+            since typed further.
     """
-    user_database_role = UserDatabaseRoleMap.objects.get(
-        user=user, database__id=database_id
+    with get_pooled_connection(**get_connection_params(user, database_id)) as conn:
+        settings = {
+            'statement_timeout': statement_timeout,
+            'idle_in_transaction_session_timeout': idle_in_transaction_session_timeout,
+        }
+        if request_id is not None:
+            application_name = _get_request_application_name(
+                database_id, user, request_id
+            )
+            _cancel_request_queries(conn, application_name)
+            settings['application_name'] = application_name
+        settings = {k: str(v) for k, v in settings.items() if v is not None}
+        if settings:
+            # These are local to the transaction, which ends with the block.
+            conn.execute(
+                """
+                SELECT pg_catalog.set_config(name, value, true)
+                FROM unnest(%s::text[], %s::text[]) AS s(name, value)
+                """,
+                (list(settings.keys()), list(settings.values())),
+            )
+        yield conn
+
+
+def _get_request_application_name(database_id, user, request_id):
+    # Hashed, since application names are limited to 63 bytes.
+    digest = hashlib.sha256(
+        f'{database_id}:{user.id}:{request_id}'.encode()
+    ).hexdigest()
+    return f'mathesar_request_{digest[:32]}'
+
+
+def _cancel_request_queries(conn, application_name):
+    conn.execute(
+        """
+        SELECT pg_catalog.pg_cancel_backend(pid)
+        FROM pg_catalog.pg_stat_activity
+        WHERE application_name = %s AND pid <> pg_catalog.pg_backend_pid()
+        """,
+        (application_name,),
     )
-    return user_database_role.connection
@@ -1,6 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from mathesar.database.credentials import clear_connection_params_cache
+from mathesar.models.base import (
+    ConfiguredRole, Database, Server, UserDatabaseRoleMap
+)
 from mathesar.models.deprecated import (
     Column, Table, _set_default_preview_template,
     _create_table_settings,
@@ -27,3 +31,13 @@ def create_table_settings(**kwargs):
 def compute_preview_column_settings(**kwargs):
     instance = kwargs['instance']
     _set_default_preview_template(instance.table)
+
+
+@receiver([post_save, post_delete], sender=UserDatabaseRoleMap)
+@receiver([post_save, post_delete], sender=ConfiguredRole)
+@receiver([post_save, post_delete], sender=Database)
+@receiver([post_save, post_delete], sender=Server)
+def clear_cached_connection_params(**kwargs):
+    # Connection parameters are resolved from these models, so any change
+    # to them may invalidate what's cached.
+    clear_connection_params_cache()
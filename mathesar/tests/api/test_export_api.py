@@ -0,0 +1,94 @@
+"""
+This file tests the view streaming table exports.
+
+Fixtures:
+    client(mathesar conftest): A test client logged in as a superuser.
+    anonymous_client(mathesar conftest): A test client which isn't logged in.
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from django.core.exceptions import PermissionDenied
+from psycopg.errors import UndefinedTable
+import pytest
+
+from mathesar import views
+from mathesar.models.base import UserDatabaseRoleMap
+
+EXPORT_URL = '/api/export/v0/tables/'
+
+
+@pytest.fixture
+def mock_export(monkeypatch):
+    calls = []
+
+    def mock_get_table_name(user, database_id, table_oid):
+        if table_oid == 404:
+            raise UndefinedTable(f'Relation with OID {table_oid} does not exist')
+        if table_oid == 403:
+            raise PermissionDenied
+        if database_id == 403:
+            raise UserDatabaseRoleMap.DoesNotExist
+        return 'My Table'
+
+    def mock_stream_table_export(
+            user, database_id, table_oid, format='csv', order=None, filter=None
+    ):
+        calls.append((database_id, table_oid, format, order, filter))
+        if format == 'csv':
+            yield b'id,name\n'
+            yield b'1,alice\n'
+        else:
+            yield b'{"id": 1, "name": "alice"}\n'
+
+    monkeypatch.setattr(views, 'get_table_name', mock_get_table_name)
+    monkeypatch.setattr(views, 'stream_table_export', mock_stream_table_export)
+    return calls
+
+
+def test_export_table_csv(client, mock_export):
+    response = client.get(
+        EXPORT_URL,
+        {'database_id': 1, 'table_oid': 2254329, 'order': '[{"attnum": 2, "direction": "desc"}]'}
+    )
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv'
+    assert response['Content-Disposition'] == 'attachment; filename="My Table.csv"'
+    assert b''.join(response.streaming_content) == b'id,name\n1,alice\n'
+    assert mock_export == [(1, 2254329, 'csv', [{"attnum": 2, "direction": "desc"}], None)]
+
+
+def test_export_table_jsonl(client, mock_export):
+    response = client.get(
+        EXPORT_URL, {'database_id': 1, 'table_oid': 2254329, 'format': 'jsonl'}
+    )
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert response['Content-Disposition'] == 'attachment; filename="My Table.jsonl"'
+    assert b''.join(response.streaming_content) == b'{"id": 1, "name": "alice"}\n'
+
+
+def test_export_table_invalid_format(client, mock_export):
+    response = client.get(
+        EXPORT_URL, {'database_id': 1, 'table_oid': 2254329, 'format': 'xlsx'}
+    )
+    assert response.status_code == 400
+    assert 'format' in response.json()
+    assert mock_export == []
+
+
+@pytest.mark.parametrize('database_id,table_oid', [(1, 403), (403, 2254329)])
+def test_export_table_permission_denied(client, mock_export, database_id, table_oid):
+    response = client.get(EXPORT_URL, {'database_id': database_id, 'table_oid': table_oid})
+    assert response.status_code == 403
+    assert mock_export == []
+
+
+def test_export_table_missing_table(client, mock_export):
+    response = client.get(EXPORT_URL, {'database_id': 1, 'table_oid': 404})
+    assert response.status_code == 404
+    assert mock_export == []
+
+
+def test_export_table_anonymous(anonymous_client, mock_export):
+    response = anonymous_client.get(EXPORT_URL, {'database_id': 1, 'table_oid': 2254329})
+    assert response.status_code == 302
+    assert mock_export == []
@@ -0,0 +1,89 @@
+"""
+This file tests the cache of schema and table listings.
+
+Fixtures:
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+    settings(pytest-django): Lets you override Django settings.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from mathesar.database import catalog_cache
+
+
+class MockResult:
+    def __init__(self, value):
+        self.value = value
+
+    def fetchone(self):
+        return [self.value]
+
+
+@pytest.fixture
+def mock_conn(monkeypatch):
+    conn = SimpleNamespace(
+        info=SimpleNamespace(host='localhost', port=5432, dbname='mydb', user='alice'),
+        catalog_version='v1',
+    )
+
+    def mock_exec_msar_func(_conn, func_name):
+        assert func_name == 'get_listing_catalog_version'
+        return MockResult(_conn.catalog_version)
+
+    monkeypatch.setattr(catalog_cache, '_cache', {})
+    monkeypatch.setattr(catalog_cache, 'exec_msar_func', mock_exec_msar_func)
+    return conn
+
+
+@pytest.fixture
+def get_listing():
+    calls = []
+
+    def mock_get_listing(conn):
+        calls.append(conn.catalog_version)
+        return [{"oid": 2200, "name": "public"}]
+    mock_get_listing.calls = calls
+    return mock_get_listing
+
+
+def test_get_cached_listing(mock_conn, get_listing, settings):
+    settings.MATHESAR_CATALOG_CACHE_TTL = 60
+    listing_one = catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    listing_two = catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    assert listing_one == listing_two == [{"oid": 2200, "name": "public"}]
+    assert get_listing.calls == ['v1']
+
+
+def test_get_cached_listing_catalog_changed(mock_conn, get_listing, settings):
+    settings.MATHESAR_CATALOG_CACHE_TTL = 60
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    mock_conn.catalog_version = 'v2'
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    assert get_listing.calls == ['v1', 'v2']
+
+
+def test_get_cached_listing_keys(mock_conn, get_listing, settings):
+    settings.MATHESAR_CATALOG_CACHE_TTL = 60
+    catalog_cache.get_cached_listing(mock_conn, ('tables', 2200), get_listing)
+    catalog_cache.get_cached_listing(mock_conn, ('tables', 2201), get_listing)
+    mock_conn.info.user = 'bob'
+    catalog_cache.get_cached_listing(mock_conn, ('tables', 2200), get_listing)
+    assert len(get_listing.calls) == 3
+
+
+def test_get_cached_listing_expired(mock_conn, get_listing, settings):
+    settings.MATHESAR_CATALOG_CACHE_TTL = 0
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    assert len(get_listing.calls) == 2
+    assert len(catalog_cache._cache) == 1
+
+
+def test_clear_catalog_cache(mock_conn, get_listing, settings):
+    settings.MATHESAR_CATALOG_CACHE_TTL = 60
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    catalog_cache.clear_catalog_cache()
+    catalog_cache.get_cached_listing(mock_conn, ('schemas',), get_listing)
+    assert len(get_listing.calls) == 2
@@ -0,0 +1,52 @@
+"""
+This file tests the connection parameter cache.
+
+Fixtures:
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+    settings(pytest-django): Lets you override Django settings.
+"""
+import pytest
+
+from mathesar.database import credentials
+from mathesar.models.users import User
+
+
+@pytest.fixture
+def mock_lookup(monkeypatch):
+    calls = []
+
+    def mock_get_connection_params_from_db(user, database_id):
+        calls.append((user.id, database_id))
+        return {"host": "localhost", "port": 5432, "dbname": "mydb", "role": user.username, "password": "pass1234"}
+
+    monkeypatch.setattr(credentials, '_cache', {})
+    monkeypatch.setattr(
+        credentials, '_get_connection_params_from_db', mock_get_connection_params_from_db
+    )
+    return calls
+
+
+def test_get_connection_params_cached(mock_lookup, settings):
+    settings.MATHESAR_CREDENTIAL_CACHE_TTL = 60
+    user = User(id=3, username='alice')
+    params_one = credentials.get_connection_params(user, 2)
+    params_two = credentials.get_connection_params(user, '2')
+    assert params_one == params_two
+    assert mock_lookup == [(3, 2)]
+
+
+def test_get_connection_params_expired(mock_lookup, settings):
+    settings.MATHESAR_CREDENTIAL_CACHE_TTL = 0
+    user = User(id=3, username='alice')
+    credentials.get_connection_params(user, 2)
+    credentials.get_connection_params(user, 2)
+    assert len(mock_lookup) == 2
+
+
+def test_clear_connection_params_cache(mock_lookup, settings):
+    settings.MATHESAR_CREDENTIAL_CACHE_TTL = 60
+    user = User(id=3, username='alice')
+    credentials.get_connection_params(user, 2)
+    credentials.clear_connection_params_cache()
+    credentials.get_connection_params(user, 2)
+    assert len(mock_lookup) == 2
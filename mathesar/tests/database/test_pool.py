@@ -0,0 +1,165 @@
+"""
+This file tests the connection pool registry.
+
+Fixtures:
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from contextlib import contextmanager
+from threading import Event, Thread
+
+import psycopg
+import pytest
+from psycopg_pool import PoolTimeout
+
+from mathesar.database import pool
+
+
+class MockConnectionPool:
+    opening = {}
+
+    def __init__(self, kwargs, **_):
+        self.kwargs = kwargs
+        self.closed = False
+        if kwargs['dbname'] in self.opening:
+            self.opening[kwargs['dbname']].wait(timeout=5)
+
+    def close(self):
+        self.closed = True
+
+    def wait(self, timeout=None):
+        if self.kwargs['password'] == 'wrong':
+            raise PoolTimeout(f'pool initialization incomplete after {timeout} sec')
+
+    @contextmanager
+    def connection(self):
+        if self.kwargs['password'] == 'timeout':
+            raise PoolTimeout('couldn\'t get a connection after 30.00 sec')
+        yield 'conn'
+
+    def get_stats(self):
+        return {"pool_size": 1, "pool_available": 1}
+
+    @staticmethod
+    def check_connection(conn):
+        pass
+
+
+@pytest.fixture
+def mock_pools(monkeypatch):
+    checked = []
+
+    def mock_check_connection(kwargs):
+        checked.append(kwargs['user'])
+        if kwargs['password'] in ('wrong', 'timeout'):
+            raise psycopg.OperationalError(
+                'password authentication failed for user "alice"'
+            )
+    monkeypatch.setattr(pool, 'ConnectionPool', MockConnectionPool)
+    monkeypatch.setattr(pool, '_check_connection', mock_check_connection)
+    monkeypatch.setattr(pool, '_pools', {})
+    monkeypatch.setattr(pool, '_pool_creation_locks', {})
+    monkeypatch.setattr(MockConnectionPool, 'opening', {})
+    return checked
+
+
+def test_get_pool_reuses_pool(mock_pools):
+    pool_one = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+    pool_two = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+    assert pool_one is pool_two
+
+
+def test_get_pool_per_role(mock_pools):
+    pool_one = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+    pool_two = pool._get_pool('localhost', 5432, 'mydb', 'bob', 'pass1')
+    assert pool_one is not pool_two
+    assert pool_two.kwargs['user'] == 'bob'
+
+
+def test_get_pool_replaces_on_password_change(mock_pools):
+    pool_one = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+    pool_two = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass2')
+    assert pool_one.closed is True
+    assert pool_two.closed is False
+    assert pool_two.kwargs['password'] == 'pass2'
+
+
+def test_get_pool_stats(mock_pools):
+    pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+    assert pool.get_pool_stats() == [
+        {
+            "host": "localhost",
+            "port": 5432,
+            "database": "mydb",
+            "role": "alice",
+            "stats": {"pool_size": 1, "pool_available": 1},
+        }
+    ]
+
+
+def test_close_all_pools(mock_pools):
+    pool_one = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+    pool.close_all_pools()
+    assert pool_one.closed is True
+    assert pool.get_pool_stats() == []
+
+
+def test_get_pooled_connection(mock_pools):
+    with pool.get_pooled_connection('localhost', 5432, 'mydb', 'alice', 'pass1') as conn:
+        assert conn == 'conn'
+    # No extra connection is made when the pool connects fine.
+    assert mock_pools == []
+
+
+def test_get_pool_raises_connection_error(mock_pools):
+    with pytest.raises(psycopg.OperationalError, match='password authentication failed'):
+        pool._get_pool('localhost', 5432, 'mydb', 'alice', 'wrong')
+    assert pool.get_pool_stats() == []
+    assert mock_pools == ['alice']
+
+
+def test_get_pool_doesnt_wait_for_other_databases(mock_pools):
+    slow_opened = MockConnectionPool.opening['slowdb'] = Event()
+    slow_pools = []
+    slow_thread = Thread(
+        target=lambda: slow_pools.append(
+            pool._get_pool('localhost', 5432, 'slowdb', 'alice', 'pass1')
+        )
+    )
+    slow_thread.start()
+    try:
+        fast_pool = pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+        assert fast_pool.kwargs['dbname'] == 'mydb'
+        assert slow_pools == []
+    finally:
+        slow_opened.set()
+        slow_thread.join()
+    assert slow_pools[0].kwargs['dbname'] == 'slowdb'
+
+
+def test_get_pool_created_once_for_concurrent_callers(mock_pools):
+    opened = MockConnectionPool.opening['mydb'] = Event()
+    pools = []
+    threads = [
+        Thread(
+            target=lambda: pools.append(
+                pool._get_pool('localhost', 5432, 'mydb', 'alice', 'pass1')
+            )
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    opened.set()
+    for thread in threads:
+        thread.join()
+    assert len(pools) == 3
+    assert pools[0] is pools[1] is pools[2]
+
+
+def test_get_pooled_connection_raises_connection_error_on_timeout(mock_pools):
+    # The credentials were fine when the pool was created, but aren't anymore.
+    with pytest.raises(psycopg.OperationalError) as exc_info:
+        with pool.get_pooled_connection('localhost', 5432, 'mydb', 'alice', 'timeout'):
+            pass
+    assert not isinstance(exc_info.value, PoolTimeout)
+    assert 'password authentication failed' in str(exc_info.value)
@@ -1,3 +1,6 @@
+import codecs
+import io
+
 import pytest
 
 from django.core.files import File
@@ -6,10 +9,12 @@ from sqlalchemy import text
 from mathesar.models.deprecated import DataFile, Schema
 from mathesar.errors import InvalidTableError
 from mathesar.imports.base import create_table_from_data_file
-from mathesar.imports.csv import get_sv_dialect, get_sv_reader
+from mathesar.imports import csv as csv_import
+from mathesar.imports.csv import get_file_encoding, get_sv_dialect, get_sv_reader
 from db.schemas.operations.create import create_schema_via_sql_alchemy
 from db.schemas.utils import get_schema_oid_from_name
 from db.constants import COLUMN_NAME_TEMPLATE
+from db.tables.operations import import_
 from psycopg.errors import DuplicateTable
 
 TEST_SCHEMA = "import_csv_schema"
@@ -212,3 +217,101 @@ def test_sv_get_header(file):
             "\"Application SN\"",
             "\"Title,Patent Expiration Date\"",
         ]
+
+
+@pytest.mark.parametrize('file,expected_encoding', [
+    ('mathesar/tests/data/non_unicode_files/cp1250.csv', 'windows-1250'),
+    ('mathesar/tests/data/non_unicode_files/utf_16_le.csv', 'utf_16_le'),
+])
+def test_get_file_encoding(file, expected_encoding):
+    with open(file, 'rb') as sv_file:
+        assert get_file_encoding(sv_file) == expected_encoding
+        assert sv_file.tell() == 0
+
+
+def test_get_file_encoding_reads_samples_only(monkeypatch):
+    monkeypatch.setattr(csv_import, 'ENCODING_SAMPLE_SIZE', 2 ** 10)
+    monkeypatch.setattr(csv_import, 'ENCODING_MAX_SAMPLE_SIZE', 2 ** 12)
+    read_sizes = []
+
+    class MockFile(io.BytesIO):
+        def read(self, size=-1):
+            read_sizes.append(size)
+            return super().read(size)
+
+    sv_file = MockFile(
+        b'name,city\n' + 'Müller,Straße in Köln\n'.encode('utf-8') * 10 ** 5
+    )
+    assert get_file_encoding(sv_file) == 'utf-8'
+    assert -1 not in read_sizes
+    assert sum(read_sizes) <= 2 ** 12 + 2 ** 10
+
+
+@pytest.mark.parametrize('encoding', ['utf-16', 'utf-8-sig'])
+def test_get_file_encoding_bom_reads_head_only(encoding, monkeypatch):
+    monkeypatch.setattr(csv_import, 'ENCODING_SAMPLE_SIZE', 2 ** 10)
+    monkeypatch.setattr(csv_import, 'ENCODING_MAX_SAMPLE_SIZE', 2 ** 12)
+    read_sizes = []
+
+    class MockFile(io.BytesIO):
+        def read(self, size=-1):
+            read_sizes.append(size)
+            return super().read(size)
+
+    sv_file = MockFile(
+        ('name,city\n' + 'Müller,Straße in Köln\n' * 10 ** 4).encode(encoding)
+    )
+    assert codecs.lookup(get_file_encoding(sv_file)).name == encoding
+    # Only the head of the file is read, and it's good enough at once.
+    assert -1 not in read_sizes
+    assert sum(read_sizes) <= 2 ** 10 + 4
+
+
+def test_get_file_encoding_ascii_sample(monkeypatch):
+    monkeypatch.setattr(csv_import, 'ENCODING_SAMPLE_SIZE', 2 ** 10)
+    sv_file = io.BytesIO(b'a,b\n' + b'plain,text\n' * 10 ** 4)
+    assert get_file_encoding(sv_file) == 'utf-8'
+
+
+class MockCopy:
+    def __init__(self):
+        self.data = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def write(self, data):
+        self.data.append(data)
+
+
+class MockCursor:
+    def __init__(self, copy):
+        self._copy = copy
+
+    def copy(self, copy_sql):
+        return self._copy
+
+
+@pytest.mark.parametrize('file_path,encoding,conversion_encoding', [
+    ('mathesar/tests/data/non_unicode_files/cp1250.csv', 'cp1250', 'cp1250'),
+    ('mathesar/tests/data/non_unicode_files/utf_16_le.csv', 'utf_16_le', 'utf-8'),
+])
+def test_insert_csv_records_in_chunks(file_path, encoding, conversion_encoding, monkeypatch):
+    monkeypatch.setattr(import_, 'COPY_READ_SIZE', 16)
+    copy = MockCopy()
+    conn = type('MockConnection', (), {'cursor': lambda self: MockCursor(copy)})()
+    progress = []
+    import_.insert_csv_records(
+        'COPY ...', file_path, encoding, conversion_encoding, conn,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+    with open(file_path, 'r', encoding=encoding) as csv_file:
+        expected_data = csv_file.read().encode(conversion_encoding)
+    assert len(copy.data) > 1
+    assert all(isinstance(data, bytes) for data in copy.data)
+    assert b''.join(copy.data) == expected_data
+    assert progress[-1][0] == progress[-1][1]
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
@@ -4,6 +4,8 @@ from django.core.files import File
 
 from mathesar.models.deprecated import DataFile, Schema
 from mathesar.imports.base import create_table_from_data_file
+from mathesar.imports import excel
+from mathesar.imports.excel import get_excel_columns, iter_excel_records
 from db.schemas.utils import get_schema_oid_from_name
 from psycopg.errors import DuplicateTable
 
@@ -81,3 +83,52 @@ def test_excel_upload_table_imported_to(data_file, engine_with_schema):
     table = create_table_from_data_file(data_file, "NASA", schema)
     data_file.refresh_from_db()
     assert data_file.table_imported_to == table
+
+
+def test_get_excel_columns_skips_empty_rows_and_columns():
+    file_path = 'mathesar/tests/data/excel_parsing/misaligned_table.xlsx'
+    column_names, column_indexes = get_excel_columns(file_path)
+    assert column_names == ['Name', 'Age', 'Gender']
+    assert column_indexes == [1, 2, 3]
+    records = list(iter_excel_records(file_path, column_indexes))
+    assert records[0] == ['John', 25, 'Male']
+    assert len(records) == 3
+
+
+def test_get_excel_columns_without_header(multiple_sheets_excel_filepath):
+    column_names, column_indexes = get_excel_columns(
+        multiple_sheets_excel_filepath, sheet_index=1, header=False
+    )
+    assert column_names == ['Column 0', 'Column 1', 'Column 2']
+    records = list(iter_excel_records(
+        multiple_sheets_excel_filepath, column_indexes, sheet_index=1, header=False
+    ))
+    assert len(records[0]) == 3
+
+
+def _mock_sheet(monkeypatch, rows):
+    rows_read = []
+
+    def mock_iter_excel_rows(file_path, sheet_index=0):
+        for row in rows:
+            rows_read.append(row)
+            yield row
+
+    monkeypatch.setattr(excel, 'iter_excel_rows', mock_iter_excel_rows)
+    return rows_read
+
+
+def test_get_excel_columns_max_rows(monkeypatch):
+    rows = [('a', None, 'c'), (None, None, None), (1, None, 3), (1, 2, 3)]
+    rows_read = _mock_sheet(monkeypatch, rows)
+    column_names, column_indexes = get_excel_columns('a.xlsx', max_rows=1)
+    assert column_names == ['a', 'c']
+    assert column_indexes == [0, 2]
+    assert len(rows_read) == 3
+
+
+def test_get_excel_columns_keeps_sheet_order(monkeypatch):
+    rows = [('a', None, 'c', None), (1, None, 3, None), (1, 2, 3, 4)]
+    _mock_sheet(monkeypatch, rows)
+    assert get_excel_columns('a.xlsx') == (['a', '', 'c', ''], [0, 1, 2, 3])
+    assert get_excel_columns('a.xlsx', max_rows=1) == (['a', 'c'], [0, 2])
@@ -212,12 +212,12 @@ def test_tables_import(rf, monkeypatch):
         else:
             raise AssertionError('incorrect parameters passed')
 
-    def mock_table_import(_data_file_id, table_name, _schema_oid, conn, comment):
+    def mock_table_import(_data_file_id, table_name, _schema_oid, conn, comment, columns=None):
         if _schema_oid != schema_oid and _data_file_id != data_file_id:
             raise AssertionError('incorrect parameters passed')
         return {"oid": 1964474, "name": "imported_table"}
     monkeypatch.setattr(tables.base, 'connect', mock_connect)
-    monkeypatch.setattr(tables.base, 'import_csv', mock_table_import)
+    monkeypatch.setattr(tables.base, 'import_data_file', mock_table_import)
     imported_table_info = tables.import_(
         data_file_id=10,
         table_name='imported_table',
@@ -228,6 +228,55 @@ def test_tables_import(rf, monkeypatch):
     assert imported_table_info == {"oid": 1964474, "name": "imported_table"}
 
 
+def test_tables_preview_data_file(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    data_file_id = 10
+    database_id = 11
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == 'alice':
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_data_file_preview(_data_file_id, conn, sample_size, limit):
+        if _data_file_id != data_file_id or sample_size != 500 or limit != 20:
+            raise AssertionError('incorrect parameters passed')
+        return {
+            'columns': [
+                {'id': 2, 'name': 'name', 'type': 'text'},
+                {'id': 3, 'name': 'length', 'type': 'numeric'},
+            ],
+            'records': [
+                {'name': 'a', 'length': Decimal('2.0')},
+                {'name': 'b', 'length': Decimal('5.22')},
+            ]
+        }
+    monkeypatch.setattr(tables.base, 'connect', mock_connect)
+    monkeypatch.setattr(tables.base, 'get_data_file_preview', mock_data_file_preview)
+    preview = tables.preview_data_file(
+        data_file_id=10,
+        database_id=11,
+        sample_size=500,
+        request=request
+    )
+    assert preview == {
+        'columns': [
+            {'id': 2, 'name': 'name', 'type': 'text'},
+            {'id': 3, 'name': 'length', 'type': 'numeric'},
+        ],
+        'records': [
+            {'name': 'a', 'length': Decimal('2.0')},
+            {'name': 'b', 'length': Decimal('5.22')},
+        ]
+    }
+
+
 def test_tables_preview(rf, monkeypatch):
     request = rf.post('/api/rpc/v0', data={})
     request.user = User(username='alice', password='pass1234')
@@ -0,0 +1,82 @@
+"""
+This file tests the table search index RPC functions.
+
+Fixtures:
+    rf(pytest-django): Provides mocked `Request` objects.
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from contextlib import contextmanager
+
+from mathesar.rpc.tables import search_indexes
+from mathesar.models.users import User
+
+
+@contextmanager
+def _mock_connect(database_id, user):
+    if database_id == 11 and user.username == 'alice':
+        try:
+            yield True
+        finally:
+            pass
+    else:
+        raise AssertionError('incorrect parameters passed')
+
+
+def test_search_indexes_list(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    table_oid = 2254329
+
+    def mock_list_search_indexes(_table_oid, conn):
+        if _table_oid != table_oid:
+            raise AssertionError('incorrect parameters passed')
+        return [
+            {"attnum": 2, "name": "mytable_name_idx"},
+            {"attnum": 4, "name": "mytable_email_idx"},
+        ]
+    monkeypatch.setattr(search_indexes, 'connect', _mock_connect)
+    monkeypatch.setattr(search_indexes, 'list_search_indexes', mock_list_search_indexes)
+    expect_search_indexes = [
+        search_indexes.SearchIndexInfo(attnum=2, name="mytable_name_idx"),
+        search_indexes.SearchIndexInfo(attnum=4, name="mytable_email_idx"),
+    ]
+    actual_search_indexes = search_indexes.list_(
+        table_oid=table_oid, database_id=11, request=request
+    )
+    assert actual_search_indexes == expect_search_indexes
+
+
+def test_search_indexes_add(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    table_oid = 2254329
+
+    def mock_add_search_index(_table_oid, column_attnum, conn):
+        if _table_oid != table_oid or column_attnum != 2:
+            raise AssertionError('incorrect parameters passed')
+        return [{"attnum": 2, "name": "mytable_name_idx"}]
+    monkeypatch.setattr(search_indexes, 'connect', _mock_connect)
+    monkeypatch.setattr(search_indexes, 'add_search_index', mock_add_search_index)
+    actual_search_indexes = search_indexes.add(
+        table_oid=table_oid, column_attnum=2, database_id=11, request=request
+    )
+    assert actual_search_indexes == [
+        search_indexes.SearchIndexInfo(attnum=2, name="mytable_name_idx")
+    ]
+
+
+def test_search_indexes_delete(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    table_oid = 2254329
+
+    def mock_drop_search_index(_table_oid, column_attnum, conn):
+        if _table_oid != table_oid or column_attnum != 2:
+            raise AssertionError('incorrect parameters passed')
+        return []
+    monkeypatch.setattr(search_indexes, 'connect', _mock_connect)
+    monkeypatch.setattr(search_indexes, 'drop_search_index', mock_drop_search_index)
+    actual_search_indexes = search_indexes.delete(
+        table_oid=table_oid, column_attnum=2, database_id=11, request=request
+    )
+    assert actual_search_indexes == []
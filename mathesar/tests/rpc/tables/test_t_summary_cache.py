@@ -0,0 +1,48 @@
+"""
+This file tests the table summary cache RPC functions.
+
+Fixtures:
+    rf(pytest-django): Provides mocked `Request` objects.
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from mathesar.rpc.tables import summary_cache
+from mathesar.models.users import User
+
+
+@contextmanager
+def _mock_connect(database_id, user):
+    if database_id == 11 and user.username == 'alice':
+        try:
+            yield True
+        finally:
+            pass
+    else:
+        raise AssertionError('incorrect parameters passed')
+
+
+@pytest.mark.parametrize(
+    'rpc_func_name,db_func_name', [
+        ('enable', 'enable_summary_cache'),
+        ('refresh', 'refresh_summary_cache'),
+        ('disable', 'disable_summary_cache'),
+    ]
+)
+def test_summary_cache(rf, monkeypatch, rpc_func_name, db_func_name):
+    request = rf.post('/api/rpc/v0', data={})
+    request.user = User(username='alice', password='pass1234')
+    table_oid = 2254329
+    called_with = []
+
+    def mock_db_func(_table_oid, conn):
+        called_with.append(_table_oid)
+    monkeypatch.setattr(summary_cache, 'connect', _mock_connect)
+    monkeypatch.setattr(summary_cache, db_func_name, mock_db_func)
+    result = getattr(summary_cache, rpc_func_name)(
+        table_oid=table_oid, database_id=11, request=request
+    )
+    assert result is None
+    assert called_with == [table_oid]
@@ -134,6 +134,85 @@ def test_suggest_types(rf, monkeypatch):
     )
 
 
+def test_suggest_types_as_job(rf, monkeypatch):
+    _username = 'alice'
+    _password = 'pass1234'
+    _table_oid = 12345
+    _database_id = 2
+    _job_info = {'id': 7, 'status': 'pending'}
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=_username, password=_password)
+
+    def mock_suggest_types(conn, table_oid):
+        if table_oid != _table_oid:
+            raise AssertionError('incorrect parameters passed')
+        return {'2': 'integer'}
+
+    def mock_submit_rpc_job(kind, user, database_id, func):
+        if (
+                kind != 'data_modeling.suggest_types'
+                or user.username != _username
+                or database_id != _database_id
+        ):
+            raise AssertionError('incorrect parameters passed')
+        assert func(True, lambda progress: None) == {'2': 'integer'}
+        return _job_info
+
+    monkeypatch.setattr(data_modeling, 'submit_rpc_job', mock_submit_rpc_job)
+    monkeypatch.setattr(data_modeling.infer_types, 'infer_table_column_data_types', mock_suggest_types)
+    actual_job_info = data_modeling.suggest_types(
+        table_oid=_table_oid,
+        database_id=_database_id,
+        as_job=True,
+        request=request,
+    )
+    assert actual_job_info == _job_info
+
+
+def test_suggest_types_from_sample(rf, monkeypatch):
+    _username = 'alice'
+    _password = 'pass1234'
+    _table_oid = 12345
+    _database_id = 2
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=_username, password=_password)
+
+    @contextmanager
+    def mock_connect(database_id, user):
+        if database_id == _database_id and user.username == _username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_suggest_types(conn, table_oid, sample_size=None, sample_percent=None):
+        if table_oid != _table_oid or sample_size != 500 or sample_percent is not None:
+            raise AssertionError('incorrect parameters passed')
+        return {
+            'types': {'2': 'integer'},
+            'sampled_rows': 500,
+            'total_rows': 10000,
+            'confidence': 0.05,
+        }
+
+    monkeypatch.setattr(data_modeling, 'connect', mock_connect)
+    monkeypatch.setattr(data_modeling.infer_types, 'suggest_table_column_data_types', mock_suggest_types)
+    actual_suggestions = data_modeling.suggest_types_from_sample(
+        table_oid=_table_oid,
+        database_id=_database_id,
+        sample_size=500,
+        request=request,
+    )
+    assert actual_suggestions == {
+        'types': {'2': 'integer'},
+        'sampled_rows': 500,
+        'total_rows': 10000,
+        'confidence': 0.05,
+    }
+
+
 def test_split_table(rf, monkeypatch):
     _username = 'alice'
     _password = 'pass1234'
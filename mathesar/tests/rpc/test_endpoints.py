@@ -15,6 +15,7 @@ from mathesar.rpc import constraints
 from mathesar.rpc import data_modeling
 from mathesar.rpc import databases
 from mathesar.rpc import explorations
+from mathesar.rpc import jobs
 from mathesar.rpc import records
 from mathesar.rpc import roles
 from mathesar.rpc import schemas
@@ -128,6 +129,11 @@ METHODS = [
         "data_modeling.suggest_types",
         [user_is_authenticated]
     ),
+    (
+        data_modeling.suggest_types_from_sample,
+        "data_modeling.suggest_types_from_sample",
+        [user_is_authenticated]
+    ),
     (
         data_modeling.split_table,
         "data_modeling.split_table",
@@ -214,16 +220,37 @@ METHODS = [
         [user_is_authenticated]
     ),
 
+    (
+        jobs.cancel,
+        "jobs.cancel",
+        [user_is_authenticated]
+    ),
+    (
+        jobs.get,
+        "jobs.get",
+        [user_is_authenticated]
+    ),
+
     (
         records.add,
         "records.add",
         [user_is_authenticated]
     ),
+    (
+        records.add_many,
+        "records.add_many",
+        [user_is_authenticated]
+    ),
     (
         records.delete,
         "records.delete",
         [user_is_authenticated]
     ),
+    (
+        records.delete_where,
+        "records.delete_where",
+        [user_is_authenticated]
+    ),
     (
         records.get,
         "records.get",
@@ -239,11 +266,21 @@ METHODS = [
         "records.patch",
         [user_is_authenticated]
     ),
+    (
+        records.patch_many,
+        "records.patch_many",
+        [user_is_authenticated]
+    ),
     (
         records.search,
         "records.search",
         [user_is_authenticated]
     ),
+    (
+        records.update_where,
+        "records.update_where",
+        [user_is_authenticated]
+    ),
 
     (
         roles.list_,
@@ -324,6 +361,11 @@ METHODS = [
         "servers.configured.list",
         [user_is_authenticated]
     ),
+    (
+        servers.configured.list_connection_pools,
+        "servers.configured.list_connection_pools",
+        [user_is_superuser]
+    ),
 
     (
 
@@ -382,6 +424,11 @@ METHODS = [
         "tables.patch",
         [user_is_authenticated]
     ),
+    (
+        tables.preview_data_file,
+        "tables.preview_data_file",
+        [user_is_authenticated]
+    ),
 
     (
         tables.privileges.list_direct,
@@ -399,6 +446,38 @@ METHODS = [
         [user_is_authenticated]
     ),
 
+    (
+        tables.search_indexes.add,
+        "tables.search_indexes.add",
+        [user_is_authenticated]
+    ),
+    (
+        tables.search_indexes.delete,
+        "tables.search_indexes.delete",
+        [user_is_authenticated]
+    ),
+    (
+        tables.search_indexes.list_,
+        "tables.search_indexes.list",
+        [user_is_authenticated]
+    ),
+
+    (
+        tables.summary_cache.disable,
+        "tables.summary_cache.disable",
+        [user_is_authenticated]
+    ),
+    (
+        tables.summary_cache.enable,
+        "tables.summary_cache.enable",
+        [user_is_authenticated]
+    ),
+    (
+        tables.summary_cache.refresh,
+        "tables.summary_cache.refresh",
+        [user_is_authenticated]
+    ),
+
     (
         tables.metadata.list_,
         "tables.metadata.list",
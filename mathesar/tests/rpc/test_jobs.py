@@ -0,0 +1,70 @@
+"""
+This file tests the background job RPC functions.
+
+Fixtures:
+    rf(pytest-django): Provides mocked `Request` objects.
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from mathesar.models.base import Job
+from mathesar.models.users import User
+from mathesar.rpc import jobs
+
+
+class MockJobManager:
+    def __init__(self, job, username):
+        self.job = job
+        self.username = username
+
+    def get(self, id, user):
+        if id != self.job.id or user.username != self.username:
+            raise AssertionError('incorrect parameters passed')
+        return self.job
+
+
+def _get_job():
+    return Job(
+        id=7,
+        database_id=2,
+        kind='tables.import',
+        status=Job.RUNNING,
+        progress=0.25,
+    )
+
+
+def test_jobs_get(rf, monkeypatch):
+    _username = 'alice'
+    _password = 'pass1234'
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=_username, password=_password)
+    monkeypatch.setattr(jobs.Job, 'objects', MockJobManager(_get_job(), _username))
+    expect_job_info = {
+        'id': 7,
+        'database_id': 2,
+        'kind': 'tables.import',
+        'status': 'running',
+        'progress': 0.25,
+        'result': None,
+        'error': None,
+    }
+    actual_job_info = jobs.get(job_id=7, request=request)
+    assert actual_job_info == expect_job_info
+
+
+def test_jobs_cancel(rf, monkeypatch):
+    _username = 'alice'
+    _password = 'pass1234'
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=_username, password=_password)
+    _job = _get_job()
+
+    def mock_cancel_job(job):
+        if job is not _job:
+            raise AssertionError('incorrect parameters passed')
+        job.status = Job.CANCELLING
+        return job
+
+    monkeypatch.setattr(jobs.Job, 'objects', MockJobManager(_job, _username))
+    monkeypatch.setattr(jobs, 'cancel_job', mock_cancel_job)
+    actual_job_info = jobs.cancel(job_id=7, request=request)
+    assert actual_job_info['status'] == 'cancelling'
+    assert actual_job_info['progress'] == 0.25
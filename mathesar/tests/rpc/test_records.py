@@ -7,6 +7,10 @@ Fixtures:
 """
 from contextlib import contextmanager
 
+import psycopg
+import pytest
+from modernrpc.exceptions import RPCException
+
 from mathesar.rpc import records
 from mathesar.models.users import User
 
@@ -20,7 +24,7 @@ def test_records_list(rf, monkeypatch):
     request.user = User(username=username, password=password)
 
     @contextmanager
-    def mock_connect(_database_id, user):
+    def mock_connect(_database_id, user, **connect_options):
         if _database_id == database_id and user.username == username:
             try:
                 yield True
@@ -38,11 +42,21 @@ def test_records_list(rf, monkeypatch):
             filter=None,
             group=None,
             return_record_summaries=False,
+            count_mode='exact',
+            count_limit=None,
+            cursor=None,
     ):
-        if _table_oid != table_oid or return_record_summaries is False:
+        if (
+                _table_oid != table_oid
+                or return_record_summaries is False
+                or count_mode != 'capped'
+                or count_limit != 50000
+                or cursor != 'eyIxIjogMn0='
+        ):
             raise AssertionError('incorrect parameters passed')
         return {
-            "count": 50123,
+            "count": 50000,
+            "count_mode": "capped",
             "results": [{"1": "abcde", "2": 12345}, {"1": "fghij", "2": 67890}],
             "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
             "grouping": {
@@ -52,13 +66,15 @@ def test_records_list(rf, monkeypatch):
                 ]
             },
             "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
-            "record_summaries": {"3": "abcde"}
+            "record_summaries": {"3": "abcde"},
+            "next_cursor": "eyIxIjogNH0=",
         }
 
     monkeypatch.setattr(records, 'connect', mock_connect)
     monkeypatch.setattr(records.record_select, 'list_records_from_table', mock_list_records)
     expect_records_list = {
-        "count": 50123,
+        "count": 50000,
+        "count_mode": "capped",
         "results": [{"1": "abcde", "2": 12345}, {"1": "fghij", "2": 67890}],
         "grouping": {
             "columns": [2],
@@ -68,17 +84,39 @@ def test_records_list(rf, monkeypatch):
         },
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "record_summaries": {"3": "abcde"},
+        "next_cursor": "eyIxIjogNH0=",
         "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
     }
     actual_records_list = records.list_(
         table_oid=table_oid,
         database_id=database_id,
         return_record_summaries=True,
+        count_mode='capped',
+        count_limit=50000,
+        cursor='eyIxIjogMn0=',
         request=request
     )
     assert actual_records_list == expect_records_list
 
 
+@pytest.mark.parametrize('count_limit', [None, 0, -5])
+def test_records_list_capped_count_without_limit(rf, monkeypatch, count_limit):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+
+    def mock_connect(*args, **kwargs):
+        raise AssertionError('the database should not be queried')
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    with pytest.raises(RPCException, match='ValueError: count_limit'):
+        records.list_(
+            table_oid=23457,
+            database_id=2,
+            count_mode='capped',
+            count_limit=count_limit,
+            request=request
+        )
+
+
 def test_records_get(rf, monkeypatch):
     username = 'alice'
     password = 'pass1234'
@@ -108,6 +146,7 @@ def test_records_get(rf, monkeypatch):
             raise AssertionError('incorrect parameters passed')
         return {
             "count": 1,
+            "count_mode": "exact",
             "results": [{"1": "abcde", "2": 12345}, {"1": "fghij", "2": 67890}],
             "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
             "grouping": None,
@@ -119,10 +158,12 @@ def test_records_get(rf, monkeypatch):
     monkeypatch.setattr(records.record_select, 'get_record_from_table', mock_get_record)
     expect_record = {
         "count": 1,
+        "count_mode": "exact",
         "results": [{"1": "abcde", "2": 12345}, {"1": "fghij", "2": 67890}],
         "grouping": None,
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "record_summaries": {"3": "abcde"},
+        "next_cursor": None,
         "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
     }
     actual_record = records.get(
@@ -185,6 +226,63 @@ def test_records_add(rf, monkeypatch):
     assert actual_record == expect_record
 
 
+def test_records_add_many(rf, monkeypatch):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    record_defs = [{"1": 3, "2": "arecord"}, {"2": "another"}]
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_add_records(
+            conn,
+            _record_defs,
+            _table_oid,
+            on_conflict='error',
+            return_record_summaries=False,
+    ):
+        if (
+                _table_oid != table_oid
+                or _record_defs != record_defs
+                or on_conflict != 'update'
+                or return_record_summaries is False
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return {
+            "results": [{"1": 3, "2": "arecord"}, {"1": 4, "2": "another"}],
+            "linked_record_summaries": None,
+            "record_summaries": {"3": "arecord", "4": "another"},
+        }
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_insert, 'add_records_to_table', mock_add_records)
+    expect_records = {
+        "results": [{"1": 3, "2": "arecord"}, {"1": 4, "2": "another"}],
+        "linked_record_summaries": None,
+        "record_summaries": {"3": "arecord", "4": "another"},
+    }
+    actual_records = records.add_many(
+        record_defs=record_defs,
+        table_oid=table_oid,
+        database_id=database_id,
+        on_conflict='update',
+        return_record_summaries=True,
+        request=request
+    )
+    assert actual_records == expect_records
+
+
 def test_records_patch(rf, monkeypatch):
     username = 'alice'
     password = 'pass1234'
@@ -243,6 +341,63 @@ def test_records_patch(rf, monkeypatch):
     assert actual_record == expect_record
 
 
+def test_records_patch_many(rf, monkeypatch):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    record_patches = [
+        {"record_id": 243, "record_def": {"2": "arecord"}},
+        {"record_id": 12, "record_def": {"2": "another"}},
+    ]
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_patch_records(
+            conn,
+            _record_patches,
+            _table_oid,
+            return_record_summaries=False,
+    ):
+        if (
+                _table_oid != table_oid
+                or _record_patches != record_patches
+                or return_record_summaries is False
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return {
+            "results": [{"1": 243, "2": "arecord"}, {"1": 12, "2": "another"}],
+            "linked_record_summaries": None,
+            "record_summaries": {"243": "arecord", "12": "another"},
+        }
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_update, 'patch_records_in_table', mock_patch_records)
+    expect_records = {
+        "results": [{"1": 243, "2": "arecord"}, {"1": 12, "2": "another"}],
+        "linked_record_summaries": None,
+        "record_summaries": {"243": "arecord", "12": "another"},
+    }
+    actual_records = records.patch_many(
+        record_patches=record_patches,
+        table_oid=table_oid,
+        database_id=database_id,
+        return_record_summaries=True,
+        request=request
+    )
+    assert actual_records == expect_records
+
+
 def test_records_delete(rf, monkeypatch):
     username = 'alice'
     password = 'pass1234'
@@ -280,11 +435,55 @@ def test_records_delete(rf, monkeypatch):
     assert actual_result == expect_result
 
 
-def test_records_search(rf, monkeypatch):
+def test_records_delete_where(rf, monkeypatch):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    filter_ = {
+        "type": "lesser",
+        "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}],
+    }
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_delete_records_where(conn, _filter, _table_oid, dry_run=False):
+        if _table_oid != table_oid or _filter != filter_ or dry_run is False:
+            raise AssertionError('incorrect parameters passed')
+        return 12
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_delete, 'delete_records_where', mock_delete_records_where)
+    actual_result = records.delete_where(
+        filter=filter_,
+        table_oid=table_oid,
+        database_id=database_id,
+        dry_run=True,
+        request=request
+    )
+    assert actual_result == 12
+
+
+def test_records_update_where(rf, monkeypatch):
     username = 'alice'
     password = 'pass1234'
     table_oid = 23457
     database_id = 2
+    record_def = {"3": "archived"}
+    filter_ = {
+        "type": "lesser",
+        "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 10}],
+    }
     request = rf.post('/api/rpc/v0/', data={})
     request.user = User(username=username, password=password)
 
@@ -298,14 +497,95 @@ def test_records_search(rf, monkeypatch):
         else:
             raise AssertionError('incorrect parameters passed')
 
+    def mock_update_records_where(conn, _record_def, _filter, _table_oid, dry_run=False):
+        if (
+                _table_oid != table_oid
+                or _record_def != record_def
+                or _filter != filter_
+                or dry_run is True
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return 7
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_update, 'update_records_where', mock_update_records_where)
+    actual_result = records.update_where(
+        record_def=record_def,
+        filter=filter_,
+        table_oid=table_oid,
+        database_id=database_id,
+        request=request
+    )
+    assert actual_result == 7
+
+
+@pytest.mark.parametrize('filter_', [{}, {"type": "nope", "args": []}])
+@pytest.mark.parametrize(
+    'rpc_func,rpc_kwargs,msar_func',
+    [
+        (records.delete_where, {}, 'delete_records_where'),
+        (records.update_where, {'record_def': {"3": "archived"}}, 'update_records_where'),
+    ]
+)
+def test_records_where_invalid_filter(rf, monkeypatch, filter_, rpc_func, rpc_kwargs, msar_func):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    queries = []
+
+    class MockConnection:
+        def execute(self, query, args):
+            queries.append(query)
+            raise psycopg.errors.RaiseException(f'Invalid filter: {args[1]}')
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        yield MockConnection()
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    with pytest.raises(RPCException, match='RaiseException: Invalid filter'):
+        rpc_func(
+            filter=filter_,
+            table_oid=23457,
+            database_id=2,
+            request=request,
+            **rpc_kwargs
+        )
+    assert len(queries) == 1 and f'msar.{msar_func}(' in queries[0]
+
+
+def test_records_search(rf, monkeypatch):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = 2
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user, request_id=None, **connect_options):
+        if (
+                _database_id == database_id
+                and user.username == username
+                and request_id == 'record-selector'
+        ):
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
     def mock_search_records(
             conn,
             _table_oid,
             search=[],
             limit=10,
             return_record_summaries=False,
+            cursor=None,
+            count_mode='exact',
+            use_search_indexes=False,
     ):
-        if _table_oid != table_oid or return_record_summaries is False:
+        if _table_oid != table_oid or return_record_summaries is False or cursor is not None:
             raise AssertionError('incorrect parameters passed')
         return {
             "count": 50123,
@@ -319,16 +599,19 @@ def test_records_search(rf, monkeypatch):
     monkeypatch.setattr(records.record_select, 'search_records_from_table', mock_search_records)
     expect_records_list = {
         "count": 50123,
+        "count_mode": "exact",
         "results": [{"1": "abcde", "2": 12345}, {"1": "fghij", "2": 67890}],
         "grouping": None,
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "record_summaries": {"3": "abcde"},
+        "next_cursor": None,
         "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
     }
     actual_records_list = records.search(
         table_oid=table_oid,
         database_id=database_id,
         return_record_summaries=True,
+        request_id='record-selector',
         request=request
     )
     assert actual_records_list == expect_records_list
@@ -0,0 +1,79 @@
+"""
+This file tests the helpers shared by RPC functions.
+
+Fixtures:
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from contextlib import contextmanager
+
+from mathesar.models.users import User
+from mathesar.rpc import utils
+
+
+class MockConnection:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((' '.join(query.split()), params))
+
+
+def _mock_pool(monkeypatch):
+    conn = MockConnection()
+
+    @contextmanager
+    def mock_get_pooled_connection(**params):
+        yield conn
+
+    monkeypatch.setattr(utils, 'get_connection_params', lambda user, database_id: {})
+    monkeypatch.setattr(utils, 'get_pooled_connection', mock_get_pooled_connection)
+    return conn
+
+
+def test_connect_without_options(monkeypatch):
+    conn = _mock_pool(monkeypatch)
+    with utils.connect(2, User(id=5, username='alice')) as actual_conn:
+        assert actual_conn is conn
+    assert conn.executed == []
+
+
+def test_connect_with_timeouts(monkeypatch):
+    conn = _mock_pool(monkeypatch)
+    with utils.connect(
+        2,
+        User(id=5, username='alice'),
+        statement_timeout=30000,
+        idle_in_transaction_session_timeout=60000,
+    ):
+        pass
+    assert len(conn.executed) == 1
+    query, params = conn.executed[0]
+    assert 'set_config(name, value, true)' in query
+    assert params == (
+        ['statement_timeout', 'idle_in_transaction_session_timeout'],
+        ['30000', '60000'],
+    )
+
+
+def test_connect_with_request_id(monkeypatch):
+    conn = _mock_pool(monkeypatch)
+    user = User(id=5, username='alice')
+    with utils.connect(2, user, request_id='record-selector'):
+        pass
+    application_name = utils._get_request_application_name(2, user, 'record-selector')
+    assert len(application_name) < 64
+    # Earlier queries for the same request id are cancelled first.
+    cancel_query, cancel_params = conn.executed[0]
+    assert 'pg_cancel_backend' in cancel_query
+    assert cancel_params == (application_name,)
+    assert conn.executed[1][1] == (['application_name'], [application_name])
+
+
+def test_request_application_name_is_scoped():
+    alice = User(id=5, username='alice')
+    bob = User(id=6, username='bob')
+    name = utils._get_request_application_name(2, alice, 'search')
+    assert name == utils._get_request_application_name(2, alice, 'search')
+    assert name != utils._get_request_application_name(2, bob, 'search')
+    assert name != utils._get_request_application_name(3, alice, 'search')
+    assert name != utils._get_request_application_name(2, alice, 'list')
@@ -0,0 +1,85 @@
+"""
+This file tests the background job runner.
+
+Fixtures:
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from mathesar.models.base import Job
+from mathesar.utils import jobs
+
+
+class MockJobQuerySet:
+    def __init__(self, job, id, status=None):
+        self.job = job
+        self.matches = id == job.id and status in (None, job.status)
+
+    def exists(self):
+        return self.matches
+
+    def update(self, **kwargs):
+        if not self.matches:
+            return 0
+        for key, value in kwargs.items():
+            setattr(self.job, key, value)
+        return 1
+
+
+class MockJobManager:
+    def __init__(self, job):
+        self.job = job
+
+    def filter(self, id, status=None):
+        return MockJobQuerySet(self.job, id, status)
+
+
+class MockConnection:
+    def __init__(self):
+        self.info = SimpleNamespace(backend_pid=1234)
+        self.is_committed = None
+
+    def execute(self, query, params=None):
+        pass
+
+
+@pytest.fixture
+def mock_job(monkeypatch):
+    job = Job(id=7, database_id=2, kind='tables.split', status=Job.PENDING)
+    conn = MockConnection()
+
+    @contextmanager
+    def mock_connect(database_id, user):
+        try:
+            yield conn
+            conn.is_committed = True
+        except Exception:
+            conn.is_committed = False
+            raise
+
+    monkeypatch.setattr(jobs.Job, 'objects', MockJobManager(job))
+    monkeypatch.setattr(jobs, 'connect', mock_connect)
+    monkeypatch.setattr(jobs.django_connection, 'close', lambda: None)
+    return SimpleNamespace(job=job, conn=conn)
+
+
+def test_run_job_succeeds(mock_job):
+    jobs._run_job(7, None, 2, lambda conn, report_progress: {'a': 1})
+    assert mock_job.job.status == Job.SUCCEEDED
+    assert mock_job.job.result == {'a': 1}
+    assert mock_job.conn.is_committed is True
+
+
+def test_run_job_cancelled_without_progress_reports(mock_job):
+    def func(conn, report_progress):
+        # E.g., `tables.split` never reports its progress.
+        mock_job.job.status = Job.CANCELLING
+        return {'a': 1}
+
+    jobs._run_job(7, None, 2, func)
+    assert mock_job.job.status == Job.CANCELLED
+    assert mock_job.job.result is None
+    assert mock_job.conn.is_committed is False
@@ -111,6 +111,7 @@ def create_datafile(data):
             delimiter=dialect.delimiter,
             escapechar=dialect.escapechar,
             quotechar=dialect.quotechar,
+            encoding=encoding,
         )
     else:
         max_level = data.get('max_level', 0)
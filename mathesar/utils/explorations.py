@@ -1,4 +1,4 @@
-from db.engine import create_future_engine_with_custom_types
+from db.engine import get_cached_engine_with_custom_types
 from db.records.operations.select import get_count
 from db.queries.base import DBQuery, InitialColumn, JoinParameter
 from db.tables.operations.select import get_table
@@ -48,7 +48,7 @@ def create_exploration(exploration_def):
 
 
 def run_exploration(exploration_def, database_id, conn, limit=100, offset=0):
-    engine = create_future_engine_with_custom_types(
+    engine = get_cached_engine_with_custom_types(
         conn.info.user,
         conn.info.password,
         conn.info.host,
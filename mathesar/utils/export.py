@@ -0,0 +1,64 @@
+"""
+Helpers for downloading the records of a table as a file.
+"""
+from django import forms
+from django.core.exceptions import PermissionDenied
+
+from db import connection as db_conn
+from db.records.operations.export import stream_records_from_table
+from mathesar.rpc.utils import connect
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class ExportTableQueryForm(forms.Form):
+    database_id = forms.IntegerField()
+    table_oid = forms.IntegerField()
+    format = forms.ChoiceField(
+        choices=[(f, f) for f in EXPORT_CONTENT_TYPES], required=False
+    )
+    order = forms.JSONField(required=False)
+    filter = forms.JSONField(required=False)
+
+    def clean_format(self):
+        return self.cleaned_data['format'] or 'csv'
+
+
+def get_table_name(user, database_id, table_oid):
+    """
+    Get the name of a table whose records the user may export.
+
+    This is checked before the export is streamed, since errors can't be
+    reported properly once the response has started.
+
+    Raises:
+        PermissionDenied: If the user can't read any column of the table.
+        UndefinedTable: If the table doesn't exist.
+    """
+    with connect(database_id, user) as conn:
+        table_name = db_conn.exec_msar_func(
+            conn, 'get_relation_name', table_oid
+        ).fetchone()[0]
+        can_select = conn.execute(
+            "SELECT pg_catalog.has_any_column_privilege(%s, 'SELECT')", (table_oid,)
+        ).fetchone()[0]
+    if not can_select:
+        raise PermissionDenied
+    return table_name
+
+
+def stream_table_export(
+        user, database_id, table_oid, format='csv', order=None, filter=None
+):
+    """
+    Stream the records of a table, for use in a `StreamingHttpResponse`.
+
+    A connection is held for as long as the export is being streamed.
+    """
+    with connect(database_id, user) as conn:
+        yield from stream_records_from_table(
+            conn, table_oid, format=format, order=order, filter=filter
+        )
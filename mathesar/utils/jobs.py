@@ -0,0 +1,171 @@
+"""
+An in-process runner for long-running operations on user databases.
+
+Jobs are recorded using the `Job` model, and run on a thread pool local to
+the process, so no external broker is needed. Their status, progress and
+result are kept up to date on the model, so any process can report them.
+
+While a job runs, its connection's `application_name` identifies it, so
+that cancelling the job can interrupt its current query (with
+`pg_cancel_backend`) without any risk of hitting an unrelated query on
+the same pooled connection.
+
+Since the thread pool is process-local, jobs pending or running when the
+process exits are lost, and stay in that status.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import time
+
+from django.conf import settings
+from django.db import connection as django_connection
+from psycopg.errors import QueryCanceled
+
+from mathesar.models.base import Job
+from mathesar.rpc.exceptions import error_codes
+from mathesar.rpc.utils import connect
+
+# The min number of seconds between updates of the progress of a job.
+PROGRESS_UPDATE_INTERVAL = 1
+
+_executor = None
+_executor_lock = Lock()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def submit_job(kind, user, database_id, func):
+    """
+    Start running a function as a background job.
+
+    Args:
+        kind: What the job does, usually the name of the RPC method.
+        user: The user running the job, who'll connect to the database.
+        database_id: The Django id of the database the job works on.
+        func: The function to run. It's called with a psycopg connection,
+            and a callable which it may call with the fraction of the
+            work done so far. Its result must be JSON serializable.
+
+    Returns:
+        The `Job` model instance of the new job.
+    """
+    job = Job.objects.create(kind=kind, user=user, database_id=database_id)
+    _get_executor().submit(_run_job, job.id, user, database_id, func)
+    return job
+
+
+def cancel_job(job):
+    """
+    Cancel a job, interrupting its current query if it's running.
+
+    Returns:
+        The `Job` model instance, refreshed from the database.
+    """
+    if Job.objects.filter(id=job.id, status=Job.PENDING).update(status=Job.CANCELLED):
+        job.refresh_from_db()
+        return job
+    if Job.objects.filter(id=job.id, status=Job.RUNNING).update(status=Job.CANCELLING):
+        job.refresh_from_db()
+        with connect(job.database_id, job.user) as conn:
+            conn.execute(
+                """
+                SELECT pg_catalog.pg_cancel_backend(pid)
+                FROM pg_catalog.pg_stat_activity
+                WHERE pid = %s AND application_name = %s
+                """,
+                (job.backend_pid, _get_application_name(job.id)),
+            )
+    job.refresh_from_db()
+    return job
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MATHESAR_JOB_WORKERS,
+                thread_name_prefix='mathesar-job',
+            )
+        return _executor
+
+
+def _get_application_name(job_id):
+    return f'mathesar_job_{job_id}'
+
+
+def _run_job(job_id, user, database_id, func):
+    try:
+        with connect(database_id, user) as conn:
+            is_started = Job.objects.filter(id=job_id, status=Job.PENDING).update(
+                status=Job.RUNNING, backend_pid=conn.info.backend_pid
+            )
+            if not is_started:
+                # The job was cancelled before it started.
+                return
+            # This is undone along with the transaction if the job fails.
+            conn.execute(
+                "SELECT pg_catalog.set_config('application_name', %s, false)",
+                (_get_application_name(job_id),),
+            )
+            result = func(conn, _ProgressReporter(job_id))
+            conn.execute("RESET application_name")
+            if not Job.objects.filter(id=job_id, status=Job.RUNNING).exists():
+                # The job was cancelled after its last progress report (if
+                # any), so its work is rolled back along with the transaction.
+                raise JobCancelled()
+        is_succeeded = Job.objects.filter(id=job_id, status=Job.RUNNING).update(
+            status=Job.SUCCEEDED, progress=1, result=result, backend_pid=None
+        )
+        if not is_succeeded:
+            # The job was cancelled while its transaction was committed.
+            Job.objects.filter(id=job_id, status=Job.CANCELLING).update(
+                status=Job.CANCELLED, backend_pid=None
+            )
+    except (JobCancelled, QueryCanceled) as e:
+        if Job.objects.filter(id=job_id, status=Job.CANCELLING).update(
+            status=Job.CANCELLED, backend_pid=None
+        ) == 0:
+            # The query was cancelled by someone else, e.g. a timeout.
+            _fail_job(job_id, e)
+    except Exception as e:
+        _fail_job(job_id, e)
+    finally:
+        django_connection.close()
+
+
+def _fail_job(job_id, e):
+    Job.objects.filter(id=job_id).update(
+        status=Job.FAILED,
+        backend_pid=None,
+        error={
+            "code": error_codes.get_error_code(e),
+            "message": e.__class__.__name__ + ": " + str(e),
+        },
+    )
+
+
+class _ProgressReporter:
+    """
+    Records the progress of a job, at most every `PROGRESS_UPDATE_INTERVAL`.
+
+    Raises `JobCancelled` if the job has been cancelled, so that jobs are
+    stopped between queries as well as during them.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.last_update = 0
+
+    def __call__(self, progress):
+        now = time.monotonic()
+        if now - self.last_update < PROGRESS_UPDATE_INTERVAL:
+            return
+        self.last_update = now
+        is_running = Job.objects.filter(id=self.job_id, status=Job.RUNNING).update(
+            progress=progress
+        )
+        if not is_running:
+            raise JobCancelled()
@@ -1,8 +1,13 @@
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.utils.http import content_disposition_header
+from django.views.decorators.http import require_GET
 from modernrpc.views import RPCEntryPoint
+from psycopg.errors import UndefinedTable
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -17,9 +22,13 @@ from mathesar.api.serializers.queries import QuerySerializer
 from mathesar.api.ui.serializers.users import UserSerializer
 from mathesar.api.utils import is_valid_uuid_v4
 from mathesar.database.types import UIType
+from mathesar.models.base import UserDatabaseRoleMap
 from mathesar.models.deprecated import Connection
 from mathesar.models.shares import SharedTable, SharedQuery
 from mathesar.state import reset_reflection
+from mathesar.utils.export import (
+    EXPORT_CONTENT_TYPES, ExportTableQueryForm, get_table_name, stream_table_export
+)
 from mathesar import __version__
 
 
@@ -164,6 +173,31 @@ def reflect_all(_):
     return Response(status=status.HTTP_200_OK)
 
 
+@login_required
+@require_GET
+def export_table(request):
+    form = ExportTableQueryForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse(form.errors, status=400)
+    params = form.cleaned_data
+    try:
+        table_name = get_table_name(
+            request.user, params['database_id'], params['table_oid']
+        )
+    except (PermissionDenied, UserDatabaseRoleMap.DoesNotExist):
+        return JsonResponse({'detail': 'Permission denied.'}, status=403)
+    except UndefinedTable:
+        return JsonResponse({'detail': 'Table not found.'}, status=404)
+    response = StreamingHttpResponse(
+        stream_table_export(request.user, **params),
+        content_type=EXPORT_CONTENT_TYPES[params['format']],
+    )
+    response['Content-Disposition'] = content_disposition_header(
+        True, f"{table_name}.{params['format']}"
+    )
+    return response
+
+
 @login_required
 def home(request):
     database_list = get_database_list(request)